@@ -42,15 +42,12 @@ class DashboardState(rx.State):
             self.is_loading = True
         
         try:
-            resources = request_to_kalavai_core(
+            snapshot = request_to_kalavai_core(
                 method="post",
-                endpoint="fetch_resources"
-            )
-
-            all_jobs = request_to_kalavai_core(
-                method="get",
-                endpoint="fetch_job_names"
+                endpoint="fetch_pool_snapshot"
             )
+            resources = snapshot["resources"]
+            all_jobs = snapshot["job_names"]
         except Exception as e:
             return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
         
@@ -27,27 +27,8 @@ class GPUsState(rx.State):
 
     @rx.var(cache=True)
     def filtered_sorted_items(self) -> List[GPU]:
-        items = self.items
-
-        # Sort items based on selected column
-        if self.sort_value:
-            # Determine if the column should be sorted as numeric
-            numeric_columns = ["available", "total"]
-            
-            if self.sort_value in numeric_columns:
-                items = sorted(
-                    items,
-                    key=lambda item: float(item.data.get(self.sort_value, 0)),
-                    reverse=self.sort_reverse,
-                )
-            else:
-                items = sorted(
-                    items,
-                    key=lambda item: str(item.data.get(self.sort_value, "")).lower(),
-                    reverse=self.sort_reverse,
-                )
-
-        return items
+        # sorted and paginated by the kalavai API
+        return self.items
 
     @rx.var(cache=True)
     def page_number(self) -> int:
@@ -61,23 +42,25 @@ class GPUsState(rx.State):
 
     @rx.var(cache=True, initial_value=[])
     def get_current_page(self) -> list[GPU]:
-        start_index = self.offset
-        end_index = start_index + self.limit
-        return self.filtered_sorted_items[start_index:end_index]
+        return self.items
 
     def prev_page(self):
         if self.page_number > 1:
             self.offset -= self.limit
+        return GPUsState.load_entries
 
     def next_page(self):
         if self.page_number < self.total_pages:
             self.offset += self.limit
+        return GPUsState.load_entries
 
     def first_page(self):
         self.offset = 0
+        return GPUsState.load_entries
 
     def last_page(self):
         self.offset = (self.total_pages - 1) * self.limit
+        return GPUsState.load_entries
 
     def set_sort_column(self, column: str):
         """Set the column to sort by. Toggle reverse if same column is clicked."""
@@ -88,28 +71,44 @@ class GPUsState(rx.State):
             self.sort_reverse = False
         # Reset to first page when sorting changes
         self.offset = 0
+        return GPUsState.load_entries
+
+    def _listing_params(self):
+        params = {"offset": self.offset, "limit": self.limit}
+        if self.sort_value:
+            # usage is derived from availability: most used = least available
+            if self.sort_value == "used":
+                params["sort_by"] = "available"
+                params["order"] = "asc" if self.sort_reverse else "desc"
+            else:
+                params["sort_by"] = self.sort_value
+                params["order"] = "desc" if self.sort_reverse else "asc"
+        return params
 
     @rx.event(background=True)
     async def load_entries(self):
         async with self:
             self.is_loading = True
+            params = self._listing_params()
         
         try:
-            devices = request_to_kalavai_core(
-                method="get",
-                endpoint="fetch_gpus"
+            page = request_to_kalavai_core(
+                method="post",
+                endpoint="fetch_gpus",
+                params=params,
+                json={}
             )
         except Exception as e:
             return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
         async with self:
             self.is_loading = False
-            if "error" in devices:
+            if "error" in page:
                 self.items = []
                 self.total_items = 0
-                return rx.toast.error(f"Error when fetching gpus: {devices}", position="top-center")
+                return rx.toast.error(f"Error when fetching gpus: {page}", position="top-center")
             else:
                 self.items = []
-                for gpu in devices:
+                for gpu in page["items"]:
                     gpu_data = {
                         "node": gpu["node"],
                         "model": gpu["model"],
@@ -119,6 +118,4 @@ class GPUsState(rx.State):
                     }
                     self.items.append(GPU(data=gpu_data))
             
-            # Update total_items based on sorted items (same as items length, but using filtered_sorted_items for consistency)
-            self.total_items = len(self.filtered_sorted_items)
-            
+            self.total_items = page["total"]
@@ -26,6 +26,9 @@ class Job(rx.Base):
     """The item class."""
     data: JobData
 
+# fields shown in the jobs table; spec and conditions are loaded on demand
+LIST_FIELDS = "job_id,owner,name,workers,endpoint,status,host_nodes"
+
 class TemplateData(rx.Base):
     """The template data class."""
     name: str
@@ -109,9 +112,8 @@ class JobsState(rx.State):
 
     @rx.var(cache=True, initial_value=[])
     def get_current_page(self) -> list[Job]:
-        start_index = self.offset
-        end_index = start_index + self.limit
-        return self.items[start_index:end_index]
+        # paginated by the kalavai API
+        return self.items
     
     def set_deploy_step(self, step: int):
         self.current_deploy_step = step
@@ -120,17 +122,21 @@ class JobsState(rx.State):
         self.reset_selection()
         if self.page_number > 1:
             self.offset -= self.limit
+        return JobsState.load_entries
 
     def next_page(self):
         self.reset_selection()
         if self.page_number < self.total_pages:
             self.offset += self.limit
+        return JobsState.load_entries
 
     def first_page(self):
         self.offset = 0
+        return JobsState.load_entries
 
     def last_page(self):
         self.offset = (self.total_pages - 1) * self.limit
+        return JobsState.load_entries
     
     def reset_selection(self):
         self.is_selected = {i: False for i in self.is_selected}
@@ -327,7 +333,7 @@ class JobsState(rx.State):
     async def remove_entries(self):
         async with self:
             for row, state in self.is_selected.items():
-                element = row + (self.page_number-1) * self.limit # 'row' is only local to current page, we need to calculate global row
+                element = row # items only hold the current page
                 if not state:
                     continue
                 try:
@@ -371,15 +377,37 @@ class JobsState(rx.State):
     async def open_endpoint(self, address):
         return rx.redirect(address, is_external=True)
     
+    def _fetch_job_spec(self, job_id, owner):
+        """Load spec and conditions of a single job (not included in the list)"""
+        page = request_to_kalavai_core(
+            method="get",
+            endpoint="fetch_job_details",
+            params={
+                "force_namespace": owner,
+                "job_id": job_id,
+                "fields": "spec,conditions",
+                "limit": 1
+            }
+        )
+        if "error" in page or len(page["items"]) == 0:
+            return {}
+        return page["items"][0]
+
     @rx.event(background=True)
     async def load_current_job_details(self, index):
-        element = index + (self.page_number-1) * self.limit
+        element = index
         async with self:
             self.is_loading = True
         await asyncio.sleep(0.1)
 
         async with self:
             data = self.items[element].data.dict()
+        try:
+            data.update(self._fetch_job_spec(data["job_id"], data["owner"]))
+        except Exception as e:
+            return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
+
+        async with self:
             job_id = data["job_id"]
             self.selected_template = f"{data['spec']['template']['repo']}/{data['spec']['template']['chart']}"
             if "nodeSelectors" in data["spec"]:
@@ -405,8 +433,12 @@ class JobsState(rx.State):
     async def load_logs(self, index):
         async with self:
             self.job_logs = None
-        element = index + (self.page_number-1) * self.limit
+        element = index
         job_data = self.items[element].data.dict()
+        try:
+            job_data.update(self._fetch_job_spec(job_data["job_id"], job_data["owner"]))
+        except Exception as e:
+            return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
         async with self:
             if "spec" in job_data:
                 self.job_metadata = json.dumps(job_data["spec"], indent=3)
@@ -471,21 +503,29 @@ class JobsState(rx.State):
             self.total_items = 0
             self.items = []
             state = await self.get_state(MainState)
+            offset, limit = self.offset, self.limit
 
         try:
             
-            details = request_to_kalavai_core(
+            page = request_to_kalavai_core(
                 method="get",
                 endpoint="fetch_job_details",
-                params={"force_namespace": state.selected_user_space})
+                params={
+                    "force_namespace": state.selected_user_space,
+                    "fields": LIST_FIELDS,
+                    "offset": offset,
+                    "limit": limit
+                })
         except Exception as e:
             return rx.toast.error(f"Missing ACCESS_KEY?\n{str(e)}", position="top-center")
             
-        if "error" in details:
-            return rx.toast.error(f"Error:\n{details}", position="top-center")
+        if "error" in page:
+            return rx.toast.error(f"Error:\n{page}", position="top-center")
     
         async with self:
-            for job_details in details:
+            for job_details in page["items"]:
+                job_details["spec"] = {}
+                job_details["conditions"] = {}
                 # parse endpoint
                 job_details["endpoint"] = {name: f"http://{endpoint['address']}:{endpoint['port']}" for name, endpoint in job_details["endpoint"].items()}
                 self.items.append(
@@ -493,7 +533,7 @@ class JobsState(rx.State):
                         data=job_details
                     )
                 )  
-            self.total_items = len(self.items)
+            self.total_items = page["total"]
             self.is_loading = False
     
     @rx.event(background=True)
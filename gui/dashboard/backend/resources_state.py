@@ -135,21 +135,23 @@ class ResourcesState(rx.State):
 
     @rx.event(background=True)
     async def load_entries(self):
-        # Load device information
+        # Load device and GPU information in a single call
         temp_data = defaultdict(dict)
         async with self:
             self.is_loading = True
         try:
-            devices = request_to_kalavai_core(
-                method="get",
-                endpoint="fetch_devices"
+            snapshot = request_to_kalavai_core(
+                method="post",
+                endpoint="fetch_pool_snapshot"
             )
         except Exception as e:
             return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
         async with self:
             self.is_loading = False
+            devices = snapshot.get("devices", snapshot)
             if "error" in devices:
                 self.items = []
+                self.total_items = 0
                 return rx.toast.error(f"Error when fetching devices: {devices}", position="top-center")
             else:
                 for device in devices:
@@ -158,21 +160,8 @@ class ResourcesState(rx.State):
                         "disabled": device["unschedulable"],
                         "ready": device["ready"]
                     }
-                
-            self.total_items = len(self.items)
-        # Lad GPU information
-        async with self:
-            self.is_loading = True
-        
-        try:
-            devices = request_to_kalavai_core(
-                method="get",
-                endpoint="fetch_gpus"
-            )
-        except Exception as e:
-            return rx.toast.error(f"Missing ACCESS_KEY?\n{e}", position="top-center")
-        async with self:
-            self.is_loading = False
+
+            devices = snapshot.get("gpus", snapshot)
             if "error" in devices:
                 self.items = []
                 self.total_items = 0
@@ -1,28 +1,84 @@
 import os
+import copy
+import json
+import threading
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
 import re
 
 
 KALAVAI_API_URL = os.getenv("KALAVAI_API_URL", "http://0.0.0.0:49152")
 ACCESS_KEY = os.getenv("ACCESS_KEY", None)
+HTTP_POOL_CONNECTIONS = int(os.getenv("KALAVAI_HTTP_POOL_CONNECTIONS", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("KALAVAI_HTTP_POOL_MAXSIZE", 20))
+
+ETAG_CACHE_SIZE = 128
+
+# keep-alive sessions shared by all states, one per base URL
+_HTTP_SESSIONS = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+# last (etag, body) per request, revalidated with If-None-Match
+_ETAG_CACHE = OrderedDict()
+_ETAG_CACHE_LOCK = threading.Lock()
+
+
+def get_http_session(base_url):
+    """Get the pooled keep-alive session for base_url"""
+    session = _HTTP_SESSIONS.get(base_url)
+    if session is not None:
+        return session
+    with _HTTP_SESSIONS_LOCK:
+        session = _HTTP_SESSIONS.get(base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _HTTP_SESSIONS[base_url] = session
+    return session
 
 
 def request_to_kalavai_core(method, endpoint, base_url=None, **kwargs):
     if base_url is None:
         base_url = KALAVAI_API_URL
-    headers = None
+    headers = {}
     if ACCESS_KEY is not None:
-        headers = {
-            "X-API-KEY": ACCESS_KEY
-        }
-    result = requests.request(
+        headers["X-API-KEY"] = ACCESS_KEY
+    url = f"{base_url}/{endpoint}"
+    cache_key = (
+        method.lower(),
+        url,
+        json.dumps(kwargs.get("params"), sort_keys=True, default=str),
+        json.dumps(kwargs.get("json"), sort_keys=True, default=str)
+    )
+    with _ETAG_CACHE_LOCK:
+        cached = _ETAG_CACHE.get(cache_key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+    result = get_http_session(base_url).request(
         method,
-        url=f"{base_url}/{endpoint}",
+        url=url,
         headers=headers,
         **kwargs
     )
+    # callers change the bodies they get (e.g. jobs_state.load_entries):
+    # keep and serve copies
+    if result.status_code == 304 and cached is not None:
+        return copy.deepcopy(cached[1])
     result.raise_for_status()
-    return result.json()
+    body = result.json()
+    etag = result.headers.get("ETag")
+    if etag is not None:
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[cache_key] = (etag, copy.deepcopy(body))
+            _ETAG_CACHE.move_to_end(cache_key)
+            while len(_ETAG_CACHE) > ETAG_CACHE_SIZE:
+                _ETAG_CACHE.popitem(last=False)
+    return body
 
 def extract_number(data_string):
     try:
@@ -4,7 +4,9 @@ Used as a bridge between the kalavai-client app and the reflex frontend
 """
 import os
 import time
+import asyncio
 import logging
+import threading
 from argparse import ArgumentParser
 
 from contextlib import asynccontextmanager
@@ -13,12 +15,24 @@ from fastapi.security.api_key import APIKeyHeader
 from typing import Optional, List
 from fastapi_mcp import FastApiMCP
 from starlette.requests import Request
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 import uvicorn
 
 from kalavai_client.core import Job
 from kalavai_client.env import (
     KALAVAI_SERVICE_LABEL,
-    KALAVAI_SERVICE_LABEL_VALUE
+    KALAVAI_SERVICE_LABEL_VALUE,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE,
+    API_CACHE_TTL,
+    API_CACHE_TTLS,
+    WATCH_POLL_INTERVAL,
+    WATCH_HEARTBEAT,
+    STATE_MIRROR_ENABLED,
+    STATE_MIRROR_INTERVAL,
+    STATE_MIRROR_INTERVALS
 )
 from kalavai_client.api_models import (
     NodeMetricsRequest,
@@ -38,59 +52,105 @@ from kalavai_client.api_models import (
     NodeLabelsRequest,
     WorkerConfigRequest,
     FetchDevicesRequest,
-    UserSpaceSecretRequest
+    FetchPoolSnapshotRequest,
+    UserSpaceSecretRequest,
+    DeviceStatus,
+    GPU,
+    Service
 )
 from kalavai_client.core import (
     create_pool,
     join_pool,
     attach_to_pool,
     stop_pool,
-    fetch_devices,
-    fetch_resources,
-    fetch_job_names,
-    fetch_gpus,
-    fetch_job_details,
-    fetch_job_logs,
-    fetch_job_templates,
-    fetch_pool_services,
-    fetch_template_data,
-    fetch_pod_logs,
-    deploy_job,
-    deploy_test_job,
-    delete_job,
+    fetch_devices_async,
+    fetch_resources_async,
+    fetch_job_names_async,
+    fetch_gpus_async,
+    fetch_job_details_async,
+    read_job_logs_async,
+    follow_job_logs_async,
+    LOG_BUFFER,
+    fetch_job_templates_async,
+    fetch_pool_services_async,
+    fetch_pool_snapshot_async,
+    fetch_template_data_async,
+    fetch_pod_logs_async,
+    deploy_job_async,
+    deploy_test_job_async,
+    delete_job_async,
     authenticate_user,
     load_user_session,
     user_logout,
-    is_connected,
+    is_connected_async,
     is_agent_running,
     is_server,
     pause_agent,
     resume_agent,
     get_ip_addresses,
     get_pool_token,
-    delete_nodes,
-    cordon_nodes,
-    uncordon_nodes,
-    add_node_labels,
-    get_node_labels,
+    delete_nodes_async,
+    cordon_nodes_async,
+    uncordon_nodes_async,
+    add_node_labels_async,
+    get_node_labels_async,
     generate_worker_package,
     get_user_spaces,
-    delete_user_space,
-    get_space_quota,
-    set_space_quota,
+    get_user_spaces_async,
+    delete_user_space_async,
+    get_space_quota_async,
+    set_space_quota_async,
     get_pool_credentials,
     is_watcher_alive,
     update_local_repositories,
+    update_local_repositories_async,
     TokenType,
-    get_compute_usage,
-    get_nodes_metrics,
-    set_user_space_secret,
-    fetch_user_space_secret
+    get_compute_usage_async,
+    get_nodes_metrics_async,
+    set_user_space_secret_async,
+    fetch_user_space_secret_async
+)
+from kalavai_client.watcher import ASYNC_WATCHER
+from kalavai_client.compression import CompressionMiddleware
+from kalavai_client.deadline import DeadlineMiddleware
+from kalavai_client.etag import ETagMiddleware
+from kalavai_client.breaker import breaker_states, OPEN
+from kalavai_client.response_cache import ResponseCache, parse_endpoint_ttls
+from kalavai_client.events import (
+    PoolEventHub,
+    EVENT_TYPES,
+    JOB_STATUS,
+    NODE_STATUS,
+    GPU_AVAILABILITY
+)
+from kalavai_client.mirror import StateMirror, parse_intervals
+from kalavai_client.listing import (
+    ListParams,
+    apply_listing,
+    flatten_services,
+    parse_fields,
+    project,
+    JOB_FILTERS,
+    DEVICE_FILTERS,
+    GPU_FILTERS,
+    SERVICE_FILTERS
 )
 from kalavai_client.utils import (
-    apply_cutoff_date_delta
+    apply_cutoff_date_delta,
+    json_dumps,
+    USE_ORJSON
+)
+from kalavai_client.metrics import (
+    MetricsAPI,
+    FORMATS,
+    ARROW,
+    ARROW_MEDIA_TYPE,
+    ARROW_AVAILABLE,
+    STREAM_FORMATS,
+    STREAM_MEDIA_TYPES,
+    MetricsUnavailable
 )
-from kalavai_client.metrics import MetricsAPI
+from kalavai_client.usage_cache import ClosedHourCache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -99,15 +159,24 @@ logger.setLevel(logging.DEBUG)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Initializing Helm template repositories...")
-    result = update_local_repositories()
+    result = await update_local_repositories_async()
     if isinstance(result, dict) and "error" in result:
         logger.warning(f"Failed to update Helm repos on startup: {result['error']}")
     else:
         logger.info("Helm template repositories updated successfully")
+    if STATE_MIRROR is not None:
+        STATE_MIRROR.start()
+    # wake the metrics service up without holding up startup
+    metrics_api.warm_up()
     yield
+    if STATE_MIRROR is not None:
+        await STATE_MIRROR.stop()
+    await ASYNC_WATCHER.aclose()
 
 
 API_KEY_NAME = "X-API-Key"
+# Unix time of the pool state in /fetch_pool_snapshot responses
+SNAPSHOT_TIMESTAMP_HEADER = "X-Snapshot-Timestamp"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 MASTER_API_KEY = os.getenv("MASTER_API_KEY", None)
 # Forced backend nodes and jobs for user spaced pools
@@ -122,6 +191,93 @@ CLICKHOUSE_ENDPOINT = os.getenv("CLICKHOUSE_ENDPOINT", '')
 CLICKHOUSE_PORT = int(os.getenv("CLICKHOUSE_PORT", 8443))
 CLICKHOUSE_USERNAME = os.getenv("CLICKHOUSE_USERNAME", "default")
 CLICKHOUSE_PASSWORD = os.getenv("CLICKHOUSE_PASSWORD", "")
+# seconds ClickHouse keeps the results of identical metrics queries (0 disables)
+CLICKHOUSE_QUERY_CACHE_TTL = int(os.getenv("CLICKHOUSE_QUERY_CACHE_TTL", 60))
+# usage rows of closed hours kept by this instance (0 disables), optional
+# SQLite file for the rows evicted from memory, and seconds after its end
+# an hour may still receive rows
+CLICKHOUSE_HOUR_CACHE_ROWS = int(os.getenv("CLICKHOUSE_HOUR_CACHE_ROWS", 500000))
+CLICKHOUSE_HOUR_CACHE_SPILL = os.getenv("CLICKHOUSE_HOUR_CACHE_SPILL", "")
+CLICKHOUSE_SETTLE_TIME = int(os.getenv("CLICKHOUSE_SETTLE_TIME", 600))
+# usage windows longer than this (days) are read from ClickHouse in one query
+CLICKHOUSE_HOUR_CACHE_DAYS = int(os.getenv("CLICKHOUSE_HOUR_CACHE_DAYS", 30))
+# upper bounds of streamed /get_metrics results (ndjson / csv)
+CLICKHOUSE_STREAM_MAX_ROWS = int(os.getenv("CLICKHOUSE_STREAM_MAX_ROWS", 10_000_000))
+CLICKHOUSE_STREAM_MAX_BYTES = int(os.getenv("CLICKHOUSE_STREAM_MAX_BYTES", 1024 * 1024 * 1024))
+# ClickHouse clients (concurrent metrics queries) of this instance
+CLICKHOUSE_POOL_SIZE = int(os.getenv("CLICKHOUSE_POOL_SIZE", 4))
+# shared by every client (GUI tabs, CLI loops, MCP agents) of this instance
+RESPONSE_CACHE = ResponseCache(
+    default_ttl=API_CACHE_TTL,
+    endpoint_ttls=parse_endpoint_ttls(API_CACHE_TTLS)
+)
+# ringfence and forced user space rules apply to the states behind /watch
+_RINGFENCE_LABELS = {RINGFENCE_NODE_LABEL: RINGFENCE_NODE_LABEL_VALUE} if RINGFENCE_NODE_LABEL is not None and RINGFENCE_NODE_LABEL_VALUE is not None else None
+# unfiltered reads are served from memory, refreshed in the background
+STATE_MIRROR = StateMirror(
+    sources={
+        "devices": lambda: fetch_devices_async(node_labels=_RINGFENCE_LABELS),
+        "gpus": fetch_gpus_async,
+        "resources": lambda: fetch_resources_async(node_labels=_RINGFENCE_LABELS),
+        "labels": get_node_labels_async,
+        "jobs": fetch_job_details_async,
+        "job_names": fetch_job_names_async,
+        "services": fetch_pool_services_async
+    },
+    default_interval=STATE_MIRROR_INTERVAL,
+    intervals=parse_intervals(STATE_MIRROR_INTERVALS)
+) if STATE_MIRROR_ENABLED else None
+# with the mirror, /watch diffs its refreshes instead of polling the watcher again
+EVENT_HUB = PoolEventHub(
+    sources=None if STATE_MIRROR is not None else {
+        JOB_STATUS: lambda: fetch_job_details_async(force_namespace=FORCED_USER_SPACE_NAME),
+        NODE_STATUS: lambda: fetch_devices_async(node_labels=_RINGFENCE_LABELS),
+        GPU_AVAILABILITY: lambda: fetch_gpus_async(node_labels=_RINGFENCE_LABELS)
+    },
+    interval=WATCH_POLL_INTERVAL
+)
+
+
+def ringfence_gpus(gpus, devices):
+    """Mirrored GPUs of the ringfenced nodes (the mirrored devices), or None if the devices are not known yet"""
+    if _RINGFENCE_LABELS is None:
+        return gpus
+    if not isinstance(devices, list):
+        return None
+    nodes = {device.name for device in devices}
+    return [gpu for gpu in gpus if gpu.node in nodes]
+
+def feed_events(resource, value):
+    """State mirror listener: diff the refreshed jobs, devices and GPUs into /watch events"""
+    if resource == "jobs":
+        if FORCED_USER_SPACE_NAME is not None:
+            value = [job for job in value if job.owner == FORCED_USER_SPACE_NAME]
+        EVENT_HUB.update(JOB_STATUS, value)
+    elif resource == "devices":
+        EVENT_HUB.update(NODE_STATUS, value)
+    elif resource == "gpus":
+        gpus = ringfence_gpus(value, STATE_MIRROR.peek("devices"))
+        if gpus is not None:
+            EVENT_HUB.update(GPU_AVAILABILITY, gpus)
+
+if STATE_MIRROR is not None:
+    STATE_MIRROR.add_listener(feed_events)
+
+
+async def read_state(resource, max_staleness, endpoint, params, fetch):
+    """
+    Serve a read from the state mirror when it covers the request (resource
+    is not None), otherwise from the read cache.
+    """
+    if STATE_MIRROR is not None and resource is not None:
+        return await STATE_MIRROR.get(resource, max_staleness=max_staleness)
+    return await RESPONSE_CACHE.get_or_fetch(endpoint, params, fetch)
+
+def invalidate_state():
+    """Called by mutating endpoints: the next reads see their effect"""
+    RESPONSE_CACHE.invalidate()
+    if STATE_MIRROR is not None:
+        STATE_MIRROR.invalidate()
 
 
 app = FastAPI(
@@ -131,14 +287,103 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse if USE_ORJSON else JSONResponse
 )
+# read endpoints polled by the GUI / CLI answer 304 to unchanged content
+app.add_middleware(
+    ETagMiddleware,
+    paths=[
+        "/fetch_devices",
+        "/fetch_gpus",
+        "/fetch_resources",
+        "/fetch_job_names",
+        "/fetch_job_details",
+        "/fetch_pool_services",
+        "/fetch_pool_snapshot"
+    ]
+)
+# X-Request-Deadline header / timeout query param, propagated to watcher calls
+app.add_middleware(DeadlineMiddleware)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 metrics_api = MetricsAPI(
     endpoint=CLICKHOUSE_ENDPOINT,
     port=CLICKHOUSE_PORT,
     username=CLICKHOUSE_USERNAME,
-    password=CLICKHOUSE_PASSWORD
+    password=CLICKHOUSE_PASSWORD,
+    query_cache_ttl=CLICKHOUSE_QUERY_CACHE_TTL,
+    hour_cache=None if CLICKHOUSE_HOUR_CACHE_ROWS <= 0 else ClosedHourCache(
+        max_rows=CLICKHOUSE_HOUR_CACHE_ROWS,
+        spill_path=CLICKHOUSE_HOUR_CACHE_SPILL or None
+    ),
+    hour_cache_days=CLICKHOUSE_HOUR_CACHE_DAYS,
+    settle_time=CLICKHOUSE_SETTLE_TIME,
+    pool_size=CLICKHOUSE_POOL_SIZE
 )
 
+@app.exception_handler(MetricsUnavailable)
+async def metrics_unavailable(request: Request, e: MetricsUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(e)})
+
+
+def metrics_format(format: str = Query("dict", description=f"Result format: {', '.join(FORMATS)}")):
+    """Result format of the metrics endpoints (FastAPI dependency)"""
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}. Valid: {list(FORMATS)}")
+    if format == ARROW and not ARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Arrow output needs pyarrow on the server (kalavai-client[arrow])")
+    return format
+
+def metrics_response(result, format):
+    if format == ARROW:
+        return Response(content=result, media_type=ARROW_MEDIA_TYPE)
+    return result
+
+async def threaded_stream(request: Request, chunks, cancelled: threading.Event):
+    """
+    Async iterator over a blocking chunk generator, advanced in the
+    threadpool. Stops it when the client disconnects.
+    """
+    try:
+        while not await request.is_disconnected():
+            chunk = await run_in_threadpool(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        try:
+            chunks.close()
+        except ValueError:
+            # still reading a block in a worker thread: it stops after it
+            pass
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Renders pydantic models directly, without FastAPI's jsonable_encoder pass"""
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
+def fast_response(content):
+    """Return large model lists as a FastJSONResponse when the fast JSON backend is enabled"""
+    if USE_ORJSON:
+        return FastJSONResponse(content=content)
+    return content
+
+def snapshot_response(snapshot):
+    """Pool snapshot with its time in a header, so an unchanged pool keeps its ETag"""
+    body = {section: value for section, value in snapshot.items() if section != "timestamp"}
+    headers = {SNAPSHOT_TIMESTAMP_HEADER: f"{snapshot['timestamp']:.3f}"} if "timestamp" in snapshot else None
+    if USE_ORJSON:
+        return FastJSONResponse(content=body, headers=headers)
+    return JSONResponse(content=jsonable_encoder(body), headers=headers)
+
+def list_response(result, listing: ListParams, filters: dict, sortable: list):
+    """Filter / sort / paginate a list result as requested (errors pass through)"""
+    if isinstance(result, dict) and "error" in result:
+        return fast_response(result)
+    return fast_response(apply_listing(result, listing, filters, sortable))
+
 
 ################################
 ## API Key Validation methods ##
@@ -267,15 +512,16 @@ def pool_stop(request: StopPoolRequest, api_key: str = Depends(verify_api_key)):
     description="Removes specified compute nodes from the Kalavai pool. This operation will terminate any jobs running on the target nodes and clean up their resources. Use with caution as it may interrupt running workloads.",
     tags=["pool_management"],
     response_description="Result of node deletion")
-def device_delete(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
+async def device_delete(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
     """
     Delete nodes with the following parameters:
     
     - **nodes**: List of node names to delete
     """
-    result = delete_nodes(
+    result = await delete_nodes_async(
         nodes=request.nodes
     )
+    invalidate_state()
     return result
 
 @app.post("/cordon_nodes",
@@ -284,15 +530,16 @@ def device_delete(request: NodesActionRequest, api_key: str = Depends(verify_api
     description="Marks specified nodes as unschedulable, preventing new jobs from being assigned to them while allowing existing jobs to complete. This is useful for maintenance operations or when you want to gradually remove nodes from the pool.",
     tags=["pool_management"],
     response_description="Result of cordoning nodes")
-def device_cordon(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
+async def device_cordon(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
     """
     Cordon nodes with the following parameters:
     
     - **nodes**: List of node names to cordon
     """
-    result = cordon_nodes(
+    result = await cordon_nodes_async(
         nodes=request.nodes
     )
+    invalidate_state()
     return result
 
 @app.post("/uncordon_nodes",
@@ -301,15 +548,16 @@ def device_cordon(request: NodesActionRequest, api_key: str = Depends(verify_api
     description="Re-enables job scheduling on previously cordoned nodes, allowing them to receive new workloads. This reverses the effect of the cordon operation.",
     tags=["pool_management"],
     response_description="Result of uncordoning nodes")
-def device_uncordon(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
+async def device_uncordon(request: NodesActionRequest, api_key: str = Depends(verify_api_key)):
     """
     Uncordon nodes with the following parameters:
     
     - **nodes**: List of node names to uncordon
     """
-    result = uncordon_nodes(
+    result = await uncordon_nodes_async(
         nodes=request.nodes
     )
+    invalidate_state()
     return result
 
 @app.get("/get_pool_token",
@@ -368,10 +616,10 @@ def generate_worker_config(request: WorkerConfigRequest, api_key: str = Depends(
 @app.post("/fetch_user_compute_usage",
     operation_id="fetch_user_compute_usage",
     summary="Get compute usage",
-    description="Retrieves information about all compute devices (nodes) currently connected to the Kalavai pool, including their availability and usage.",
+    description="Retrieves information about all compute devices (nodes) currently connected to the Kalavai pool, including their availability and usage. Set format to columnar ({columns, data}) or arrow (Arrow IPC stream) for long time series, bucket (day, week or month) to roll hourly rows up and top_n to keep the top jobs by vram_hours (the rest summed as 'other').",
     tags=["info"],
     response_description="List of devices")
-def compute_usage_get(request: UserComputeUsageRequest, api_key: str = Depends(verify_api_key)):
+def compute_usage_get(request: UserComputeUsageRequest, format: str = Depends(metrics_format), api_key: str = Depends(verify_api_key)):
     """
     Get compute usage for specific namespaces.
 
@@ -383,21 +631,25 @@ def compute_usage_get(request: UserComputeUsageRequest, api_key: str = Depends(v
             user_ids = [FORCED_USER_SPACE_NAME]
         else:
             user_ids = request.user_ids
-    return metrics_api.get_compute_usage(
+    result = metrics_api.get_compute_usage(
         user_ids=user_ids,
         start_time=request.start_time,
         end_time=request.end_time,
         job_ids=request.job_ids,
-        aggregate=request.aggregate
+        aggregate=request.aggregate,
+        format=format,
+        bucket=request.bucket,
+        top_n=request.top_n
     )
+    return metrics_response(result, format)
 
 @app.post("/fetch_provider_compute_usage",
     operation_id="fetch_provider_compute_usage",
     summary="Get compute usage",
-    description="Retrieves information about computing on all nodes belonging to a provider currently connected to the Kalavai pool, including their availability and usage.",
+    description="Retrieves information about computing on all nodes belonging to a provider currently connected to the Kalavai pool, including their availability and usage. Set format to columnar ({columns, data}) or arrow (Arrow IPC stream) for long time series, bucket (day, week or month) to roll hourly rows up (with aggregate false) and top_n to keep the top providers by vram_hours (the rest summed as 'other').",
     tags=["info"],
     response_description="List of devices")
-def provider_compute_usage_get(request: ProviderComputeUsageRequest, api_key: str = Depends(verify_api_key)):
+def provider_compute_usage_get(request: ProviderComputeUsageRequest, format: str = Depends(metrics_format), api_key: str = Depends(verify_api_key)):
     """
     Get compute usage for specific provider.
 
@@ -410,11 +662,16 @@ def provider_compute_usage_get(request: ProviderComputeUsageRequest, api_key: st
             provider_ids = get_user_spaces()
         else:
             provider_ids = request.provider_ids
-    return metrics_api.get_provider_usage(
+    result = metrics_api.get_provider_usage(
         provider_ids=provider_ids,
         start_time=request.start_time,
-        end_time=request.end_time
+        end_time=request.end_time,
+        aggregate=request.aggregate,
+        format=format,
+        bucket=request.bucket,
+        top_n=request.top_n
     )
+    return metrics_response(result, format)
 
 @app.post("/fetch_compute_usage",
     operation_id="fetch_compute_usage",
@@ -423,7 +680,7 @@ def provider_compute_usage_get(request: ProviderComputeUsageRequest, api_key: st
     tags=["info"],
     response_description="List of devices",
     deprecated=True)
-def compute_usage(request: ComputeUsageRequest, api_key: str = Depends(verify_api_key)):
+async def compute_usage(request: ComputeUsageRequest, api_key: str = Depends(verify_api_key)):
     """
     DEPRECATED
     Get compute usage metrics on key resources across available nodes.
@@ -440,7 +697,7 @@ def compute_usage(request: ComputeUsageRequest, api_key: str = Depends(verify_ap
         if FORCED_USER_SPACE_NAME is not None:
             available_ns = [FORCED_USER_SPACE_NAME]
         else:
-            available_ns = get_user_spaces()
+            available_ns = await get_user_spaces_async()
         request.namespaces = [ns for ns in request.namespaces if ns in available_ns]
     
     # Apply cutoff date limitation
@@ -450,7 +707,7 @@ def compute_usage(request: ComputeUsageRequest, api_key: str = Depends(verify_ap
         logger.warning(f"Failed to apply cutoff date: {e}")
         start_time_delta = request.start_time
     
-    return get_compute_usage(
+    return await get_compute_usage_async(
         start_time=start_time_delta,
         end_time=request.end_time,
         node_names=request.node_names,
@@ -466,7 +723,7 @@ def compute_usage(request: ComputeUsageRequest, api_key: str = Depends(verify_ap
     tags=["info"],
     response_description="List of devices",
     deprecated=True)
-def nodes_metrics(request: NodeMetricsRequest, api_key: str = Depends(verify_api_key)):
+async def nodes_metrics(request: NodeMetricsRequest, api_key: str = Depends(verify_api_key)):
     """
     Get nodes metrics
     
@@ -482,7 +739,7 @@ def nodes_metrics(request: NodeMetricsRequest, api_key: str = Depends(verify_api
         if FORCED_USER_SPACE_NAME is not None:
             available_ns = [FORCED_USER_SPACE_NAME]
         else:
-            available_ns = get_user_spaces()
+            available_ns = await get_user_spaces_async()
         request.namespaces = [ns for ns in request.namespaces if ns in available_ns]
     
     # Apply cutoff date limitation
@@ -492,7 +749,7 @@ def nodes_metrics(request: NodeMetricsRequest, api_key: str = Depends(verify_api
         logger.warning(f"Failed to apply cutoff date: {e}")
         start_time_delta = request.start_time
     
-    return get_nodes_metrics(
+    return await get_nodes_metrics_async(
         start_time=start_time_delta,
         end_time=request.end_time,
         node_names=request.node_names,
@@ -506,16 +763,24 @@ def nodes_metrics(request: NodeMetricsRequest, api_key: str = Depends(verify_api
 @app.post("/fetch_devices",
     operation_id="fetch_devices",
     summary="Get list of all compute devices in the pool",
-    description="Retrieves information about all compute devices (nodes) currently connected to the Kalavai pool, including their status, available resources, and current workload distribution.",
+    description="Retrieves information about all compute devices (nodes) currently connected to the Kalavai pool, including their status, available resources, and current workload distribution. Supports filtering (node), sorting (sort_by, order) and pagination (offset, limit); paginated results include the total count.",
     tags=["info"],
     response_description="List of devices")
-def get_devices(request: FetchDevicesRequest, api_key: str = Depends(verify_api_key)):
+async def get_devices(request: FetchDevicesRequest, max_staleness: float = Query(None), listing: ListParams = Depends(), api_key: str = Depends(verify_api_key)):
     """Get list of available devices"""
+    mirrored = "devices" if request.node_labels is None else None
     if RINGFENCE_NODE_LABEL is not None and RINGFENCE_NODE_LABEL_VALUE is not None:
         if request.node_labels is None:
             request.node_labels = {}
         request.node_labels = {RINGFENCE_NODE_LABEL: RINGFENCE_NODE_LABEL_VALUE, **request.node_labels}
-    return fetch_devices(request.node_labels)
+    result = await read_state(
+        mirrored,
+        max_staleness,
+        "/fetch_devices",
+        {"node_labels": request.node_labels},
+        lambda: fetch_devices_async(request.node_labels)
+    )
+    return list_response(result, listing, DEVICE_FILTERS, list(DeviceStatus.model_fields))
 
 @app.get("/fetch_service_logs",
     operation_id="fetch_service_logs",
@@ -523,8 +788,8 @@ def get_devices(request: FetchDevicesRequest, api_key: str = Depends(verify_api_
     description="Get logs for the kalavai API service, including internal logs, debugging messages and status of the service.",
     tags=["info"],
     response_description="Logs")
-def get_service_logs(tail: int=100, api_key: str = Depends(verify_api_key)):
-    return fetch_pod_logs(
+async def get_service_logs(tail: int=100, api_key: str = Depends(verify_api_key)):
+    return await fetch_pod_logs_async(
         labels={KALAVAI_SERVICE_LABEL: KALAVAI_SERVICE_LABEL_VALUE},
         force_namespace="kalavai",
         tail=tail
@@ -536,8 +801,9 @@ def get_service_logs(tail: int=100, api_key: str = Depends(verify_api_key)):
     description="Retrieves detailed resource information (CPU, memory, GPU usage) for the pool; optionally for a list of specified nodes in the pool (as {'nodes': node_list}). This helps monitor resource utilization and plan workload distribution.",
     tags=["info"],
     response_description="Resource information")
-def resources(request: Optional[NodesActionRequest]=NodesActionRequest(), api_key: str = Depends(verify_api_key)):
+async def resources(request: Optional[NodesActionRequest]=NodesActionRequest(), max_staleness: float = Query(None), api_key: str = Depends(verify_api_key)):
     """Get available resources"""
+    mirrored = "resources" if request.nodes is None and request.node_labels is None else None
     print("PRETEST: RINGFENCE_NODE_LABEL:", RINGFENCE_NODE_LABEL)
     print("PRETEST: RINGFENCE_NODE_LABEL_VALUE:", RINGFENCE_NODE_LABEL_VALUE)
     
@@ -549,7 +815,13 @@ def resources(request: Optional[NodesActionRequest]=NodesActionRequest(), api_ke
     print(f"POSTTEST: Final request.nodes: {request.nodes}")
     print(f"POSTTEST: Final request.node_labels: {request.node_labels}")
     
-    result = fetch_resources(node_names=request.nodes, node_labels=request.node_labels)
+    result = await read_state(
+        mirrored,
+        max_staleness,
+        "/fetch_resources",
+        {"nodes": request.nodes, "node_labels": request.node_labels},
+        lambda: fetch_resources_async(node_names=request.nodes, node_labels=request.node_labels)
+    )
     return result
 
 @app.get("/fetch_job_names",
@@ -558,18 +830,27 @@ def resources(request: Optional[NodesActionRequest]=NodesActionRequest(), api_ke
     description="Retrieves the names of all jobs and models currently deployed or scheduled in the Kalavai pool. This provides an overview of all workloads in the system.",
     tags=["info"],
     response_description="List of job names")
-def job_names(api_key: str = Depends(verify_api_key)):
+async def job_names(max_staleness: float = Query(None), api_key: str = Depends(verify_api_key)):
     """Get list of job names"""
-    return fetch_job_names()
+    result = await read_state(
+        "job_names",
+        max_staleness,
+        "/fetch_job_names",
+        None,
+        fetch_job_names_async
+    )
+    return fast_response(result)
 
 @app.post("/fetch_gpus",
     operation_id="fetch_gpus",
     summary="Get GPU information across the pool",
-    description="Retrieves detailed information about all GPUs in the Kalavai pool, including their availability status, current utilization, and which jobs are using them. Can filter to show only available GPUs.",
+    description="Retrieves detailed information about all GPUs in the Kalavai pool, including their availability status, current utilization, and which jobs are using them. Can filter to show only available GPUs. Supports filtering (node, model), sorting (sort_by, order) and pagination (offset, limit); paginated results include the total count.",
     tags=["info"],
     response_description="List of GPUs")
-def gpus(
+async def gpus(
     request: FetchGPUsRequest,
+    max_staleness: float = Query(None),
+    listing: ListParams = Depends(),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -578,34 +859,72 @@ def gpus(
     - **available**: Whether to show only available GPUs
     - **node_names**: Optional list of node names to filter by
     - **node_labels**: Optional dictionary of node labels to filter by
+    - **max_staleness**: Maximum age (seconds) of mirrored data; 0 forces a refresh
     """
-    return fetch_gpus(
-        available=request.available,
-        node_names=request.node_names,
-        node_labels=request.node_labels
+    mirrored = "gpus" if request.node_names is None and request.node_labels is None else None
+    result = await read_state(
+        mirrored,
+        max_staleness,
+        "/fetch_gpus",
+        request.model_dump(),
+        lambda: fetch_gpus_async(
+            available=request.available,
+            node_names=request.node_names,
+            node_labels=request.node_labels
+        )
     )
+    if mirrored is not None and request.available and isinstance(result, list):
+        result = [gpu for gpu in result if gpu.ready]
+    return list_response(result, listing, GPU_FILTERS, list(GPU.model_fields))
 
 @app.get("/fetch_job_details",
     operation_id="fetch_job_details",
     summary="Get detailed information about specific job and model deployments",
-    description="Retrieves comprehensive information about jobs or models including their status, resource usage, runtime, and configuration. Useful for monitoring and debugging job execution.",
+    description="Retrieves comprehensive information about jobs or models including their status, resource usage, runtime, and configuration. Useful for monitoring and debugging job execution. Use fields to return only some job fields (e.g. fields=job_id,name,status). Supports filtering (job_id, status, owner, node), sorting (sort_by, order) and pagination (offset, limit); paginated results include the total count.",
     tags=["info"],
     response_description="Job details")
-def job_details(force_namespace: str = Query(None), api_key: str = Depends(verify_api_key)):
+async def job_details(
+    force_namespace: str = Query(None),
+    fields: str = Query(None, description=f"Comma separated job fields to return (default all): {', '.join(Job.model_fields)}"),
+    max_staleness: float = Query(None),
+    listing: ListParams = Depends(),
+    api_key: str = Depends(verify_api_key)
+):
     """Get job details"""
-    return fetch_job_details(force_namespace=force_namespace)
+    projection = parse_fields(fields, list(Job.model_fields))
+    # build only the projected fields plus those the listing filters / sorts on
+    needed = None
+    if projection is not None:
+        needed = [f for f in Job.model_fields if f in set(projection) | listing.fields(JOB_FILTERS)]
+    result = await read_state(
+        "jobs" if force_namespace is None else None,
+        max_staleness,
+        "/fetch_job_details",
+        {"force_namespace": force_namespace, "fields": needed},
+        lambda: fetch_job_details_async(force_namespace=force_namespace, fields=needed)
+    )
+    if isinstance(result, dict) and "error" in result:
+        return fast_response(result)
+    result = apply_listing(result, listing, JOB_FILTERS, list(Job.model_fields))
+    if isinstance(result, dict):
+        result["items"] = project(result["items"], projection)
+    else:
+        result = project(result, projection)
+    return fast_response(result)
 
 @app.get("/fetch_job_logs",
     operation_id="fetch_job_logs",
     summary="Get execution logs for a specific job",
-    description="Retrieves the execution logs for a specified job, providing real-time or historical output from the job's containers. Useful for debugging, monitoring progress, and understanding job behavior.",
+    description="Retrieves the execution logs for a specified job, providing real-time or historical output from the job's containers. Useful for debugging, monitoring progress, and understanding job behavior. Pass the next_line of each pod back as since_line (or a Unix timestamp as since_ts) to get only the lines written since.",
     tags=["info", "avoid"],
     response_description="Job logs")
-def job_logs(
+async def job_logs(
     job_name: str,
     force_namespace: str = Query(None),
     pod_name: str = Query(None),
     tail: int = Query(100),
+    since_line: Optional[int] = Query(None, ge=0, description="Only lines from this line number on (the next_line of a previous call)"),
+    since_ts: Optional[float] = Query(None, description="Only lines written at or after this Unix timestamp"),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -615,12 +934,63 @@ def job_logs(
     - **force_namespace**: Optional namespace override
     - **pod_name**: Optional pod name
     - **tail**: Number of log lines to return
+    - **since_line**: Optional line number to return the lines from (incremental reads)
+    - **since_ts**: Optional Unix timestamp to return the lines from (incremental reads)
     """
-    return fetch_job_logs(
+    return await read_job_logs_async(
         job_name=job_name,
         force_namespace=force_namespace,
         pod_name=pod_name,
-        tail=tail
+        tail=tail,
+        since_line=since_line,
+        since_ts=since_ts
+    )
+
+@app.get("/stream_job_logs",
+    operation_id="stream_job_logs",
+    summary="Follow the execution logs of a job",
+    description="Streams the log lines of every pod of a job as newline delimited JSON, starting with the current tail. Each line is tagged with its pod, its line number and byte offset in the pod log and its timestamp. Use since to skip lines older than a Unix timestamp, since_line to resume from a line number and follow=false to get the current tail only.",
+    tags=["info", "avoid"],
+    response_description="application/x-ndjson stream of log records")
+async def stream_job_logs(
+    job_name: str,
+    force_namespace: str = Query(None),
+    pod_name: str = Query(None),
+    tail: int = Query(100, ge=1),
+    since: Optional[float] = Query(None, description="Only lines written at or after this Unix timestamp"),
+    since_line: Optional[int] = Query(None, ge=0, description="Resume each pod from this line number"),
+    follow: bool = Query(True, description="Keep streaming new lines"),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Follow job logs with the following parameters:
+
+    - **job_name**: Name of the job
+    - **force_namespace**: Optional namespace override
+    - **pod_name**: Optional pod name
+    - **tail**: Number of log lines read per pod and poll
+    - **since**: Optional Unix timestamp of the oldest line to send
+    - **since_line**: Optional line number to resume from
+    - **follow**: Whether to keep streaming new lines
+    """
+    async def _stream():
+        async for record in follow_job_logs_async(
+            job_name=job_name,
+            force_namespace=force_namespace,
+            pod_name=pod_name,
+            tail=tail,
+            since=since,
+            since_line=since_line,
+            follow=follow,
+            heartbeat=WATCH_HEARTBEAT
+        ):
+            # blank lines keep idle connections open
+            yield b"\n" if record is None else json_dumps(record) + b"\n"
+
+    return StreamingResponse(
+        _stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @app.get("/fetch_job_templates",
@@ -629,17 +999,109 @@ def job_logs(
     description="Retrieves a list of all available job templates that can be used to deploy workloads. Templates provide predefined configurations for frameworks.",
     tags=["info"],
     response_description="List of job templates")
-def job_templates(statuses: list[str] = Query(None), api_key: str = Depends(verify_api_key)):
-    return fetch_job_templates(statuses=statuses)
+async def job_templates(statuses: list[str] = Query(None), api_key: str = Depends(verify_api_key)):
+    return await fetch_job_templates_async(statuses=statuses)
 
 @app.get("/fetch_pool_services",
     operation_id="fetch_pool_services",
     summary="Get available job services",
-    description="Retrieves a list of all available job services attach to jobs deployed",
+    description="Retrieves a list of all available job services attach to jobs deployed. Supports filtering (owner), sorting (sort_by, order) and pagination (offset, limit); paginated results include the total count.",
     tags=["info"],
     response_description="List of job services")
-def job_services(api_key: str = Depends(verify_api_key)):
-    return fetch_pool_services()
+async def job_services(max_staleness: float = Query(None), listing: ListParams = Depends(), api_key: str = Depends(verify_api_key)):
+    """
+    Get job services. With any listing parameter (offset, limit, sort_by,
+    owner) services are returned as one flat page, with their namespace.
+    """
+    result = await read_state(
+        "services",
+        max_staleness,
+        "/fetch_pool_services",
+        None,
+        fetch_pool_services_async
+    )
+    if listing.requested and not "error" in result:
+        result = flatten_services(result)
+    return list_response(result, listing, SERVICE_FILTERS, ["namespace", *Service.model_fields])
+
+@app.post("/fetch_pool_snapshot",
+    operation_id="fetch_pool_snapshot",
+    summary="Get a snapshot of the pool state in a single call",
+    description="Gathers resources, devices, GPUs, job names and job services of the pool concurrently and returns them as one document; the time the snapshot was taken is in the X-Snapshot-Timestamp header (Unix time), so that unchanged pool state keeps its ETag. Equivalent to calling fetch_resources, fetch_devices, fetch_gpus, fetch_job_names and fetch_pool_services, in a single round trip.",
+    tags=["info"],
+    response_description="Pool snapshot")
+async def pool_snapshot(request: Optional[FetchPoolSnapshotRequest]=FetchPoolSnapshotRequest(), max_staleness: float = Query(None), api_key: str = Depends(verify_api_key)):
+    """
+    Get a pool snapshot with the following parameters:
+
+    - **nodes**: Optional list of node names to filter resources and GPUs by
+    - **node_labels**: Optional dictionary of node labels to filter by
+    - **force_namespace**: Optional namespace for the pool services
+    - **max_staleness**: Maximum age (seconds) of mirrored data; 0 forces a refresh
+    """
+    node_labels = request.node_labels
+    if RINGFENCE_NODE_LABEL is not None and RINGFENCE_NODE_LABEL_VALUE is not None:
+        node_labels = {RINGFENCE_NODE_LABEL: RINGFENCE_NODE_LABEL_VALUE, **(node_labels or {})}
+    force_namespace = FORCED_USER_SPACE_NAME if FORCED_USER_SPACE_NAME is not None else request.force_namespace
+    # mirrored devices and resources are already ringfenced
+    if STATE_MIRROR is not None and request.nodes is None and request.node_labels is None and force_namespace is None:
+        sections = ["resources", "devices", "gpus", "job_names", "services"]
+        results = await asyncio.gather(*[STATE_MIRROR.get(s, max_staleness=max_staleness) for s in sections])
+        updated = [STATE_MIRROR.updated_at(s) for s in sections]
+        snapshot = {"timestamp": min([t for t in updated if t is not None], default=time.time())}
+        snapshot.update(zip(sections, results))
+        if isinstance(snapshot["gpus"], list):
+            gpus = ringfence_gpus(snapshot["gpus"], snapshot["devices"])
+            # without the devices the GPUs cannot be ringfenced: report their error
+            snapshot["gpus"] = snapshot["devices"] if gpus is None else gpus
+        return snapshot_response(snapshot)
+    result = await RESPONSE_CACHE.get_or_fetch(
+        "/fetch_pool_snapshot",
+        {"nodes": request.nodes, "node_labels": node_labels, "force_namespace": force_namespace},
+        lambda: fetch_pool_snapshot_async(
+            node_names=request.nodes,
+            node_labels=node_labels,
+            force_namespace=force_namespace
+        )
+    )
+    return snapshot_response(result)
+
+@app.get("/watch",
+    operation_id="watch",
+    summary="Stream changes of the pool state",
+    description="Server-sent event stream of typed pool changes: job status transitions (job_status), node readiness, cordon and pressure changes (node_status) and GPU availability changes (gpu_availability). The current state is sent first, as events without a previous value. Subscribe to a subset with the namespaces (job events only) and types parameters.",
+    tags=["info", "avoid"],
+    response_description="text/event-stream of change events")
+async def watch(
+    namespaces: Optional[List[str]] = Query(None),
+    types: Optional[List[str]] = Query(None),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Stream pool changes with the following parameters:
+
+    - **namespaces**: Optional list of namespaces to receive job events for
+    - **types**: Optional list of event types (job_status, node_status, gpu_availability)
+    """
+    if types is not None:
+        unknown = set(types) - set(EVENT_TYPES)
+        if len(unknown) > 0:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {sorted(unknown)}. Valid: {list(EVENT_TYPES)}")
+    if FORCED_USER_SPACE_NAME is not None:
+        namespaces = [FORCED_USER_SPACE_NAME]
+
+    async def _stream():
+        async for event in EVENT_HUB.subscribe(namespaces=namespaces, types=types, heartbeat=WATCH_HEARTBEAT):
+            if event is None:
+                yield b": keep-alive\n\n"
+            else:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode() + json_dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/fetch_template_values",
     operation_id="fetch_template_values",
@@ -647,8 +1109,8 @@ def job_services(api_key: str = Depends(verify_api_key)):
     description="Retrieves the default values for a specific job or model engine template deployment. This helps users understand what parameters are required and what their default values are before deploying a job.",
     tags=["info"],
     response_description="Job and model engine default values")
-def template_defaults(name: str, api_key: str = Depends(verify_api_key)):
-    result = fetch_template_data(name=name)
+async def template_defaults(name: str, api_key: str = Depends(verify_api_key)):
+    result = await fetch_template_data_async(name=name)
     return result["values"]
 
 @app.get("/fetch_template_all",
@@ -657,8 +1119,8 @@ def template_defaults(name: str, api_key: str = Depends(verify_api_key)):
     description="Retrieves all data (metadata, values and schema) for a specific job or model engine template deployment. Helps users understand how to use a template.",
     tags=["info"],
     response_description="Job and model engine template data")
-def template_all(name: str, api_key: str = Depends(verify_api_key)):
-    result = fetch_template_data(name=name)
+async def template_all(name: str, api_key: str = Depends(verify_api_key)):
+    result = await fetch_template_data_async(name=name)
     return result
 
 @app.get("/fetch_template_metadata",
@@ -667,8 +1129,8 @@ def template_all(name: str, api_key: str = Depends(verify_api_key)):
     description="Retrieves the metadata associated with a specific job or model engine template deployment. This helps users understand what the template can be used for.",
     tags=["info"],
     response_description="Job and model engine metadata values")
-def template_metadata(name: str, api_key: str = Depends(verify_api_key)):
-    result = fetch_template_data(name=name)
+async def template_metadata(name: str, api_key: str = Depends(verify_api_key)):
+    result = await fetch_template_data_async(name=name)
     return result["metadata"]
 
 @app.get("/fetch_template_schema",
@@ -677,8 +1139,8 @@ def template_metadata(name: str, api_key: str = Depends(verify_api_key)):
     description="Retrieves the schema associated with a specific template deployment.",
     tags=["info"],
     response_description="Template schema")
-def job_rules(name: str, api_key: str = Depends(verify_api_key)):
-    result = fetch_template_data(name=name)
+async def job_rules(name: str, api_key: str = Depends(verify_api_key)):
+    result = await fetch_template_data_async(name=name)
     return result["schema"]
 
 @app.post("/deploy_job",
@@ -687,7 +1149,7 @@ def job_rules(name: str, api_key: str = Depends(verify_api_key)):
     description="Deploys a new job to the Kalavai pool using one of the available templates and configuration. The job will be scheduled on appropriate nodes based on resource availability and any specified target labels.",
     tags=["job_management"],
     response_description="Result of job deployment")
-def job_deploy(request: DeployJobRequest, api_key: str = Depends(verify_api_key)):
+async def job_deploy(request: DeployJobRequest, api_key: str = Depends(verify_api_key)):
     """
     Deploy a job with the following parameters:
     
@@ -703,7 +1165,7 @@ def job_deploy(request: DeployJobRequest, api_key: str = Depends(verify_api_key)
     if FORCED_PRIORITY:
         logger.info(f"FORCE_PRIORITY set, ignoring user requested priority: {request.priority}")
 
-    result = deploy_job(
+    result = await deploy_job_async(
         job_name=request.name,
         template_repo=request.template_repo,
         template_name=request.template_name,
@@ -715,6 +1177,7 @@ def job_deploy(request: DeployJobRequest, api_key: str = Depends(verify_api_key)
         random_suffix=request.random_suffix,
         priority=FORCED_PRIORITY if FORCED_PRIORITY is not None else request.priority
     )
+    invalidate_state()
     return result
 
 @app.post("/deploy_custom_job",
@@ -723,7 +1186,7 @@ def job_deploy(request: DeployJobRequest, api_key: str = Depends(verify_api_key)
     description="Deploys a new job to the Kalavai pool using a specified template and configuration. The job will be scheduled on appropriate nodes based on resource availability and any specified target labels.",
     tags=["job_management"],
     response_description="Result of job deployment")
-def custom_job_deploy(request: CustomDeployJobRequest, api_key: str = Depends(verify_api_key)):
+async def custom_job_deploy(request: CustomDeployJobRequest, api_key: str = Depends(verify_api_key)):
     """
     Deploy a custom job with the following parameters:
     """
@@ -733,7 +1196,7 @@ def custom_job_deploy(request: CustomDeployJobRequest, api_key: str = Depends(ve
         request.target_labels = {RINGFENCE_NODE_LABEL: [RINGFENCE_NODE_LABEL_VALUE], **request.target_labels}
     if FORCED_PRIORITY:
         logger.info(f"FORCE_PRIORITY set, ignoring user requested priority: {request.priority}")
-    result = deploy_test_job(
+    result = await deploy_test_job_async(
         template_str=request.template_str,
         values_dict=request.values,
         force_namespace=request.force_namespace,
@@ -741,6 +1204,7 @@ def custom_job_deploy(request: CustomDeployJobRequest, api_key: str = Depends(ve
         target_labels=request.target_labels,
         priority=FORCED_PRIORITY if FORCED_PRIORITY is not None else request.priority
     )
+    invalidate_state()
     return result
 
 @app.post("/delete_job",
@@ -749,17 +1213,18 @@ def custom_job_deploy(request: CustomDeployJobRequest, api_key: str = Depends(ve
     description="Terminates a running job and removes it from the Kalavai pool. This will stop all containers associated with the job and free up the resources they were using.",
     tags=["job_management"],
     response_description="Result of job deletion")
-def job_delete(request: DeleteJobRequest, api_key: str = Depends(verify_api_key)):
+async def job_delete(request: DeleteJobRequest, api_key: str = Depends(verify_api_key)):
     """
     Delete a job with the following parameters:
     
     - **name**: Name of the job to delete
     - **force_namespace**: Optional namespace override
     """
-    result = delete_job(
+    result = await delete_job_async(
         name=request.name,
         force_namespace=request.force_namespace
     )
+    invalidate_state()
     return result
 
 @app.get("/authenticate_user",
@@ -807,9 +1272,9 @@ def logout_user():
     description="Verifies whether the current instance is connected to a Kalavai pool. Returns connection status and pool information if connected.",
     tags=["agent_management"],
     response_description="Connection status")
-def pool_connected():
+async def pool_connected():
     """Check if connected to a pool"""
-    result = is_connected()
+    result = await is_connected_async()
     return result
 
 @app.get("/is_agent_running",
@@ -862,9 +1327,10 @@ def agent_resume():
     description="Updates the local Helm repositories by adding configured repositories and refreshing their contents. This ensures access to the latest charts and templates.",
     tags=["repository_management"],
     response_description="Result of repository update")
-def update_repositories(api_key: str = Depends(verify_api_key)):
+async def update_repositories(api_key: str = Depends(verify_api_key)):
     """Update local Helm repositories"""
-    result = update_local_repositories()
+    result = await update_local_repositories_async()
+    invalidate_state()
     if "error" in result:
         logger.error(result)
         raise HTTPException(status_code=500, detail=result["error"])
@@ -891,17 +1357,18 @@ def ip_addresses(subnet: str = None, api_key: str = Depends(verify_api_key)):
     description="Adds custom labels to a specific compute node in the pool. Labels can be used for job scheduling, resource allocation, and organizational purposes. Labels are key-value pairs that help categorize and identify nodes.",
     tags=["pool_management"],
     response_description="Result of adding labels")
-def node_labels(request: NodeLabelsRequest, api_key: str = Depends(verify_api_key)):
+async def node_labels(request: NodeLabelsRequest, api_key: str = Depends(verify_api_key)):
     """
     Add node labels with the following parameters:
     
     - **node_name**: Name of the node
     - **labels**: Dictionary of labels to add
     """
-    result = add_node_labels(
+    result = await add_node_labels_async(
         node_name=request.node_name,
         labels=request.labels
     )
+    invalidate_state()
     return result
 
 @app.get("/get_node_labels",
@@ -910,14 +1377,18 @@ def node_labels(request: NodeLabelsRequest, api_key: str = Depends(verify_api_ke
     description="Retrieves all labels associated with specified compute nodes in the pool. Labels provide metadata about nodes and can be used for filtering and scheduling decisions.",
     tags=["info"],
     response_description="Node labels")
-def node_labels_get(nodes: Optional[List[str]] = Query(None), api_key: str = Depends(verify_api_key)):
+async def node_labels_get(nodes: Optional[List[str]] = Query(None), max_staleness: float = Query(None), api_key: str = Depends(verify_api_key)):
     """
     Get node labels with the following parameters:
     
     - **nodes**: List of node names to get labels for
     """
-    result = get_node_labels(
-        node_names=nodes
+    result = await read_state(
+        "labels" if nodes is None else None,
+        max_staleness,
+        "/get_node_labels",
+        {"nodes": nodes},
+        lambda: get_node_labels_async(node_names=nodes)
     )
     return result
 
@@ -927,7 +1398,7 @@ def node_labels_get(nodes: Optional[List[str]] = Query(None), api_key: str = Dep
     description="Get available user spaces in the pool.",
     tags=["info"],
     response_description="Available user spaces")
-def get_available_user_spaces(api_key: str = Depends(verify_api_key)):
+async def get_available_user_spaces(api_key: str = Depends(verify_api_key)):
     """
     Get node labels with the following parameters:
     
@@ -936,7 +1407,7 @@ def get_available_user_spaces(api_key: str = Depends(verify_api_key)):
     if FORCED_USER_SPACE_NAME is not None:
         return [FORCED_USER_SPACE_NAME]
     else:
-        user_spaces = get_user_spaces()
+        user_spaces = await get_user_spaces_async()
         print("Returned by watcher:", user_spaces)
         return user_spaces
 
@@ -946,16 +1417,16 @@ def get_available_user_spaces(api_key: str = Depends(verify_api_key)):
     description="Get resource quota for the user space, including GPU, CPU and memory allowance.",
     tags=["info"],
     response_description="Available resource quota")
-def get_user_space_quota(space_name: str=None, api_key: str = Depends(verify_api_key)):
+async def get_user_space_quota(space_name: str=None, api_key: str = Depends(verify_api_key)):
     """
     Get resource quota for the user space with the following parameters:
     
     - **user_id**: name of the user space to get resource quota for
     """
     if FORCED_USER_SPACE_NAME is not None:
-        return get_space_quota(space_name=FORCED_USER_SPACE_NAME)
+        return await get_space_quota_async(space_name=FORCED_USER_SPACE_NAME)
     else:
-        return get_space_quota(space_name=space_name)
+        return await get_space_quota_async(space_name=space_name)
 
 @app.post("/set_user_space_quota",
     operation_id="set_user_space_quota",
@@ -963,7 +1434,7 @@ def get_user_space_quota(space_name: str=None, api_key: str = Depends(verify_api
     description="Set resource quota for the user space, including GPU, CPU and memory allowance.",
     tags=["info"],
     response_description="Set result")
-def set_user_space_quota(request: UserQuotaRequest, api_key: str = Depends(verify_api_key)):
+async def set_user_space_quota(request: UserQuotaRequest, api_key: str = Depends(verify_api_key)):
     """
     Set resource quota for the user space with the following parameters:
     
@@ -972,11 +1443,13 @@ def set_user_space_quota(request: UserQuotaRequest, api_key: str = Depends(verif
     if FORCED_USER_SPACE_NAME is not None:
         return {"error": "Cannot set user space quota for a client-only instance"}
     
-    return set_space_quota(
+    result = await set_space_quota_async(
         user_id=request.user_id,
         quota=request.quota,
         labels=request.labels
     )
+    invalidate_state()
+    return result
 
 @app.delete("/delete_user_space",
     operation_id="delete_user_space",
@@ -984,7 +1457,7 @@ def set_user_space_quota(request: UserQuotaRequest, api_key: str = Depends(verif
     description="Delete user space.",
     tags=["info"],
     response_description="Delete result")
-def delete_space(user_id: str, api_key: str = Depends(verify_api_key)):
+async def delete_space(user_id: str, api_key: str = Depends(verify_api_key)):
     """
     Delete user space with the following parameters:
     
@@ -993,9 +1466,11 @@ def delete_space(user_id: str, api_key: str = Depends(verify_api_key)):
     if FORCED_USER_SPACE_NAME is not None:
         return {"error": "Cannot delete user space for a client-only instance"}
     
-    return delete_user_space(
+    result = await delete_user_space_async(
         user_id=user_id
     )
+    invalidate_state()
+    return result
 
 @app.post("/set_user_space_secret",
     operation_id="set_user_space_secret",
@@ -1003,7 +1478,7 @@ def delete_space(user_id: str, api_key: str = Depends(verify_api_key)):
     description="Creates or updates secret data for a specific user space. This data is stored securely and can be used for configuration or credentials.",
     tags=["info"],
     response_description="Result of setting secret data")
-def set_secret(request: UserSpaceSecretRequest, api_key: str = Depends(verify_api_key)):
+async def set_secret(request: UserSpaceSecretRequest, api_key: str = Depends(verify_api_key)):
     """
     Set secret data for a user space with the following parameters:
     
@@ -1013,7 +1488,7 @@ def set_secret(request: UserSpaceSecretRequest, api_key: str = Depends(verify_ap
     if FORCED_USER_SPACE_NAME is not None and request.user_id != FORCED_USER_SPACE_NAME:
         return {"error": f"Cannot set user space secret for other users. {FORCED_USER_SPACE_NAME} only"}
     
-    return set_user_space_secret(
+    return await set_user_space_secret_async(
         user_id=request.user_id,
         data=request.data
     )
@@ -1024,40 +1499,81 @@ def set_secret(request: UserSpaceSecretRequest, api_key: str = Depends(verify_ap
     description="Retrieves secret data for a specific user space. This data is stored securely and can be used for configuration or credentials.",
     tags=["info"],
     response_description="Secret data for the user space")
-def fetch_secret(user_id: str, api_key: str = Depends(verify_api_key)):
+async def fetch_secret(user_id: str, api_key: str = Depends(verify_api_key)):
     """
     Fetch secret data for a user space with the following parameters:
     
     - **user_id**: User ID for which to fetch the secret data
     """
     if FORCED_USER_SPACE_NAME is not None:
-        return fetch_user_space_secret(user_id=FORCED_USER_SPACE_NAME)
+        return await fetch_user_space_secret_async(user_id=FORCED_USER_SPACE_NAME)
     
-    return fetch_user_space_secret(user_id=user_id)
+    return await fetch_user_space_secret_async(user_id=user_id)
 
 @app.get("/get_metrics",
     operation_id="get_metrics",
     summary="Fetch metrics data",
-    description="Retrieves metrics data from the Metrics API (clickhouse).",
+    description="Retrieves metrics data from the Metrics API (clickhouse). Set format to columnar ({columns, data}) or arrow (Arrow IPC stream) for large results, or to ndjson / csv to stream the rows block by block (bounded by max_rows and max_bytes; a truncated ndjson stream ends with a {truncated: true} record).",
     tags=["info"],
     response_description="Metrics data")
-def get_metrics(query: str, api_key: str = Depends(verify_api_key)):
+def get_metrics(
+    request: Request,
+    query: str,
+    format: str = Query("dict", description=f"Result format: {', '.join(FORMATS + STREAM_FORMATS)}"),
+    max_rows: Optional[int] = Query(None, ge=1, description="Maximum number of rows of a streamed result"),
+    max_bytes: Optional[int] = Query(None, ge=1, description="Maximum size of a streamed result"),
+    api_key: str = Depends(verify_api_key)
+):
     """
     Fetch metrics data with the following parameters:
     
     - **query**: SQL query to execute
+    - **format**: Result format (dict, columnar or arrow; ndjson or csv to stream it)
+    - **max_rows**: Optional row limit of a streamed result
+    - **max_bytes**: Optional size limit of a streamed result
     """
-    return metrics_api.query(query=query)
+    if format not in STREAM_FORMATS:
+        format = metrics_format(format)
+        return metrics_response(metrics_api.query(query=query, format=format), format)
+    max_rows = CLICKHOUSE_STREAM_MAX_ROWS if max_rows is None else min(max_rows, CLICKHOUSE_STREAM_MAX_ROWS)
+    max_bytes = CLICKHOUSE_STREAM_MAX_BYTES if max_bytes is None else min(max_bytes, CLICKHOUSE_STREAM_MAX_BYTES)
+    cancelled = threading.Event()
+    chunks = metrics_api.stream_query(
+        query=query,
+        format=format,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        cancelled=cancelled
+    )
+    return StreamingResponse(
+        threaded_stream(request, chunks, cancelled),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"X-Row-Limit": str(max_rows), "X-Byte-Limit": str(max_bytes), "X-Accel-Buffering": "no"}
+    )
 
 # Endpoint to check health
 @app.get("/health", 
     operation_id="health",
     summary="Check the health of the Kalavai API",
     tags=["info"],
-    description="Checks the health of the kalavai API",
+    description="Checks the health of the kalavai API, the state of the watcher circuit breakers, the read cache and log buffer counters and the readiness of the metrics service. Returns 503 when every watcher endpoint seen so far has its circuit open.",
     response_description="OK")
 async def health():
-    return HTTPException(status_code=200, detail="OK")
+    breakers = breaker_states()
+    status = {
+        "status_code": 200,
+        "detail": "OK",
+        "breakers": breakers,
+        "cache": RESPONSE_CACHE.stats(),
+        "watch": EVENT_HUB.stats(),
+        "mirror": None if STATE_MIRROR is None else STATE_MIRROR.stats(),
+        "logs": LOG_BUFFER.stats(),
+        "metrics": metrics_api.stats()
+    }
+    if len(breakers) > 0 and all(b["state"] == OPEN for b in breakers.values()):
+        status.update(status_code=503, detail="Watcher unavailable")
+        return JSONResponse(status_code=503, content=status)
+    return status
 
 
 ### BUILD MCP WRAPPER ###
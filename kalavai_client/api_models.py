@@ -10,11 +10,16 @@ class UserComputeUsageRequest(BaseModel):
     job_ids: Optional[Union[None, List[str]]] = None
     user_ids: Optional[List[str]] = Field(None, description="List of user ids to filter metrics, defaults to all available")
     aggregate: Optional[bool] = True
+    bucket: Optional[Literal["hour", "day", "week", "month"]] = Field("hour", description="Time bucket of the rows when not aggregated (returned as hour: the start of the bucket)")
+    top_n: Optional[int] = Field(None, ge=1, description="Keep the top N jobs by vram_hours, the rest summed as job 'other', defaults to all jobs")
 
 class ProviderComputeUsageRequest(BaseModel):
     start_time: str
     end_time: str
     provider_ids: Optional[List[str]] = Field(None, description="List of provider ids to filter metrics, defaults to all available")
+    aggregate: Optional[bool] = True
+    bucket: Optional[Literal["hour", "day", "week", "month"]] = Field("hour", description="Time bucket of the rows when not aggregated (returned as hour: the start of the bucket)")
+    top_n: Optional[int] = Field(None, ge=1, description="Keep the top N providers by vram_hours, the rest summed as provider 'other', defaults to all providers")
 
 class ComputeUsageRequest(BaseModel):
     start_time: str
@@ -138,6 +143,11 @@ class UserQuotaRequest(BaseModel):
 class FetchDevicesRequest(BaseModel):
     node_labels: Optional[Union[dict[str, str], None]] = Field(None, description="Optional target node labels")
 
+class FetchPoolSnapshotRequest(BaseModel):
+    nodes: Optional[List[str]] = Field(None, description="Optional list of node names to restrict resources and GPUs to")
+    node_labels: Optional[Union[dict[str, str], None]] = Field(None, description="Optional node labels to filter by")
+    force_namespace: Optional[str] = Field(None, description="Optional namespace for the pool services")
+
 class UserSpaceSecretRequest(BaseModel):
     user_id: str = Field(description="User ID for which to set the secret data")
     data: dict = Field(description="Dictionary containing the secret data to store")
@@ -0,0 +1,269 @@
+"""
+Circuit breakers and retries for calls to the kube-watcher.
+
+Each watcher endpoint gets its own breaker. After BREAKER_FAILURE_THRESHOLD
+consecutive failures (connection errors, timeouts or 5xx responses) the
+breaker opens and calls fail fast with CircuitOpenError. Once
+BREAKER_RESET_TIMEOUT has passed, a single caller is let through
+(half-open): the registered health probe runs first and, if the watcher is
+alive, the call goes ahead and its outcome closes or re-opens the breaker.
+"""
+import asyncio
+import random
+import threading
+import time
+
+from kalavai_client.deadline import remaining_time
+from kalavai_client.env import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX
+)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# status codes worth retrying for idempotent requests
+RETRY_STATUS_CODES = (502, 503, 504)
+# endpoints used to probe the watcher are never guarded (or the probe
+# would be blocked by the breaker it is trying to close)
+UNGUARDED_ENDPOINTS = ("/v1/health",)
+
+
+class CircuitOpenError(ConnectionError):
+    def __init__(self, name, retry_in):
+        super().__init__(f"Watcher endpoint {name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker():
+    def __init__(
+        self,
+        name,
+        failure_threshold: int=BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float=BREAKER_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def _retry_in(self):
+        return max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def acquire(self):
+        """
+        Ask permission to make a call.
+
+        Returns:
+            CLOSED if the call can go ahead, HALF_OPEN if the caller is the
+            trial call and must probe the watcher first
+
+        Raises:
+            CircuitOpenError if the breaker is open (or a trial is in flight)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return CLOSED
+            if self.state == OPEN and self._retry_in() <= 0:
+                self.state = HALF_OPEN
+                return HALF_OPEN
+            raise CircuitOpenError(self.name, self._retry_in())
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """Give up a half-open trial without an outcome (let the next caller try)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                self.opened_at = time.monotonic() - self.reset_timeout
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "retry_in": round(self._retry_in(), 1) if self.state == OPEN else 0
+            }
+
+
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+_HEALTH_PROBES = {"sync": None, "async": None}
+
+
+def get_breaker(name):
+    breaker = _BREAKERS.get(name)
+    if breaker is not None:
+        return breaker
+    with _BREAKERS_LOCK:
+        return _BREAKERS.setdefault(name, CircuitBreaker(name))
+
+def breaker_states():
+    """State of every breaker seen so far, keyed by endpoint"""
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+def reset_breakers():
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+def set_health_probe(probe=None, async_probe=None):
+    """
+    Register the functions used to check the watcher before a half-open trial.
+
+    Args:
+        probe: Callable returning True if the watcher is alive
+        async_probe: Coroutine function returning True if the watcher is alive
+    """
+    _HEALTH_PROBES["sync"] = probe
+    _HEALTH_PROBES["async"] = async_probe
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given (0-based) retry attempt"""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+def _retry_delay(attempt, last_attempt):
+    """Backoff before the next attempt, or None if there is no time left to retry"""
+    if last_attempt:
+        return None
+    delay = backoff_delay(attempt)
+    remaining = remaining_time()
+    if remaining is not None and remaining <= delay:
+        return None
+    return delay
+
+def _record_transport_failure(breaker):
+    # a timeout caused by the caller's own deadline says nothing about the watcher
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        breaker.release()
+    else:
+        breaker.record_failure()
+
+def _max_attempts(method):
+    return max(1, RETRY_ATTEMPTS) if method.lower() == "get" else 1
+
+def _open_if_probe_fails(breaker, alive):
+    if not alive:
+        breaker.record_failure()
+        raise CircuitOpenError(breaker.name, breaker.reset_timeout)
+
+def _probe(breaker, probe):
+    try:
+        alive = probe is None or probe()
+    except BaseException:
+        breaker.release()
+        raise
+    _open_if_probe_fails(breaker, alive)
+
+async def _probe_async(breaker, probe):
+    try:
+        alive = probe is None or await probe()
+    except BaseException:
+        breaker.release()
+        raise
+    _open_if_probe_fails(breaker, alive)
+
+
+def guarded_call(endpoint, method, send, transport_errors):
+    """
+    Make a watcher call through the endpoint breaker, retrying idempotent GETs.
+
+    Args:
+        endpoint: Watcher endpoint (breaker key)
+        method: HTTP method of the call
+        send: Callable that performs the request and returns the response
+        transport_errors: Exception types that count as a failed call
+
+    Returns:
+        The response returned by send
+    """
+    breaker = None if endpoint in UNGUARDED_ENDPOINTS else get_breaker(endpoint)
+    if breaker is not None and breaker.acquire() == HALF_OPEN:
+        _probe(breaker, _HEALTH_PROBES["sync"])
+
+    attempts = _max_attempts(method)
+    for attempt in range(attempts):
+        last_attempt = attempt + 1 == attempts
+        try:
+            response = send()
+        except transport_errors:
+            delay = _retry_delay(attempt, last_attempt)
+            if delay is not None:
+                time.sleep(delay)
+                continue
+            if breaker is not None:
+                _record_transport_failure(breaker)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        if response.status_code in RETRY_STATUS_CODES:
+            delay = _retry_delay(attempt, last_attempt)
+            if delay is not None:
+                time.sleep(delay)
+                continue
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
+
+async def guarded_call_async(endpoint, method, send, transport_errors):
+    """Async equivalent of guarded_call (send is a coroutine function)"""
+    breaker = None if endpoint in UNGUARDED_ENDPOINTS else get_breaker(endpoint)
+    if breaker is not None and breaker.acquire() == HALF_OPEN:
+        await _probe_async(breaker, _HEALTH_PROBES["async"])
+
+    attempts = _max_attempts(method)
+    for attempt in range(attempts):
+        last_attempt = attempt + 1 == attempts
+        try:
+            response = await send()
+        except transport_errors:
+            delay = _retry_delay(attempt, last_attempt)
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+            if breaker is not None:
+                _record_transport_failure(breaker)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        if response.status_code in RETRY_STATUS_CODES:
+            delay = _retry_delay(attempt, last_attempt)
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
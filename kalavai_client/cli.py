@@ -13,6 +13,7 @@ import yaml
 
 import arguably
 from rich.console import Console
+from rich.markup import escape
 
 from kalavai_client.cluster import CLUSTER
 from kalavai_client.env import (
@@ -58,6 +59,7 @@ from kalavai_client.utils import (
     load_user_id,
     parse_key_value_pairs,
     request_to_api,
+    stream_from_api,
     store_server_info,
     has_api_details,
     CLUSTER_NAME_KEY,
@@ -195,6 +197,27 @@ def show_connection_suggestion():
     console.log("- Join a pool: [yellow]kalavai pool join")
     console.log("- Connect to a remote pool: [yellow]kalavai pool connect")
 
+def follow_job_logs(params):
+    try:
+        for record in stream_from_api(endpoint="/stream_job_logs", params=params):
+            if "error" in record or "detail" in record:
+                console.log(f"[red]{record}")
+            elif "event" in record:
+                console.log(f"[white]{record['pod']}: {record['event']}")
+            else:
+                console.print(f"[yellow]{record['pod']}[/yellow] {escape(record['line'])}", highlight=False)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        console.log(f"[red]Log stream interrupted: {str(e)}")
+
+def is_api_health(response):
+    """Whether a /health response comes from a kalavai API (it reports its watcher breakers)"""
+    try:
+        return "breakers" in response.json()
+    except ValueError:
+        return False
+
 ##################
 ## CLI COMMANDS ##
 ##################
@@ -388,11 +411,14 @@ def pool__connect(url: str, key: str, *others):
     # test connection
     import requests
     response = requests.get(f"{url}/health")
-    
-    if response.status_code != 200:
+
+    if response.status_code == 503 and is_api_health(response):
+        # the API is there, its watcher is not (yet): connect anyway
+        console.log(f"[yellow]External API at {url} is up but cannot reach the pool watcher: {response.json()['detail']}")
+    elif response.status_code != 200:
         console.log(f"[red]Connection error. Cannot find external API at {url}")
         return
-    
+
     # store new details for remote API
     store_server_info(
         file=USER_LOCAL_SERVER_FILE,
@@ -1434,7 +1460,8 @@ def job__list(*others, force_namespace: str=None):
         show_connection_suggestion()
         return
     
-    data = {}
+    # only the fields shown in the table
+    data = {"fields": "job_id,name,workers,endpoint"}
     if force_namespace is not None:
         data["force_namespace"] = force_namespace
     details = request_to_api(
@@ -1462,9 +1489,9 @@ def job__list(*others, force_namespace: str=None):
         console.log("[red]Error when querying backend")
 
 @arguably.command
-def job__logs(job_id, *others, pod_name=None, tail=100, force_namespace: str=None):
+def job__logs(job_id, *others, pod_name=None, tail=100, force_namespace: str=None, follow=False):
     """
-    Get logs for a specific job
+    Get logs for a specific job (--follow to keep streaming new lines)
     """
     if not has_api_details():
         show_connection_suggestion()
@@ -1480,6 +1507,9 @@ def job__logs(job_id, *others, pod_name=None, tail=100, force_namespace: str=Non
     }
     if force_namespace is not None:
         data["force_namespace"] = force_namespace
+    if follow:
+        follow_job_logs(params=data)
+        return
     results = request_to_api(
         method="GET",
         endpoint="/fetch_job_logs",
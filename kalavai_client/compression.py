@@ -0,0 +1,184 @@
+"""
+Negotiated HTTP body compression (gzip, and zstd when zstandard is installed).
+
+Used by the bridge API (CompressionMiddleware) and by the client helpers
+in kalavai_client.utils.
+"""
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from kalavai_client.env import (
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def supported_encodings() -> list[str]:
+    """Encodings we can produce and decode, in order of preference"""
+    if zstandard is not None:
+        return ["zstd", "gzip"]
+    return ["gzip"]
+
+def accept_encoding_header() -> str:
+    return ", ".join(supported_encodings())
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+def decode_content(content: bytes, content_encoding: str) -> bytes:
+    """
+    Decode a response body the HTTP client left encoded.
+
+    requests only decodes zstd when urllib3 has a zstd backend, so bodies
+    still carrying the zstd frame magic are decoded here.
+    """
+    if (content_encoding or "").lower() == "zstd" and zstandard is not None and content[:4] == ZSTD_MAGIC:
+        return decompress(content, "zstd")
+    return content
+
+def select_encoding(accept_encoding: str):
+    """
+    Pick the preferred encoding accepted by the client.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+
+    Returns:
+        Encoding name, or None if the client accepts none we support
+    """
+    accepted = set()
+    for token in accept_encoding.lower().split(","):
+        name, _, params = token.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+def compress_request_body(body: bytes):
+    """
+    Compress an outgoing request body if it is large enough.
+
+    Returns:
+        tuple: (body, content_encoding or None)
+    """
+    if not COMPRESSION_ENABLED or len(body) < COMPRESSION_MIN_SIZE:
+        return body, None
+    encoding = supported_encodings()[0]
+    return compress(body, encoding), encoding
+
+
+class CompressionMiddleware():
+    """
+    ASGI middleware that compresses responses and decompresses request bodies.
+
+    Responses are compressed with the best encoding accepted by the client
+    when the body is at least minimum_size bytes. Streamed responses
+    (more than one body message) and already encoded responses are passed
+    through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int=COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "").lower()
+        if content_encoding in supported_encodings():
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value) for key, value in scope["headers"]
+                if key.lower() not in (b"content-encoding", b"content-length")
+            ]
+            receive = self._decompressing_receive(receive, content_encoding)
+
+        encoding = select_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+    @staticmethod
+    def _decompressing_receive(receive, encoding):
+        consumed = False
+
+        async def _receive():
+            nonlocal consumed
+            if consumed:
+                return await receive()
+            body = b""
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            consumed = True
+            return {"type": "http.request", "body": decompress(body, encoding), "more_body": False}
+
+        return _receive
+
+
+class _CompressingSend():
+    """Buffers the response start until the first body chunk is known"""
+
+    def __init__(self, send, encoding, minimum_size):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.start_message is None:
+            await self.send(message)
+            return
+
+        start_message, self.start_message = self.start_message, None
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=start_message["headers"])
+        if (message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size):
+            await self.send(start_message)
+            await self.send(message)
+            return
+
+        body = compress(body, self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(start_message)
+        await self.send({"type": "http.response.body", "body": body})
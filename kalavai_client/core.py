@@ -1,5 +1,6 @@
 import yaml
 import time
+from functools import partial, wraps
 from collections import defaultdict
 import uuid
 import socket
@@ -8,12 +9,20 @@ import netifaces as ni
 from urllib.parse import urlparse
 
 from kalavai_client.cluster import CLUSTER
+from kalavai_client.watcher import ASYNC_WATCHER
+from kalavai_client.breaker import set_health_probe
+from kalavai_client.deadline import deadline_share
+from kalavai_client.template_cache import TemplateCache
+from kalavai_client.log_stream import LogFollower
+from kalavai_client.log_buffer import LogBuffer
 from kalavai_client.utils import (
     NODE_ROLE_LABEL,
     generate_join_token,
     load_user_id,
     request_to_server,
-    load_server_info,
+    fan_out,
+    fan_out_async,
+    SERVER_CONFIG,
     decode_dict,
     generate_compose_config,
     store_server_info,
@@ -23,7 +32,6 @@ from kalavai_client.utils import (
     load_template,
     is_storage_compatible,
     get_max_gpus,
-    NODE_NAME_KEY,
     MANDATORY_TOKEN_FIELDS,
     PUBLIC_LOCATION_KEY,
     CLUSTER_IP_KEY,
@@ -47,7 +55,6 @@ from kalavai_client.env import (
     USER_LOCAL_SERVER_FILE,
     TEMPLATE_LABEL,
     CORE_SERVICE_LABEL,
-    SERVER_IP_KEY,
     USER_COMPOSE_FILE,
     DEFAULT_VPN_CONTAINER_NAME,
     CONTAINER_HOST_PATH,
@@ -66,8 +73,12 @@ from kalavai_client.env import (
     DEFAULT_POOL_CONFIG_TEMPLATE,
     FORCE_WATCHER_API_URL,
     FORCE_WATCHER_API_KEY_URL,
-    KALAVAI_TEMPLATE_REPOSITORIES
-    
+    KALAVAI_TEMPLATE_REPOSITORIES,
+    BREAKER_PROBE_TIMEOUT,
+    LOG_FOLLOW_INTERVAL,
+    LOG_BUFFER_TAIL,
+    LOG_BUFFER_LINES,
+    LOG_BUFFER_BYTES
 )
 from kalavai_client.api_models import (
     GPU,
@@ -77,6 +88,113 @@ from kalavai_client.api_models import (
     DeviceStatus
 )
 
+# helm chart values / schema / metadata, keyed by chart version
+TEMPLATE_CACHE = TemplateCache(USER_TEMPLATES_FOLDER)
+LOG_BUFFER = LogBuffer(
+    interval=LOG_FOLLOW_INTERVAL,
+    fetch_tail=LOG_BUFFER_TAIL,
+    max_lines=LOG_BUFFER_LINES,
+    max_bytes=LOG_BUFFER_BYTES
+)
+
+# CRD groups that hold kalavai jobs
+JOB_DATA_GROUPS = [
+    {
+        "group": "batch.volcano.sh",
+        "api_version": "v1alpha1",
+        "plural": "jobs"
+    },
+    {
+        "group": "ray.io",
+        "api_version": "v1",
+        "plural": "rayclusters"
+    }
+]
+
+
+class WatcherCall():
+    """A kube-watcher request, sent by whichever transport runs the operation"""
+
+    def __init__(self, method, endpoint, data=None, params=None):
+        self.method = method
+        self.endpoint = endpoint
+        self.data = data
+        self.params = params
+
+    def send(self):
+        return request_to_server(
+            force_url=FORCE_WATCHER_API_URL,
+            force_key=FORCE_WATCHER_API_KEY_URL,
+            method=self.method,
+            endpoint=self.endpoint,
+            data=self.data,
+            params=self.params,
+            server_creds=USER_LOCAL_SERVER_FILE,
+            user_cookie=USER_COOKIE
+        )
+
+    async def send_async(self):
+        return await ASYNC_WATCHER.request(self.method, self.endpoint, data=self.data, params=self.params)
+
+def _run_operation(operation):
+    """Drive a watcher operation with blocking requests (CLI)"""
+    result, error = None, None
+    while True:
+        try:
+            calls = operation.send(result) if error is None else operation.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            if isinstance(calls, list):
+                result = fan_out([call.send for call in calls])
+            else:
+                result = calls.send()
+            error = None
+        except Exception as e:
+            result, error = None, e
+
+async def _run_operation_async(operation):
+    """Drive a watcher operation from the event loop (bridge API)"""
+    result, error = None, None
+    while True:
+        try:
+            calls = operation.send(result) if error is None else operation.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            if isinstance(calls, list):
+                result = await fan_out_async([call.send_async for call in calls])
+            else:
+                result = await calls.send_async()
+            error = None
+        except Exception as e:
+            result, error = None, e
+
+def watcher_operation(operation):
+    """
+    Write a watcher operation once, run it with either transport.
+
+    operation is a generator function: it yields a WatcherCall and gets
+    the watcher response back (errors are raised at the yield), or yields
+    a list of them to send concurrently and gets the results back, with
+    exceptions in place of the calls that failed.
+
+    Returns the sync version; the async one is its run_async attribute,
+    and the generator function its operation attribute (to use with
+    yield from in other operations).
+    """
+    @wraps(operation)
+    def run(*args, **kwargs):
+        return _run_operation(operation(*args, **kwargs))
+
+    @wraps(operation)
+    async def run_async(*args, **kwargs):
+        return await _run_operation_async(operation(*args, **kwargs))
+
+    run.run_async = run_async
+    run.operation = operation
+    return run
+
 def is_watcher_alive(server_creds=USER_LOCAL_SERVER_FILE, user_cookie=USER_COOKIE, timeout=30):
     try:
         request_to_server(
@@ -94,6 +212,7 @@ def is_watcher_alive(server_creds=USER_LOCAL_SERVER_FILE, user_cookie=USER_COOKI
         return False
     return True
 
+@watcher_operation
 def set_schedulable(schedulable, node_names):
     """
     Delete job in the cluster
@@ -104,15 +223,7 @@ def set_schedulable(schedulable, node_names):
         "node_names": node_names
     }
     try:
-        res = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/set_node_schedulable",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        res = yield WatcherCall("post", "/v1/set_node_schedulable", data=data)
         if res is not None and "detail" in res:
             return {"error": res["detail"]}
         else:
@@ -194,35 +305,28 @@ def get_ip_addresses(subnet=None):
             raise ValueError(f"No IPs available on subnet {subnet}")
     return ips
 
+@watcher_operation
 def fetch_resources(node_names: list[str]=None, node_labels: dict[str, str]=None):
     data = {
         "node_names": node_names,
         "node_labels": node_labels
     }
-    try:
-        total = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/get_cluster_total_resources",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
-        available = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/get_cluster_available_resources",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
-    except Exception as e:
-        return {"error": str(e)}
-        
-    return {"total": total, "available": available}
+    total, available = yield [
+        WatcherCall("post", "/v1/get_cluster_total_resources", data=data),
+        WatcherCall("post", "/v1/get_cluster_available_resources", data=data)
+    ]
+    return _merge_resources(total=total, available=available)
 
+def _merge_resources(total, available):
+    """Combine total and available resources, keeping whichever succeeded"""
+    if isinstance(total, Exception) and isinstance(available, Exception):
+        return {"error": str(total)}
+    return {
+        "total": {"error": str(total)} if isinstance(total, Exception) else total,
+        "available": {"error": str(available)} if isinstance(available, Exception) else available
+    }
+
+@watcher_operation
 def get_compute_usage(
     start_time: int,
     end_time: int,
@@ -240,19 +344,12 @@ def get_compute_usage(
         "step_seconds": step_seconds
     }
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            data=data,
-            endpoint="/v1/fetch_compute_usage",
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("post", "/v1/fetch_compute_usage", data=data)
         return data
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def get_nodes_metrics(
     start_time: int,
     end_time: int,
@@ -274,50 +371,30 @@ def get_nodes_metrics(
         "namespaces": namespaces
     }
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            data=data,
-            endpoint="/v1/fetch_nodes_stats",
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("post", "/v1/fetch_nodes_stats", data=data)
         return data
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def get_user_spaces():
 
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="get",
-            endpoint="/v1/get_available_user_spaces",
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("get", "/v1/get_available_user_spaces")
         return data
     except Exception as e:
         return {"error": str(e)}
-    
+
+@watcher_operation
 def get_space_quota(space_name):
 
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="get",
-            endpoint="/v1/get_space_quota",
-            params={"user_id": space_name},
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("get", "/v1/get_space_quota", params={"user_id": space_name})
         return data
     except Exception as e:
         return {"error": str(e)}
-    
+
+@watcher_operation
 def set_space_quota(user_id: str, quota: dict, labels: dict[str, str]=None):
 
     quota_request = {
@@ -326,19 +403,12 @@ def set_space_quota(user_id: str, quota: dict, labels: dict[str, str]=None):
         "labels": labels
     }
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/set_space_quota",
-            data=quota_request,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("post", "/v1/set_space_quota", data=quota_request)
         return data
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def set_user_space_secret(user_id: str, data: dict):
     data_request = {
         "force_namespace": user_id,
@@ -346,34 +416,19 @@ def set_user_space_secret(user_id: str, data: dict):
         "data": data
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/create_or_update_user_data",
-            data=data_request,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/create_or_update_user_data", data=data_request)
         return result
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def fetch_user_space_secret(user_id: str):
     data_request = {
         "force_namespace": user_id,
         "name": "user-data"
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/fetch_user_data",
-            data=data_request,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/fetch_user_data", data=data_request)
         # extract data
         if "error" in result:
             return {"data": {}, "error": result["error"]}
@@ -389,261 +444,252 @@ def fetch_user_space_secret(user_id: str):
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def delete_user_space(user_id: str):
 
     data = {
         "force_namespace": user_id,
     }
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/delete_user_space",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = yield WatcherCall("post", "/v1/delete_user_space", data=data)
         return data
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def fetch_template_data(name):
-
+    # sequential calls share what is left of the request deadline
+    with deadline_share(3):
+        values = yield from fetch_template_values.operation(name)
+    with deadline_share(2):
+        metadata = yield from fetch_template_metadata.operation(name)
     return {
-        "values": fetch_template_values(name),
-        "metadata": fetch_template_metadata(name),
-        "schema": fetch_template_schema(name)
+        "values": values,
+        "metadata": metadata,
+        "schema": (yield from fetch_template_schema.operation(name))
     }
 
+@watcher_operation
 def update_local_repositories(helm_repos=KALAVAI_TEMPLATE_REPOSITORIES):
 
     try:
-        for name, url in helm_repos:
-            # 1. add repos
-            request_to_server(
-                force_url=FORCE_WATCHER_API_URL,
-                force_key=FORCE_WATCHER_API_KEY_URL,
-                method="post",
-                endpoint="/v1/helm_add_repo",
-                data={
-                    "name": name,
-                    "url": url
-                },
-                server_creds=USER_LOCAL_SERVER_FILE,
-                user_cookie=USER_COOKIE
-            )
+        # 1. add repos (half of the remaining deadline, if any)
+        with deadline_share(2):
+            results = yield [
+                WatcherCall("post", "/v1/helm_add_repo", data={"name": name, "url": url})
+                for name, url in helm_repos
+            ]
+        _check_added_repos(helm_repos=helm_repos, results=results)
         # 2. update them
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/helm_update",
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
-        return data      
+        with deadline_share(2):
+            data = yield WatcherCall("post", "/v1/helm_update")
+        # 3. refresh the chart versions of the template cache
+        yield from fetch_job_templates.operation()
+        return data
     except Exception as e:
         return {"error": str(e)}
 
+def _check_added_repos(helm_repos, results):
+    """Report repos that could not be added; fail only if none were"""
+    failed = [(name, result) for (name, _), result in zip(helm_repos, results) if isinstance(result, Exception)]
+    for name, error in failed:
+        print(f"Warning: could not add helm repo {name}: {str(error)}")
+    if len(failed) > 0 and len(failed) == len(results):
+        raise failed[0][1]
+
+@watcher_operation
 def fetch_template_values(template_name):
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="get",
-            endpoint="/v1/helm_show_values",
-            params={"chart_name": template_name},
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = TEMPLATE_CACHE.get(template_name, "values")
+        if data is not None:
+            return data
+        data = yield WatcherCall("get", "/v1/helm_show_values", params={"chart_name": template_name})
+        TEMPLATE_CACHE.store(template_name, "values", data)
         return data
     except Exception as e:
         return {"error": str(e)}
     
+@watcher_operation
 def fetch_template_schema(template_name):
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="get",
-            endpoint="/v1/helm_pull_schema",
-            params={"chart_name": template_name},
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = TEMPLATE_CACHE.get(template_name, "schema")
+        if data is not None:
+            return data
+        data = yield WatcherCall("get", "/v1/helm_pull_schema", params={"chart_name": template_name})
+        TEMPLATE_CACHE.store(template_name, "schema", data)
         return data
     except Exception as e:
         return {"error": str(e)}
     
+@watcher_operation
 def fetch_template_metadata(template_name):
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="get",
-            endpoint="/v1/helm_show_chart",
-            params={"chart_name": template_name},
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        data = TEMPLATE_CACHE.get(template_name, "metadata")
+        if data is not None:
+            return data
+        data = yield WatcherCall("get", "/v1/helm_show_chart", params={"chart_name": template_name})
+        TEMPLATE_CACHE.store(template_name, "metadata", data)
         return data
     except Exception as e:
         return {"error": str(e)}
 
+@watcher_operation
 def fetch_job_templates(repo=None, statuses=None):
     # TODO: switch to using helm_show_chart in bulk and filter in watcher
     if repo is not None:
         repos = [repo]
     else:
         repos, urls = zip(*KALAVAI_TEMPLATE_REPOSITORIES)
-    try:
-        templates = []
-        for repo in repos:
-            data = request_to_server(
-                force_url=FORCE_WATCHER_API_URL,
-                force_key=FORCE_WATCHER_API_KEY_URL,
-                method="get",
-                endpoint="/v1/helm_repo_search",
-                params={"term": repo},
-                server_creds=USER_LOCAL_SERVER_FILE,
-                user_cookie=USER_COOKIE
-            )
-            templates.extend(data)
-        return templates
-    except Exception as e:
-        return {"error": str(e)}
+    results = yield [WatcherCall("get", "/v1/helm_repo_search", params={"term": repo}) for repo in repos]
+    _update_template_index(repos=repos, results=results)
+    return _merge_lists(results=results, parse=list)
+
+def _update_template_index(repos, results):
+    for repo, result in zip(repos, results):
+        if isinstance(result, list):
+            TEMPLATE_CACHE.update_index(repo, result)
 
+def _merge_lists(results, parse):
+    """
+    Merge list results from several sub-calls.
+
+    Failed sub-calls are reported but do not hide the others; an error is
+    returned only if every sub-call failed.
+    """
+    merged, errors = [], []
+    for result in results:
+        try:
+            if isinstance(result, Exception):
+                raise result
+            merged.extend(parse(result))
+        except Exception as e:
+            print(f"Warning: sub-call failed: {str(e)}")
+            errors.append(str(e))
+    if len(errors) > 0 and len(errors) == len(results):
+        return {"error": "; ".join(errors)}
+    return merged
+
+@watcher_operation
 def fetch_job_names():
-    data_groups = [
-        {
-            "group": "batch.volcano.sh",
-            "api_version": "v1alpha1",
-            "plural": "jobs"
-        },
-        {
-            "group": "ray.io",
-            "api_version": "v1",
-            "plural": "rayclusters"
-        }
-    ]
-    try:
-        all_jobs = []
-        for data in data_groups:
-            jobs = request_to_server(
-                force_url=FORCE_WATCHER_API_URL,
-                force_key=FORCE_WATCHER_API_KEY_URL,
-                method="post",
-                endpoint="/v1/get_objects_of_type",
-                data=data,
-                server_creds=USER_LOCAL_SERVER_FILE,
-                user_cookie=USER_COOKIE
-            )
-            for ns, ds in jobs.items():
-                all_jobs.extend([Job(owner=ns, name=d["metadata"]["labels"][TEMPLATE_LABEL]) for d in ds["items"]])
-            
-    except Exception as e:
-        return {"error": str(e)}
-    
-    return all_jobs  
+    results = yield [WatcherCall("post", "/v1/get_objects_of_type", data=data) for data in JOB_DATA_GROUPS]
+    return _merge_lists(results=results, parse=_parse_job_names)
 
-def fetch_job_details(force_namespace=None):
-    """Get jobs overview details (status and services)"""
-    job_details = []
+def _parse_job_names(jobs):
+    all_jobs = []
+    for ns, ds in jobs.items():
+        all_jobs.extend([Job(owner=ns, name=d["metadata"]["labels"][TEMPLATE_LABEL]) for d in ds["items"]])
+    return all_jobs
+
+@watcher_operation
+def fetch_job_details(force_namespace=None, fields=None):
+    """
+    Get jobs overview details (status and services)
+
+    Args:
+        fields: Optional list of Job fields to build (jobs are then returned as dicts)
+    """
     # fetch all details at once
     data = {"labels": [TEMPLATE_LABEL]}
     if force_namespace is not None:
         data["force_namespace"] = force_namespace
-    result = request_to_server(
-        force_url=FORCE_WATCHER_API_URL,
-        force_key=FORCE_WATCHER_API_KEY_URL,
-        method="post",
-        endpoint="/v1/get_jobs_overview",
-        data=data,
-        server_creds=USER_LOCAL_SERVER_FILE,
-        user_cookie=USER_COOKIE)
-    
+    result = yield WatcherCall("post", "/v1/get_jobs_overview", data=data)
+    return _parse_job_details(result, fields=fields)
+
+def _parse_job_details(result, fields=None):
+    """
+    Parse the watcher jobs overview into Job objects.
+
+    If fields is given, only those fields are built and each job is returned
+    as a dict with just those keys.
+    """
+    def wanted(*names):
+        return fields is None or any(name in fields for name in names)
+
+    job_details = []
+    # TODO: for client-pools, this value won't be in the server file
+    endpoint_address = urlparse(SERVER_CONFIG.kalavai_api_url).hostname
     for namespace, deployments in result.items():
         """deployments --> "job_id": {"pods": {}, "services": {}, "ingress": {}, "job": {}} }"""
         for job_id, job in deployments.items():
-            workers_status = defaultdict(int)
-            workers = ""
-            restart_counts = 0
-            host_nodes = set()
             job_name = job.get("metadata", {}).get("name", job_id)
-            # parse pods
             job_status = job.get("status", {})
-            if "pods" in job_status and job_status["pods"] is not None:
-                for name, values in job_status["pods"].items():
-                    restart_counts = values["restarts"]
-                    workers_status[values["phase"]] += 1
-                    # get nodes involved in deployment (needs kubewatcher)
-                    if "nodeName" in values and values["nodeName"] is not None:
-                        host_nodes.add(values["nodeName"])
-                workers = "\n".join([f"{k}: {v}" for k, v in workers_status.items()])
-                if restart_counts > 0:
-                    workers += f"\n({restart_counts} restart)"
-            else:
-                print("Skip pods")
-            # parse services
-            endpoints = {}
-            # TODO: for client-pools, this value won't be in the server file
-            endpoint_address = urlparse(load_server_info(data_key=KALAVAI_API_URL_KEY, file=USER_LOCAL_SERVER_FILE)).hostname
-            if "services" in job_status and job_status["services"] is not None:
-                for name, values in job_status["services"].items():
-                    for i, port in enumerate(values["ports"]):
-                        if "name" not in port:
-                            endpoint_name = f"port-{name}-{i}"
-                        else:
-                            # avoid name clash across multiple ports / services
-                            if port['name'] in endpoints:
-                                endpoint_name = f"{name}-{port['name']}"
+            values = {"job_id": job_id, "owner": namespace, "name": job_name}
+            if wanted("spec"):
+                values["spec"] = job.get("spec", {})
+            if wanted("conditions"):
+                values["conditions"] = job_status
+            # parse pods
+            if wanted("workers", "status", "host_nodes"):
+                workers_status = defaultdict(int)
+                workers = ""
+                restart_counts = 0
+                host_nodes = set()
+                if "pods" in job_status and job_status["pods"] is not None:
+                    for name, pod in job_status["pods"].items():
+                        restart_counts = pod["restarts"]
+                        workers_status[pod["phase"]] += 1
+                        # get nodes involved in deployment (needs kubewatcher)
+                        if "nodeName" in pod and pod["nodeName"] is not None:
+                            host_nodes.add(pod["nodeName"])
+                    workers = "\n".join([f"{k}: {v}" for k, v in workers_status.items()])
+                    if restart_counts > 0:
+                        workers += f"\n({restart_counts} restart)"
+                else:
+                    print("Skip pods")
+                if len(workers_status) == 0:
+                    status = "pending"
+                elif all(["Running" == stat for stat in workers_status]):
+                    status = "running"
+                elif any([st in workers_status for st in ["Failed"]]):
+                    status = "error"
+                elif all([st in workers_status for st in ["Pending"]]):
+                    status = "pending"
+                elif all([st in workers_status for st in ["Succeeded", "Completed"]]):
+                    status = "completed"
+                else:
+                    status = "working"
+                values["workers"] = workers
+                values["status"] = str(status)
+                values["host_nodes"] = "\n".join(host_nodes)
+            if wanted("endpoint"):
+                # parse services
+                endpoints = {}
+                if "services" in job_status and job_status["services"] is not None:
+                    for name, service in job_status["services"].items():
+                        for i, port in enumerate(service["ports"]):
+                            if "name" not in port:
+                                endpoint_name = f"port-{name}-{i}"
                             else:
-                                endpoint_name = port["name"]
-                        active_port = port["nodePort"] if "nodePort" in port else port["targetPort"]
-                        endpoints[endpoint_name] = {
-                            "port": active_port,
-                            "address": endpoint_address,
-                            "link": f"http://{endpoint_address}:{active_port}"
-                        }
+                                # avoid name clash across multiple ports / services
+                                if port['name'] in endpoints:
+                                    endpoint_name = f"{name}-{port['name']}"
+                                else:
+                                    endpoint_name = port["name"]
+                            active_port = port["nodePort"] if "nodePort" in port else port["targetPort"]
+                            endpoints[endpoint_name] = {
+                                "port": active_port,
+                                "address": endpoint_address,
+                                "link": f"http://{endpoint_address}:{active_port}"
+                            }
+                else:
+                    print("Skip service")
+                # parse ingresses
+                if "ingress" in job_status and job_status["ingress"] is not None:
+                    for ingress_name, hosts in job_status["ingress"].items():
+                        for i, host_config in enumerate(hosts):
+                            path = host_config.get('path', '')
+                            endpoint_name = f"{host_config['address']}{path}"
+                            endpoints[endpoint_name] = {
+                                "port": host_config['backendService']['port'],
+                                "address": f"{host_config['address']}",
+                                "link": f"https://{host_config['address']}{path}"
+                            }
+                #urls = [f"http://{endpoint_address}:{node_port}" for node_port in node_ports]
+                values["endpoint"] = endpoints
+            if fields is None:
+                job_details.append(Job(**values))
             else:
-                print("Skip service")
-            # parse ingresses
-            if "ingress" in job_status and job_status["ingress"] is not None:
-                for ingress_name, hosts in job_status["ingress"].items():
-                    for i, host_config in enumerate(hosts):
-                        path = host_config.get('path', '')
-                        endpoint_name = f"{host_config['address']}{path}"
-                        endpoints[endpoint_name] = {
-                            "port": host_config['backendService']['port'],
-                            "address": f"{host_config['address']}",
-                            "link": f"https://{host_config['address']}{path}"
-                        }
-            #urls = [f"http://{endpoint_address}:{node_port}" for node_port in node_ports]
-            if len(workers_status) == 0:
-                status = "pending"
-            elif all(["Running" == stat for stat in workers_status]):
-                status = "running"
-            elif any([st in workers_status for st in ["Failed"]]):
-                status = "error"
-            elif all([st in workers_status for st in ["Pending"]]):
-                status = "pending"
-            elif all([st in workers_status for st in ["Succeeded", "Completed"]]):
-                status = "completed"
-            else:
-                status = "working"
-            job_details.append(
-                Job(
-                    job_id=job_id,
-                    spec=job.get("spec", {}),
-                    conditions=job.get("status", {}),
-                    owner=namespace,
-                    name=job_name,
-                    workers=workers,
-                    endpoint=endpoints, #"\n".join(urls),
-                    status=str(status),
-                    host_nodes="\n".join(host_nodes))
-            )
+                job_details.append({field: values[field] for field in fields})
     return job_details
 
     # for namespace, deployments in result.items():
@@ -698,6 +744,7 @@ def fetch_job_details(force_namespace=None):
     #         )
     # return job_details
 
+@watcher_operation
 def deploy_job(
     job_name,
     template_name,
@@ -730,18 +777,10 @@ def deploy_job(
         "random_suffix": random_suffix
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/deploy_template",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/deploy_template", data=data)
         return result
     except Exception as e:
-        return {"error": str(e)}  
+        return {"error": str(e)}
 
     # data = {
     #     "template": template_name,
@@ -766,8 +805,9 @@ def deploy_job(
     # except Exception as e:
     #     return {"error": str(e)}  
     
+@watcher_operation
 def deploy_test_job(template_str, values_dict, default_values, target_labels=None, force_namespace=None):
-    
+
     # submit custom deployment
     data = {
         "template": template_str,
@@ -779,34 +819,19 @@ def deploy_test_job(template_str, values_dict, default_values, target_labels=Non
         data["force_namespace"] = force_namespace
 
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/deploy_custom_job",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/deploy_custom_job", data=data)
         return result
     except Exception as e:
         return {"error": str(e)}
-    
+
+@watcher_operation
 def delete_job(name, force_namespace=None):
     data = {
         "name": name,
         "force_namespace": force_namespace
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="delete",
-            endpoint="/v1/delete_template",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("delete", "/v1/delete_template", data=data)
         return result
     except Exception as e:
         return {"error": str(e)}
@@ -830,44 +855,41 @@ def delete_job(name, force_namespace=None):
     # except Exception as e:
     #     return {"error": str(e)}
 
+@watcher_operation
 def fetch_devices(node_labels=None):
     """Load devices status info for all hosts"""
     try:
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/fetch_nodes",
-            data={"node_labels": node_labels},
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
-        print("Devices from watcher: ", data)
-        devices = []
-        for node, status in data.items():
-            devices.append(
-                DeviceStatus(
-                    name=node,
-                    memory_pressure=status["MemoryPressure"],
-                    disk_pressure=status["DiskPressure"],
-                    pid_pressure=status["PIDPressure"],
-                    ready=status["Ready"],
-                    unschedulable=status["unschedulable"]
-                )
-            )
-        return devices
+        data = yield WatcherCall("post", "/v1/fetch_nodes", data={"node_labels": node_labels})
+        return _parse_devices(data)
 
     except Exception as e:
         return {"error": str(e)}
 
+def _parse_devices(data):
+    devices = []
+    for node, status in data.items():
+        devices.append(
+            DeviceStatus(
+                name=node,
+                memory_pressure=status["MemoryPressure"],
+                disk_pressure=status["DiskPressure"],
+                pid_pressure=status["PIDPressure"],
+                ready=status["Ready"],
+                unschedulable=status["unschedulable"]
+            )
+        )
+    return devices
+
+@watcher_operation
 def fetch_job_logs(job_name, force_namespace=None, pod_name=None, tail=100):
-    return fetch_pod_logs(
+    return (yield from fetch_pod_logs.operation(
         labels={TEMPLATE_LABEL: job_name},
         pod_name=pod_name,
         force_namespace=force_namespace,
         tail=tail
-    )
+    ))
 
+@watcher_operation
 def fetch_pool_services(force_namespace=None):
     data = {
         "labels": {CORE_SERVICE_LABEL: None},
@@ -875,50 +897,45 @@ def fetch_pool_services(force_namespace=None):
     }
     try:
         # send tail as parameter (fetch only last _tail_ lines)
-        data = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/get_services_for_label",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
-        # parse services
-        # info we need:
-        # name
-        # port number(s) only node ports
-        # internal addresses (dns + nodeport)
-        # external addresses (kalavai url + node ports)
-        external_address = urlparse(load_server_info(data_key=KALAVAI_API_URL_KEY, file=USER_LOCAL_SERVER_FILE)).hostname
-        all_services = defaultdict(list)
-        for namespace, services in data.items():
-            for service in services:
-                name = service["metadata"]["name"]
-                endpoints = defaultdict(dict)
-                for port in service["spec"]["ports"]:
-                    raw_name = port.get("name") or str(port["port"])
-                    if raw_name in endpoints:
-                        port_name = f"{name}-{raw_name}"
-                    else:
-                        port_name = raw_name
-                    endpoints[port_name]["internal"] = f"http://{name}.{namespace}.svc:{port['port']}"
-                    if "nodePort" in port:
-                        endpoints[port_name]["external"] = f"{external_address}:{port['nodePort']}"
-
-
-                all_services[namespace].append(
-                    Service(
-                        name=service["metadata"]["name"],
-                        endpoints=endpoints
-                    )
-                )
-        return  all_services
-
+        data = yield WatcherCall("post", "/v1/get_services_for_label", data=data)
+        return _parse_pool_services(data)
 
     except Exception as e:
         return {"error": str(e)}
 
+def _parse_pool_services(data):
+    # parse services
+    # info we need:
+    # name
+    # port number(s) only node ports
+    # internal addresses (dns + nodeport)
+    # external addresses (kalavai url + node ports)
+    external_address = urlparse(SERVER_CONFIG.kalavai_api_url).hostname
+    all_services = defaultdict(list)
+    for namespace, services in data.items():
+        for service in services:
+            name = service["metadata"]["name"]
+            endpoints = defaultdict(dict)
+            for port in service["spec"]["ports"]:
+                raw_name = port.get("name") or str(port["port"])
+                if raw_name in endpoints:
+                    port_name = f"{name}-{raw_name}"
+                else:
+                    port_name = raw_name
+                endpoints[port_name]["internal"] = f"http://{name}.{namespace}.svc:{port['port']}"
+                if "nodePort" in port:
+                    endpoints[port_name]["external"] = f"{external_address}:{port['nodePort']}"
+
+
+            all_services[namespace].append(
+                Service(
+                    name=service["metadata"]["name"],
+                    endpoints=endpoints
+                )
+            )
+    return  all_services
+
+@watcher_operation
 def fetch_pod_logs(labels, force_namespace=None, pod_name=None, tail=100):
     data = {
         "labels": labels,
@@ -928,69 +945,58 @@ def fetch_pod_logs(labels, force_namespace=None, pod_name=None, tail=100):
         data["force_namespace"] = force_namespace
     try:
         # send tail as parameter (fetch only last _tail_ lines)
-        all_logs = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/get_job_details",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        all_logs = yield WatcherCall("post", "/v1/get_job_details", data=data)
         return {pod: info for pod, info in all_logs.items() if pod_name is None or pod_name == pod}
 
     except Exception as e:
         return {"error": str(e)}
-    
 
+
+@watcher_operation
 def load_gpu_models(node_names=None, node_labels=None):
-    data = request_to_server(
-        force_url=FORCE_WATCHER_API_URL,
-        force_key=FORCE_WATCHER_API_KEY_URL,
-        method="post",
-        endpoint="/v1/get_node_gpus",
-        data={
-            "node_names": node_names,
-            "node_labels": node_labels
-        },
-        server_creds=USER_LOCAL_SERVER_FILE,
-        user_cookie=USER_COOKIE
-    )
+    data = yield WatcherCall("post", "/v1/get_node_gpus", data={
+        "node_names": node_names,
+        "node_labels": node_labels
+    })
     return data.items()
 
+@watcher_operation
 def fetch_gpus(
     available=False,
     node_names=None,
     node_labels=None
 ):
     try:
-        data = load_gpu_models(node_names=node_names, node_labels=node_labels)
-        all_gpus = []
-        for node, gpus in data:
-            models, memories, statuses = [], [], []
-            for gpu in gpus["gpus"]:
-                status = gpu["ready"] if "ready" in gpu else True
-                if available and not status:
-                    continue
-                models.append(gpu['model'])
-                memories.append(gpu['memory'])
-                statuses.append(str(status))
-            for model, memory, status in zip(models, memories, statuses):
-                #rows.append([node, "\n".join(statuses), "\n".join(models), str(gpus["available"]), str(gpus["capacity"])])
-                all_gpus.append(
-                    GPU(
-                        node=node,
-                        ready=status,
-                        model=model,
-                        memory=memory,
-                        available=gpus["available"],
-                        total=gpus["capacity"]
-                    )
-                )
-        return all_gpus
+        data = yield from load_gpu_models.operation(node_names=node_names, node_labels=node_labels)
+        return _parse_gpus(data, available=available)
 
     except Exception as e:
         return {"error": str(e)}
+
+def _parse_gpus(data, available=False):
+    all_gpus = []
+    for node, gpus in data:
+        models, memories, statuses = [], [], []
+        for gpu in gpus["gpus"]:
+            status = gpu["ready"] if "ready" in gpu else True
+            if available and not status:
+                continue
+            models.append(gpu['model'])
+            memories.append(gpu['memory'])
+            statuses.append(str(status))
+        for model, memory, status in zip(models, memories, statuses):
+            #rows.append([node, "\n".join(statuses), "\n".join(models), str(gpus["available"]), str(gpus["capacity"])])
+            all_gpus.append(
+                GPU(
+                    node=node,
+                    ready=status,
+                    model=model,
+                    memory=memory,
+                    available=gpus["available"],
+                    total=gpus["capacity"]
+                )
+            )
+    return all_gpus
     
 def authenticate_user(user_key=None):
     if user_key is None:
@@ -1016,20 +1022,13 @@ def check_token(token, public=False):
     except Exception as e:
         return {"error": str(e)}
     
+@watcher_operation
 def delete_nodes(nodes):
     data = {
         "node_names": nodes
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/delete_nodes",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/delete_nodes", data=data)
         if result is None or result is True:
             return {"success": nodes}
         else:
@@ -1037,11 +1036,13 @@ def delete_nodes(nodes):
     except Exception as e:
         return {"error": f"Error when removing nodes {nodes}: {str(e)}"}
 
+@watcher_operation
 def cordon_nodes(nodes):
-    return set_schedulable(schedulable=False, node_names=nodes)
+    return (yield from set_schedulable.operation(schedulable=False, node_names=nodes))
 
+@watcher_operation
 def uncordon_nodes(nodes):
-    return set_schedulable(schedulable=True, node_names=nodes)
+    return (yield from set_schedulable.operation(schedulable=True, node_names=nodes))
 
 def attach_to_pool(token, node_name=None):
     if node_name is None:
@@ -1434,8 +1435,8 @@ def update_pool(debug=True, releases=None):
 
 def get_pool_credentials():
     return {
-        KALAVAI_API_URL_KEY: load_server_info(data_key=KALAVAI_API_URL_KEY, file=USER_LOCAL_SERVER_FILE),
-        KALAVAI_API_KEY_KEY: load_server_info(data_key=KALAVAI_API_KEY_KEY, file=USER_LOCAL_SERVER_FILE)
+        KALAVAI_API_URL_KEY: SERVER_CONFIG.kalavai_api_url,
+        KALAVAI_API_KEY_KEY: SERVER_CONFIG.kalavai_api_key
     }
 
 def get_pool_token(mode: TokenType):
@@ -1443,21 +1444,21 @@ def get_pool_token(mode: TokenType):
     try:
         match mode:
             case TokenType.ADMIN:
-                auth_key = load_server_info(data_key=AUTH_KEY, file=USER_LOCAL_SERVER_FILE)
+                auth_key = SERVER_CONFIG.auth_key
             case TokenType.USER:
-                auth_key = load_server_info(data_key=WRITE_AUTH_KEY, file=USER_LOCAL_SERVER_FILE)
+                auth_key = SERVER_CONFIG.write_auth_key
             case _:
-                auth_key = load_server_info(data_key=READONLY_AUTH_KEY, file=USER_LOCAL_SERVER_FILE)
+                auth_key = SERVER_CONFIG.readonly_auth_key
         if auth_key is None:
             return {"error": "Cannot generate selected token mode. Are you the seed node?"}
 
-        watcher_service = load_server_info(data_key=WATCHER_SERVICE_KEY, file=USER_LOCAL_SERVER_FILE)
-        public_location = load_server_info(data_key=PUBLIC_LOCATION_KEY, file=USER_LOCAL_SERVER_FILE)
+        watcher_service = SERVER_CONFIG.watcher_service
+        public_location = SERVER_CONFIG.public_location
 
-        cluster_token = load_server_info(data_key=CLUSTER_TOKEN_KEY, file=USER_LOCAL_SERVER_FILE) #CLUSTER.get_cluster_token()
+        cluster_token = SERVER_CONFIG.cluster_token #CLUSTER.get_cluster_token()
 
-        ip_address = load_server_info(SERVER_IP_KEY, file=USER_LOCAL_SERVER_FILE)
-        cluster_name = load_server_info(data_key=CLUSTER_NAME_KEY, file=USER_LOCAL_SERVER_FILE)
+        ip_address = SERVER_CONFIG.server_ip
+        cluster_name = SERVER_CONFIG.cluster_name
 
         join_token = generate_join_token(
             cluster_ip=ip_address,
@@ -1562,7 +1563,7 @@ def stop_pool(skip_node_deletion=False):
     logs = []
     if not skip_node_deletion:
         logs.append(
-            delete_node(load_server_info(data_key=NODE_NAME_KEY, file=USER_LOCAL_SERVER_FILE))
+            delete_node(SERVER_CONFIG.node_name)
         )
     
     # disconnect from VPN first, then remove agent, then remove local files
@@ -1583,6 +1584,7 @@ def stop_pool(skip_node_deletion=False):
 
     return {"logs": logs}
 
+@watcher_operation
 def add_node_labels(node_name: str, labels: dict):
     """
     Add labels to a node in the cluster.
@@ -1599,15 +1601,7 @@ def add_node_labels(node_name: str, labels: dict):
         "labels": labels
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/add_labels_to_node",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/add_labels_to_node", data=data)
         if "error" in result:
             return {"error": result["error"]}
         else:
@@ -1616,13 +1610,14 @@ def add_node_labels(node_name: str, labels: dict):
     except Exception as e:
         return {"error": f"Error when adding labels to node {node_name}: {str(e)}"}
 
+@watcher_operation
 def get_node_labels(node_names: list[str] = None):
     """
     Get labels for specified nodes in the cluster.
-    
+
     Args:
         node_names (list[str]): List of node names to fetch labels from
-        
+
     Returns:
         dict: Result containing the labels for each node or error message
     """
@@ -1630,18 +1625,143 @@ def get_node_labels(node_names: list[str] = None):
         "node_names": node_names
     }
     try:
-        result = request_to_server(
-            force_url=FORCE_WATCHER_API_URL,
-            force_key=FORCE_WATCHER_API_KEY_URL,
-            method="post",
-            endpoint="/v1/get_node_labels",
-            data=data,
-            server_creds=USER_LOCAL_SERVER_FILE,
-            user_cookie=USER_COOKIE
-        )
+        result = yield WatcherCall("post", "/v1/get_node_labels", data=data)
         if result is not None:
             return {"labels": result}
         else:
             return {"error": "Failed to fetch node labels"}
     except Exception as e:
         return {"error": f"Error when fetching node labels: {str(e)}"}
+
+
+###############################################
+## Async variants (used by the bridge API)   ##
+## Sync functions above remain for the CLI   ##
+###############################################
+
+async def is_watcher_alive_async(timeout=30):
+    try:
+        await ASYNC_WATCHER.request("get", "/v1/health", timeout=timeout)
+    except Exception as e:
+        print(str(e))
+        return False
+    return True
+
+async def is_connected_async():
+    return await is_watcher_alive_async(timeout=10)
+
+# half-open circuit breakers check the watcher before letting a call through
+set_health_probe(
+    probe=partial(is_watcher_alive, timeout=BREAKER_PROBE_TIMEOUT),
+    async_probe=partial(is_watcher_alive_async, timeout=BREAKER_PROBE_TIMEOUT)
+)
+
+# the same watcher operations as the CLI, sent from the event loop
+set_schedulable_async = set_schedulable.run_async
+cordon_nodes_async = cordon_nodes.run_async
+uncordon_nodes_async = uncordon_nodes.run_async
+fetch_resources_async = fetch_resources.run_async
+get_compute_usage_async = get_compute_usage.run_async
+get_nodes_metrics_async = get_nodes_metrics.run_async
+get_user_spaces_async = get_user_spaces.run_async
+get_space_quota_async = get_space_quota.run_async
+set_space_quota_async = set_space_quota.run_async
+set_user_space_secret_async = set_user_space_secret.run_async
+fetch_user_space_secret_async = fetch_user_space_secret.run_async
+delete_user_space_async = delete_user_space.run_async
+update_local_repositories_async = update_local_repositories.run_async
+fetch_template_values_async = fetch_template_values.run_async
+fetch_template_schema_async = fetch_template_schema.run_async
+fetch_template_metadata_async = fetch_template_metadata.run_async
+fetch_template_data_async = fetch_template_data.run_async
+fetch_job_templates_async = fetch_job_templates.run_async
+fetch_job_names_async = fetch_job_names.run_async
+fetch_job_details_async = fetch_job_details.run_async
+deploy_job_async = deploy_job.run_async
+deploy_test_job_async = deploy_test_job.run_async
+delete_job_async = delete_job.run_async
+fetch_devices_async = fetch_devices.run_async
+fetch_pod_logs_async = fetch_pod_logs.run_async
+fetch_job_logs_async = fetch_job_logs.run_async
+fetch_pool_services_async = fetch_pool_services.run_async
+load_gpu_models_async = load_gpu_models.run_async
+fetch_gpus_async = fetch_gpus.run_async
+delete_nodes_async = delete_nodes.run_async
+add_node_labels_async = add_node_labels.run_async
+get_node_labels_async = get_node_labels.run_async
+
+async def read_log_buffers_async(job_name, force_namespace=None, pod_name=None, tail=None):
+    """Log buffers of the pods of a job (LOG_BUFFER), as {pod: PodLogs}; tail sizes the watcher reads"""
+    pods = await LOG_BUFFER.read(
+        key=(force_namespace, job_name),
+        fetch=partial(fetch_job_logs_async, job_name=job_name, force_namespace=force_namespace),
+        tail=tail
+    )
+    if isinstance(pods.get("error"), str):
+        return pods
+    return {pod: buffer for pod, buffer in pods.items() if pod_name is None or pod_name == pod}
+
+async def read_job_logs_async(job_name, force_namespace=None, pod_name=None, tail=100, since_line=None, since_ts=None):
+    """
+    Job logs served from the shared log buffers: the watcher is read at
+    most once per LOG_FOLLOW_INTERVAL per job, whatever the number of readers.
+
+    With since_line / since_ts only the newer lines are returned (and no pod
+    description). Each pod also reports the number of its first returned
+    line and of the next line, to pass as since_line on the next call.
+    """
+    incremental = since_line is not None or since_ts is not None
+    if tail > LOG_BUFFER_TAIL and not incremental:
+        # more than the buffers read from the watcher
+        return await fetch_job_logs_async(job_name=job_name, force_namespace=force_namespace, pod_name=pod_name, tail=tail)
+    pods = await read_log_buffers_async(job_name=job_name, force_namespace=force_namespace, pod_name=pod_name, tail=tail)
+    if isinstance(pods.get("error"), str):
+        return pods
+    if not incremental and not all(buffer.covers(tail) for buffer in pods.values() if buffer.has_logs):
+        # the buffers were started by readers of fewer lines
+        return await fetch_job_logs_async(job_name=job_name, force_namespace=force_namespace, pod_name=pod_name, tail=tail)
+    result = {}
+    for pod, buffer in pods.items():
+        data = {} if incremental else dict(buffer.info)
+        if buffer.has_logs:
+            lines = buffer.select(since_line=since_line, since_ts=since_ts, tail=None if incremental else tail)
+            data["logs"] = "".join(f"{line.text}\n" for line in lines)
+            data["first_line"] = lines[0].number if len(lines) > 0 else buffer.next_line
+            data["next_line"] = buffer.next_line
+        result.setdefault(buffer.match, {})[pod] = data
+    return result
+
+def follow_job_logs_async(job_name, force_namespace=None, pod_name=None, tail=100, since=None, since_line=None, follow=True, heartbeat=None):
+    """
+    Async iterator over the log lines of every pod of a job, as they are
+    written (see kalavai_client.log_stream for the records).
+
+    Lines come from the shared log buffers; a pod that writes more than
+    LOG_BUFFER_TAIL lines between two reads reports a gap.
+    """
+    follower = LogFollower(
+        read=partial(read_log_buffers_async, job_name=job_name, force_namespace=force_namespace, pod_name=pod_name, tail=tail),
+        interval=LOG_FOLLOW_INTERVAL
+    )
+    return follower.follow(tail=tail, since=since, since_line=since_line, follow=follow, heartbeat=heartbeat)
+
+async def fetch_pool_snapshot_async(node_names=None, node_labels=None, force_namespace=None):
+    """
+    Resources, devices, GPUs, job names and services of the pool, gathered
+    concurrently into one document.
+
+    Sections that fail carry an {"error": ...} value and do not hide the others.
+    """
+    timestamp = time.time()
+    sections = {
+        "resources": partial(fetch_resources_async, node_names=node_names, node_labels=node_labels),
+        "devices": partial(fetch_devices_async, node_labels=node_labels),
+        "gpus": partial(fetch_gpus_async, node_names=node_names, node_labels=node_labels),
+        "job_names": fetch_job_names_async,
+        "services": partial(fetch_pool_services_async, force_namespace=force_namespace)
+    }
+    results = await fan_out_async(list(sections.values()))
+    snapshot = {"timestamp": timestamp}
+    for section, result in zip(sections, results):
+        snapshot[section] = {"error": str(result)} if isinstance(result, Exception) else result
+    return snapshot
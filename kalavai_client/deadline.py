@@ -0,0 +1,146 @@
+"""
+Request deadlines propagated from the bridge API down to watcher calls.
+
+The deadline of the current request lives in a context variable, so it
+follows the call through core functions, fan-out workers and async tasks
+without changing their signatures. request_to_server and
+AsyncWatcherClient cap their timeout to the remaining budget and fail fast
+(DeadlineExceeded) once it has run out.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import JSONResponse
+
+
+DEADLINE_HEADER = "X-Request-Deadline"
+TIMEOUT_PARAM = "timeout"
+
+# absolute deadline, in time.monotonic() seconds
+_REQUEST_DEADLINE = contextvars.ContextVar("kalavai_request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, message="Request deadline exceeded"):
+        super().__init__(message)
+
+
+def get_deadline():
+    return _REQUEST_DEADLINE.get()
+
+def remaining_time():
+    """Seconds left before the current deadline (None if there is no deadline)"""
+    deadline = _REQUEST_DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def effective_timeout(timeout):
+    """
+    Cap a call timeout to the remaining budget.
+
+    Raises:
+        DeadlineExceeded if the deadline has already passed
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    return remaining if timeout is None else min(timeout, remaining)
+
+def deadline_to_epoch():
+    """Current deadline as a Unix timestamp (for propagation in headers)"""
+    remaining = remaining_time()
+    if remaining is None:
+        return None
+    return time.time() + remaining
+
+@contextmanager
+def request_deadline(timeout=None, epoch=None):
+    """
+    Run the enclosed block under a deadline.
+
+    An outer, earlier deadline always wins.
+
+    Args:
+        timeout: Budget in seconds from now
+        epoch: Absolute deadline as a Unix timestamp
+    """
+    candidates = [d for d in [
+        _REQUEST_DEADLINE.get(),
+        None if timeout is None else time.monotonic() + timeout,
+        None if epoch is None else time.monotonic() + (epoch - time.time())
+    ] if d is not None]
+    token = _REQUEST_DEADLINE.set(min(candidates) if len(candidates) > 0 else None)
+    try:
+        yield
+    finally:
+        _REQUEST_DEADLINE.reset(token)
+
+@contextmanager
+def deadline_share(parts):
+    """Limit the enclosed (sequential) sub-call to 1/parts of the remaining budget"""
+    remaining = remaining_time()
+    if remaining is None:
+        yield
+        return
+    with request_deadline(timeout=max(0, remaining) / max(1, parts)):
+        yield
+
+
+class DeadlineMiddleware():
+    """
+    ASGI middleware that reads the request deadline.
+
+    Accepts either an X-Request-Deadline header (Unix timestamp) or a
+    timeout query parameter (seconds). Requests that arrive past their
+    deadline, or whose handler fails once it has passed, get a 504.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _parse(scope):
+        epoch = Headers(scope=scope).get(DEADLINE_HEADER)
+        timeout = QueryParams(scope.get("query_string", b"")).get(TIMEOUT_PARAM)
+        try:
+            return (
+                None if timeout is None else float(timeout),
+                None if epoch is None else float(epoch)
+            )
+        except ValueError:
+            return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout, epoch = self._parse(scope)
+        if timeout is None and epoch is None:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def _send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        with request_deadline(timeout=timeout, epoch=epoch):
+            try:
+                if remaining_time() <= 0:
+                    raise DeadlineExceeded()
+                await self.app(scope, receive, _send)
+            except Exception as e:
+                # timeouts raised once the budget is spent are the deadline's doing
+                if response_started or not (isinstance(e, DeadlineExceeded) or remaining_time() <= 0):
+                    raise
+                response = JSONResponse(status_code=504, content={"detail": str(DeadlineExceeded())})
+                await response(scope, receive, send)
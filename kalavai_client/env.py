@@ -51,6 +51,46 @@ KUBE_VERSION = os.getenv("KALAVAI_KUBE_VERSION", "v1.31.1+k3s1")
 FORBIDEDEN_IPS = ["127.0.0.1"]
 FORCE_WATCHER_API_URL = os.getenv("WATCHER_API_URL", None)
 FORCE_WATCHER_API_KEY_URL = os.getenv("WATCHER_API_KEY", None)
+# keep-alive connection pools for watcher / kalavai API calls
+HTTP_POOL_CONNECTIONS = int(os.getenv("KALAVAI_HTTP_POOL_CONNECTIONS", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("KALAVAI_HTTP_POOL_MAXSIZE", 20))
+HTTP_POOL_BLOCK = os.getenv("KALAVAI_HTTP_POOL_BLOCK", "False").lower() in ("true", "1")
+# max number of concurrent sub-calls when a function fans out to the watcher
+FAN_OUT_MAX_WORKERS = int(os.getenv("KALAVAI_FAN_OUT_MAX_WORKERS", 8))
+# multiplex watcher calls over a single HTTP/2 (h2c) connection (needs h2)
+WATCHER_HTTP2 = os.getenv("KALAVAI_WATCHER_HTTP2", "False").lower() in ("true", "1")
+# negotiated HTTP compression (bridge API responses and large request bodies)
+COMPRESSION_ENABLED = os.getenv("KALAVAI_COMPRESSION", "True").lower() in ("true", "1")
+COMPRESSION_MIN_SIZE = int(os.getenv("KALAVAI_COMPRESSION_MIN_SIZE", 1024))
+# opt-in orjson encoding / decoding and unvalidated models for watcher data
+FAST_JSON = os.getenv("KALAVAI_FAST_JSON", "False").lower() in ("true", "1")
+# watcher circuit breakers (per endpoint) and retries for idempotent GETs
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("KALAVAI_BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RESET_TIMEOUT = float(os.getenv("KALAVAI_BREAKER_RESET_TIMEOUT", 30))
+BREAKER_PROBE_TIMEOUT = float(os.getenv("KALAVAI_BREAKER_PROBE_TIMEOUT", 5))
+RETRY_ATTEMPTS = int(os.getenv("KALAVAI_RETRY_ATTEMPTS", 3))
+RETRY_BACKOFF_BASE = float(os.getenv("KALAVAI_RETRY_BACKOFF_BASE", 0.2))
+RETRY_BACKOFF_MAX = float(os.getenv("KALAVAI_RETRY_BACKOFF_MAX", 2))
+# bridge API read cache: default TTL (seconds, 0 disables) and per endpoint
+# overrides as "fetch_devices=5,fetch_job_details=1"
+API_CACHE_TTL = float(os.getenv("KALAVAI_API_CACHE_TTL", 2))
+API_CACHE_TTLS = os.getenv("KALAVAI_API_CACHE_TTLS", "")
+# pool change events (/watch): seconds between polls (without the state
+# mirror, whose refreshes feed them otherwise) and between keep-alives
+WATCH_POLL_INTERVAL = float(os.getenv("KALAVAI_WATCH_POLL_INTERVAL", 5))
+WATCH_HEARTBEAT = float(os.getenv("KALAVAI_WATCH_HEARTBEAT", 15))
+# job logs buffered by the bridge API: seconds between watcher reads of a
+# job, most lines per pod read each time (reads ask for the largest tail
+# readers of the job want), lines kept per pod and bytes kept overall
+LOG_FOLLOW_INTERVAL = float(os.getenv("KALAVAI_LOG_FOLLOW_INTERVAL", 2))
+LOG_BUFFER_TAIL = int(os.getenv("KALAVAI_LOG_BUFFER_TAIL", 1000))
+LOG_BUFFER_LINES = int(os.getenv("KALAVAI_LOG_BUFFER_LINES", 10000))
+LOG_BUFFER_BYTES = int(os.getenv("KALAVAI_LOG_BUFFER_BYTES", 32 * 1024 * 1024))
+# in-memory mirror of the pool state served by the bridge API: default
+# refresh interval (seconds) and per resource overrides as "jobs=5,labels=60"
+STATE_MIRROR_ENABLED = os.getenv("KALAVAI_STATE_MIRROR", "True").lower() in ("true", "1")
+STATE_MIRROR_INTERVAL = float(os.getenv("KALAVAI_STATE_MIRROR_INTERVAL", 10))
+STATE_MIRROR_INTERVALS = os.getenv("KALAVAI_STATE_MIRROR_INTERVALS", "")
 # kalavai templates
 HELM_APPS_FILE = resource_path("kalavai_client/assets/apps.yaml")
 HELM_APPS_VALUES = resource_path("kalavai_client/assets/apps_values.yaml")
@@ -0,0 +1,126 @@
+"""
+Conditional requests (ETag / If-None-Match) for bridge API read endpoints.
+
+ETagMiddleware hashes the body of read responses and answers 304 Not
+Modified when the client already holds the same content. ETagCache is the
+client side: it keeps the last parsed body per request so a 304 can be
+served without downloading or parsing the payload again.
+"""
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+
+
+ETAG_CACHE_SIZE = 128
+_BODY_HEADERS = {b"content-length", b"content-type", b"content-encoding"}
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value covers etag"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ETagMiddleware():
+    """
+    ASGI middleware that adds ETags to (non streamed) 200 responses of the
+    given paths, and replies 304 to matching If-None-Match requests.
+    """
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message = None
+
+        async def _send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if start["status"] != 200 or message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+            etag = compute_etag(body)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["ETag"] = etag
+            if if_none_match is not None and etag_matches(if_none_match, etag):
+                # a 304 carries the headers of the 200 it stands for, except the body ones
+                not_modified = [(k, v) for k, v in headers.raw if k not in _BODY_HEADERS]
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+class ETagCache():
+    """
+    Last (etag, parsed body) per request, bounded LRU.
+
+    Bodies are copied in and out, so callers may change the body they get
+    without changing the one served on the next 304.
+    """
+
+    def __init__(self, max_entries: int=ETAG_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, url, params=None, data=None):
+        return (
+            method.lower(),
+            url,
+            json.dumps(params, sort_keys=True, default=str),
+            json.dumps(data, sort_keys=True, default=str)
+        )
+
+    def get(self, key):
+        """Returns (etag, body) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return entry[0], copy.deepcopy(entry[1])
+
+    def store(self, key, etag, body):
+        body = copy.deepcopy(body)
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
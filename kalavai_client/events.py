@@ -0,0 +1,190 @@
+"""
+Typed change events of the pool state, for streaming to API clients.
+
+PoolEventHub diffs each new state of the pool (jobs, devices, GPUs)
+against the previous one and pushes the changes to every subscriber. The
+states are either fed to it (update, e.g. by the state mirror on each
+refresh) or polled from its sources while there is at least one
+subscriber. All subscribers share the same states, so the watcher load
+does not grow with the number of clients.
+
+Event types:
+    job_status: job added, removed or status / workers changed
+    node_status: node added, removed, readiness, cordon or pressure changed
+    gpu_availability: GPUs of a node added, removed or availability changed
+"""
+import asyncio
+import contextvars
+import itertools
+import time
+
+from kalavai_client.utils import fan_out_async
+
+
+JOB_STATUS = "job_status"
+NODE_STATUS = "node_status"
+GPU_AVAILABILITY = "gpu_availability"
+EVENT_TYPES = (JOB_STATUS, NODE_STATUS, GPU_AVAILABILITY)
+
+# per event type: how to key the items of a poll, and which fields to track
+_TRACKED = {
+    JOB_STATUS: (lambda job: (job["owner"], job["name"]), ("status", "workers")),
+    NODE_STATUS: (lambda node: node["name"], ("ready", "unschedulable", "memory_pressure", "disk_pressure", "pid_pressure")),
+    GPU_AVAILABILITY: (lambda gpu: (gpu["node"], gpu["model"]), ("available", "total", "ready"))
+}
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+def _as_dict(item):
+    return item.model_dump() if hasattr(item, "model_dump") else dict(item)
+
+def _index(event_type, items):
+    key, fields = _TRACKED[event_type]
+    index = {}
+    for item in items:
+        item = _as_dict(item)
+        index[key(item)] = {field: item.get(field) for field in fields}
+    return index
+
+def _event(event_type, key, before, after, timestamp):
+    event = {"type": event_type, "timestamp": timestamp, "before": before, "after": after}
+    if event_type == JOB_STATUS:
+        event["namespace"], event["name"] = key
+    elif event_type == NODE_STATUS:
+        event["node"] = key
+    else:
+        event["node"], event["model"] = key
+    return event
+
+def diff_states(event_type, previous, current, timestamp=None):
+    """
+    Changes between two indexed polls of the same event type.
+
+    Returns:
+        List of events; before is None for new items, after is None for removed ones
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    events = []
+    for key, after in current.items():
+        before = previous.get(key)
+        if before != after:
+            events.append(_event(event_type, key, before, after, timestamp))
+    for key, before in previous.items():
+        if key not in current:
+            events.append(_event(event_type, key, before, None, timestamp))
+    return events
+
+
+class _Subscriber():
+    def __init__(self, namespaces=None, types=None):
+        self.namespaces = None if namespaces is None else set(namespaces)
+        self.types = set(EVENT_TYPES) if types is None else set(types)
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def wants(self, event):
+        if event["type"] not in self.types:
+            return False
+        # only jobs belong to a namespace; node and GPU events are pool wide
+        if self.namespaces is not None and event["type"] == JOB_STATUS:
+            return event["namespace"] in self.namespaces
+        return True
+
+    def push(self, event):
+        if not self.wants(event):
+            return
+        if self.queue.full():
+            # slow consumer: lose the oldest change rather than stall the others
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class PoolEventHub():
+    def __init__(self, sources: dict=None, interval: float=None):
+        """
+        Args:
+            sources: Event type -> coroutine function returning the current
+                items, or None if the states are fed with update
+            interval: Seconds between polls
+        """
+        self.sources = sources
+        self.interval = interval
+        self._states = {}
+        self._subscribers = set()
+        self._poller = None
+        self._ids = itertools.count(1)
+
+    def update(self, event_type, items, timestamp=None):
+        """Diff the current items of an event type against the last ones and push the changes"""
+        # a failed source keeps its last known state until it recovers
+        if isinstance(items, Exception) or isinstance(items, dict):
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        current = _index(event_type, items)
+        # on the first state every current item is news
+        events = diff_states(event_type, self._states.get(event_type, {}), current, timestamp)
+        self._states[event_type] = current
+        for event in events:
+            event["id"] = next(self._ids)
+            for subscriber in list(self._subscribers):
+                subscriber.push(event)
+
+    async def _poll(self):
+        event_types = list(self.sources)
+        results = await fan_out_async([self.sources[t] for t in event_types])
+        timestamp = time.time()
+        for event_type, items in zip(event_types, results):
+            self.update(event_type, items, timestamp)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._poll()
+            except Exception:
+                pass
+            await asyncio.sleep(self.interval)
+
+    def _start(self):
+        if self.sources is None:
+            return
+        if self._poller is None or self._poller.done():
+            self._states = {}
+            # run outside the subscribing request's context (and its deadline)
+            self._poller = contextvars.Context().run(asyncio.ensure_future, self._run())
+
+    def _stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    async def subscribe(self, namespaces=None, types=None, heartbeat=None):
+        """
+        Async iterator of change events for one subscriber.
+
+        New subscribers first get the current state (as events with
+        before=None), then the changes as they happen. Yields None every
+        heartbeat seconds without events.
+        """
+        subscriber = _Subscriber(namespaces=namespaces, types=types)
+        timestamp = time.time()
+        for event_type, state in self._states.items():
+            for event in diff_states(event_type, {}, state, timestamp):
+                event["id"] = 0
+                subscriber.push(event)
+        self._subscribers.add(subscriber)
+        self._start()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(subscriber)
+            if len(self._subscribers) == 0:
+                self._stop()
+
+    def stats(self):
+        return {
+            "subscribers": len(self._subscribers),
+            "polling": self._poller is not None and not self._poller.done()
+        }
@@ -0,0 +1,156 @@
+"""
+Filtering, sorting and pagination of list results served by the bridge API.
+
+Lists are filtered and sliced after they have been fetched (or read from
+the state mirror / read cache), so every page of a listing is cut from the
+same result. Paginated responses are wrapped as:
+
+    {"items": [...], "total": <matches before slicing>, "offset": o, "limit": l}
+"""
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+
+# filter parameter -> (item field, match mode) per listing
+EXACT = "exact"
+CONTAINS = "contains"
+# newline separated values (e.g. Job.host_nodes), any of them matched exactly
+ANY_LINE = "any_line"
+JOB_FILTERS = {"job_id": ("job_id", EXACT), "status": ("status", EXACT), "owner": ("owner", EXACT), "node": ("host_nodes", ANY_LINE)}
+DEVICE_FILTERS = {"node": ("name", EXACT)}
+GPU_FILTERS = {"node": ("node", EXACT), "model": ("model", CONTAINS)}
+SERVICE_FILTERS = {"owner": ("namespace", EXACT)}
+MAX_PAGE_SIZE = 1000
+
+
+class ListParams():
+    """Query parameters shared by the list endpoints (FastAPI dependency)"""
+
+    def __init__(
+        self,
+        offset: Optional[int] = Query(None, ge=0, description="Number of items to skip"),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return"),
+        sort_by: Optional[str] = Query(None, description="Field to sort by"),
+        order: Optional[str] = Query("asc", pattern="^(asc|desc)$", description="Sort order (asc or desc)"),
+        job_id: Optional[str] = Query(None, description="Only the jobs with this id (comma separated values allowed)"),
+        status: Optional[str] = Query(None, description="Only items with this status (comma separated values allowed)"),
+        owner: Optional[str] = Query(None, description="Only items of this owner / namespace (comma separated values allowed)"),
+        node: Optional[str] = Query(None, description="Only items on this node (comma separated values allowed)"),
+        model: Optional[str] = Query(None, description="Only GPUs of this model (comma separated values allowed)")
+    ):
+        self.offset = offset
+        self.limit = limit
+        self.sort_by = sort_by
+        self.descending = order == "desc"
+        self.filters = {
+            name: value for name, value in
+            [("job_id", job_id), ("status", status), ("owner", owner), ("node", node), ("model", model)]
+            if value is not None
+        }
+
+    def fields(self, filters: dict):
+        """Item fields the listing reads (filter and sort keys)"""
+        fields = {filters[name][0] for name in self.filters if name in filters}
+        if self.sort_by is not None:
+            fields.add(self.sort_by)
+        return fields
+
+    @property
+    def requested(self):
+        """Whether any listing option was given (otherwise the raw result is returned)"""
+        return self.offset is not None or self.limit is not None or self.sort_by is not None or len(self.filters) > 0
+
+
+def _as_dict(item):
+    return item.model_dump() if hasattr(item, "model_dump") else item
+
+def _matches(value, wanted, mode):
+    if value is None:
+        return False
+    value = str(value).lower()
+    if mode == CONTAINS:
+        return any(w in value for w in wanted)
+    if mode == ANY_LINE:
+        return any(line in wanted for line in value.split("\n"))
+    return value in wanted
+
+def _sort_key(value):
+    # numbers before strings
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    return (1, 0, str(value).lower())
+
+def parse_fields(fields, valid):
+    """
+    Parse a fields= projection ("name,status") against the valid field names.
+
+    Returns:
+        List of fields in their model order, or None for all fields
+    """
+    if fields is None:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip() != ""}
+    unknown = requested - set(valid)
+    if len(unknown) > 0:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}. Valid: {list(valid)}")
+    return [f for f in valid if f in requested]
+
+def project(items, fields):
+    """Keep only the given fields of each item (models or dicts)"""
+    if fields is None:
+        return items
+    return [
+        item.model_dump(include=set(fields)) if hasattr(item, "model_dump") else {f: item[f] for f in fields}
+        for item in items
+    ]
+
+def flatten_services(services):
+    """{namespace: [service, ...]} -> [{"namespace": ..., **service}, ...]"""
+    return [
+        {"namespace": namespace, **_as_dict(service)}
+        for namespace, items in services.items()
+        for service in items
+    ]
+
+def apply_listing(items, params: ListParams, filters: dict, sortable: list):
+    """
+    Filter, sort and slice a list result.
+
+    Args:
+        items: List of models or dicts
+        params: Listing options of the request
+        filters: Filters supported by this listing (parameter -> (field, mode))
+        sortable: Item fields that can be sorted by
+
+    Returns:
+        The raw items if no listing option was given, otherwise the page envelope
+    """
+    if not params.requested:
+        return items
+    unsupported = set(params.filters) - set(filters)
+    if len(unsupported) > 0:
+        raise HTTPException(status_code=400, detail=f"Unsupported filters: {sorted(unsupported)}. Valid: {sorted(filters)}")
+
+    rows = [(item, _as_dict(item)) for item in items]
+    for name, value in params.filters.items():
+        field, mode = filters[name]
+        wanted = [v.strip().lower() for v in value.split(",")]
+        rows = [(item, data) for item, data in rows if _matches(data.get(field), wanted, mode)]
+    if params.sort_by is not None:
+        if params.sort_by not in sortable:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by {params.sort_by}. Valid: {sorted(sortable)}")
+        # keep items without a value last in both orders
+        present = [r for r in rows if r[1].get(params.sort_by) is not None]
+        missing = [r for r in rows if r[1].get(params.sort_by) is None]
+        present.sort(key=lambda r: _sort_key(r[1][params.sort_by]), reverse=params.descending)
+        rows = present + missing
+
+    offset = params.offset or 0
+    page = rows[offset:] if params.limit is None else rows[offset:offset + params.limit]
+    return {
+        "items": [item for item, _ in page],
+        "total": len(rows),
+        "offset": offset,
+        "limit": params.limit
+    }
@@ -0,0 +1,268 @@
+"""
+Ring buffers of recent log lines per pod, shared by every log reader of
+the bridge API.
+
+The watcher is asked for the logs of a job at most once per interval,
+whatever the number of readers, and for as many lines per pod as the
+largest tail its readers asked for recently; each read appends the new
+lines (past the overlap with the previous read) to the buffer of each pod. Lines are
+numbered per pod from the first read on, so readers can ask for the lines
+after the last one they got (since_line) or written after a time
+(since_ts) and transfer only those.
+
+Buffers are bounded per pod (lines) and in total (bytes of log text); when
+over the total, the least recently read pods are dropped first.
+"""
+import asyncio
+import bisect
+import contextvars
+import itertools
+import time
+from collections import OrderedDict, deque
+
+from kalavai_client.deadline import remaining_time, DeadlineExceeded
+from kalavai_client.log_stream import new_lines, parse_timestamp
+
+
+def _is_error(value):
+    return isinstance(value, dict) and isinstance(value.get("error"), str)
+
+def _pod_infos(result):
+    """{label match: {pod: info}} (as returned by the watcher) -> {pod: (label match, info)}"""
+    pods = {}
+    for match, group in result.items():
+        if isinstance(group, dict):
+            pods.update({pod: (match, info) for pod, info in group.items() if isinstance(info, dict)})
+    return pods
+
+
+class LogLine():
+    __slots__ = ("number", "offset", "ts", "text", "size")
+
+    def __init__(self, number, offset, ts, text):
+        self.number = number
+        self.offset = offset
+        self.ts = ts
+        self.text = text
+        # bytes of the line (without its newline)
+        self.size = len(text.encode())
+
+
+class PodLogs():
+    def __init__(self, max_lines, match=None):
+        self.max_lines = max_lines
+        self.match = match
+        self.lines = deque()
+        self.next_line = 0
+        self.offset = 0
+        self.size = 0
+        self.info = {}
+        self.has_logs = False
+        # the buffer holds every line of the pod log
+        self.whole = False
+        # last tail read from the watcher, to find where the next one overlaps
+        self._tail = []
+
+    @property
+    def first_line(self):
+        return self.lines[0].number if len(self.lines) > 0 else self.next_line
+
+    def extend(self, logs, now=None, tail=None):
+        """
+        Append the lines of a new tail that follow the previous one.
+
+        Args:
+            tail: Lines asked for (fewer lines read: the whole log)
+
+        Returns:
+            Change in size (bytes)
+        """
+        now = time.time() if now is None else now
+        current = logs.splitlines()
+        if self.next_line == 0 and tail is not None and len(current) < tail:
+            # the first read got the whole log
+            self.whole = True
+        lines, gap = new_lines(self._tail, current)
+        self._tail = current
+        if gap:
+            # lines were missed: leave a hole in the numbering
+            self.next_line += 1
+            self.whole = False
+        before = self.size
+        for text in lines:
+            ts = parse_timestamp(text)
+            line = LogLine(self.next_line, self.offset, now if ts is None else ts, text)
+            self.lines.append(line)
+            self.next_line += 1
+            self.offset += line.size + 1
+            self.size += line.size
+        while len(self.lines) > self.max_lines:
+            self.size -= self.lines.popleft().size
+            self.whole = False
+        return self.size - before
+
+    def trim(self, size):
+        """Drop the oldest lines until at most size bytes are left; returns the change in size"""
+        before = self.size
+        while self.size > size and len(self.lines) > 0:
+            self.size -= self.lines.popleft().size
+            self.whole = False
+        return self.size - before
+
+    def covers(self, tail):
+        """Whether the buffer holds the last tail lines of the pod log"""
+        return len(self.lines) >= tail or self.whole
+
+    def select(self, since_line=None, since_ts=None, tail=None):
+        """Buffered lines numbered since_line or later, written at since_ts or later; the last tail of them"""
+        lines = self.lines
+        if since_line is not None:
+            # numbers are increasing (with holes where lines were missed)
+            skip = bisect.bisect_left(lines, since_line, key=lambda line: line.number)
+            lines = itertools.islice(lines, skip, None)
+        if since_ts is not None:
+            lines = [line for line in lines if line.ts >= since_ts]
+        lines = list(lines)
+        if tail is not None:
+            lines = lines[-tail:] if tail > 0 else []
+        return lines
+
+
+class _JobLogs():
+    def __init__(self):
+        self.pods = {}
+        self.fetched_at = None
+        self.refreshing = None
+        # tail asked for by readers -> when it was last asked for
+        self.tails = {}
+        self.fetched_tail = 0
+
+
+class LogBuffer():
+    def __init__(self, interval: float, fetch_tail: int, max_lines: int, max_bytes: int, tail_ttl: float=60):
+        """
+        Args:
+            interval: Minimum seconds between watcher reads of the same job
+            fetch_tail: Most lines per pod asked from the watcher on each read
+            max_lines: Lines kept per pod
+            max_bytes: Bytes of log text kept across all pods
+            tail_ttl: Seconds the tail a reader asked for keeps sizing the reads of its job
+        """
+        self.interval = interval
+        self.fetch_tail = fetch_tail
+        self.tail_ttl = tail_ttl
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._jobs = {}
+        # (job key, pod) -> PodLogs, least recently read first
+        self._lru = OrderedDict()
+        self._size = 0
+        self._reads = 0
+        self._hits = 0
+        self._evictions = 0
+
+    def _store(self, key, job, result, tail):
+        now = time.time()
+        pods = _pod_infos(result)
+        for pod, (match, info) in pods.items():
+            buffer = job.pods.get(pod)
+            if buffer is None:
+                buffer = job.pods[pod] = PodLogs(self.max_lines, match=match)
+            buffer.info = {k: v for k, v in info.items() if k != "logs"}
+            # no logs until the pod has started
+            if info.get("logs") is not None:
+                buffer.has_logs = True
+                self._size += buffer.extend(info["logs"], now=now, tail=tail)
+            self._lru[(key, pod)] = buffer
+            self._lru.move_to_end((key, pod))
+        for pod in [p for p in job.pods if p not in pods]:
+            self._drop(key, pod)
+        self._evict()
+
+    def _drop(self, key, pod):
+        job = self._jobs.get(key)
+        buffer = self._lru.pop((key, pod), None)
+        if buffer is not None:
+            self._size -= buffer.size
+        if job is not None:
+            job.pods.pop(pod, None)
+
+    def _evict(self):
+        while self._size > self.max_bytes and len(self._lru) > 1:
+            (key, pod), _ = next(iter(self._lru.items()))
+            self._drop(key, pod)
+            self._evictions += 1
+        if self._size > self.max_bytes:
+            # a single pod over the budget keeps its newest lines
+            for buffer in self._lru.values():
+                self._size += buffer.trim(self.max_bytes)
+        for key in [k for k, job in self._jobs.items() if len(job.pods) == 0 and job.refreshing is None]:
+            del self._jobs[key]
+
+    def _fetch_tail(self, job):
+        """Largest tail asked for by the readers of a job within tail_ttl"""
+        now = time.monotonic()
+        job.tails = {tail: at for tail, at in job.tails.items() if now - at < self.tail_ttl}
+        return max(job.tails, default=self.fetch_tail)
+
+    async def _fetch(self, key, job, fetch):
+        self._reads += 1
+        tail = self._fetch_tail(job)
+        result = await fetch(tail=tail)
+        if not _is_error(result):
+            job.fetched_at = time.monotonic()
+            job.fetched_tail = tail
+            self._store(key, job, result, tail)
+        return result
+
+    async def _refresh(self, key, job, fetch):
+        if job.refreshing is None or job.refreshing.done():
+            # shared by every reader of the job and free of their deadlines
+            job.refreshing = contextvars.Context().run(asyncio.ensure_future, self._fetch(key, job, fetch))
+        task = job.refreshing
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded()
+        finally:
+            if task.done() and job.refreshing is task:
+                job.refreshing = None
+
+    async def read(self, key, fetch, tail=None):
+        """
+        Log buffers of the pods of a job, refreshed if older than interval
+        (or read with fewer lines than tail).
+
+        Args:
+            key: Job key (e.g. (namespace, job name))
+            fetch: Coroutine function (tail=) returning {label match: {pod: {"logs": ...}}}
+            tail: Lines per pod the reader wants (None: fetch_tail)
+
+        Returns:
+            {pod: PodLogs}, or an {"error": ...} dict if the read failed
+        """
+        tail = self.fetch_tail if tail is None else max(1, min(tail, self.fetch_tail))
+        job = self._jobs.setdefault(key, _JobLogs())
+        job.tails[tail] = time.monotonic()
+        if job.fetched_at is None or time.monotonic() - job.fetched_at >= self.interval or tail > job.fetched_tail:
+            result = await self._refresh(key, job, fetch)
+            if _is_error(result):
+                return result
+        else:
+            self._hits += 1
+        for pod in job.pods:
+            self._lru.move_to_end((key, pod))
+        return dict(job.pods)
+
+    def stats(self):
+        return {
+            "jobs": len(self._jobs),
+            "pods": len(self._lru),
+            "bytes": self._size,
+            "reads": self._reads,
+            "hits": self._hits,
+            "evictions": self._evictions
+        }
@@ -0,0 +1,145 @@
+"""
+Follow the logs of the pods of a job.
+
+The watcher serves log tails (the last N lines of each pod), not streams.
+Tails are read into per pod buffers (kalavai_client.log_buffer), which
+keep only the lines past the overlap with the previous tail; LogFollower
+polls the buffers and emits the lines it has not sent yet. Each line is
+tagged with its pod, its number and byte offset in the pod log (counted
+from the first line the buffer read) and a timestamp: the one the line
+starts with (RFC 3339, as written by kubectl logs --timestamps and most
+loggers) or else the time it was first read.
+
+Records:
+    {"pod": ..., "line_no": ..., "offset": ..., "ts": ..., "line": ...}
+    {"pod": ..., "event": "gap"}: lines were missed (more lines than the
+        tail were written between reads, or the buffer was dropped)
+    {"pod": ..., "event": "removed"}: the pod is gone
+    {"error": ...}: the read failed (following goes on)
+"""
+import asyncio
+import re
+import time
+from datetime import datetime
+
+from kalavai_client.deadline import remaining_time
+
+
+GAP = "gap"
+REMOVED = "removed"
+_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?\s")
+
+
+def parse_timestamp(line):
+    """Unix time of the RFC 3339 timestamp a log line starts with, or None"""
+    match = _TIMESTAMP.match(line)
+    if match is None:
+        return None
+    seconds, fraction, zone = match.groups()
+    # datetime takes microseconds at most; kubernetes writes nanoseconds
+    fraction = "" if fraction is None else fraction[:7]
+    zone = "+00:00" if zone in (None, "Z") else zone
+    try:
+        return datetime.fromisoformat(f"{seconds}{fraction}{zone}").timestamp()
+    except ValueError:
+        return None
+
+def new_lines(previous, current):
+    """
+    Lines of a log tail that follow the previous tail of the same log.
+
+    Returns:
+        (lines, gap): gap is True when the tails do not overlap, in which
+        case every line of current is returned
+    """
+    if len(previous) == 0:
+        return current, False
+    first = current[0] if len(current) > 0 else None
+    for start in range(len(previous)):
+        if previous[start] != first:
+            continue
+        overlap = len(previous) - start
+        if previous[start:] == current[:overlap]:
+            return current[overlap:], False
+    # a longer tail (a reader asked for more lines) holds the previous one
+    for start in range(len(current) - len(previous), 0, -1):
+        if current[start:start + len(previous)] == previous:
+            return current[start + len(previous):], False
+    if len(current) == 0:
+        return [], False
+    return current, True
+
+def _is_error(result):
+    return isinstance(result, dict) and isinstance(result.get("error"), str)
+
+def _record(pod, line):
+    return {"pod": pod, "line_no": line.number, "offset": line.offset, "ts": line.ts, "line": line.text}
+
+
+class LogFollower():
+    def __init__(self, read, interval: float):
+        """
+        Args:
+            read: Coroutine function returning the log buffers as {pod: PodLogs}
+            interval: Seconds between reads
+        """
+        self.read = read
+        self.interval = interval
+        # pod -> (buffer, number of the next line to send)
+        self._cursors = {}
+
+    def _lines(self, pod, buffer, tail=None, since=None, since_line=None):
+        cursor = self._cursors.get(pod)
+        self._cursors[pod] = (buffer, buffer.next_line)
+        if cursor is None:
+            # resuming from a line number sends everything after it
+            lines = buffer.select(since_line=since_line, since_ts=since, tail=tail if since_line is None else None)
+            return [_record(pod, line) for line in lines]
+        if cursor[0] is not buffer:
+            # the buffer was dropped and read again: older lines are lost
+            return [{"pod": pod, "event": GAP}]
+        records = []
+        expected = cursor[1]
+        for line in buffer.select(since_line=cursor[1], since_ts=since):
+            # holes in the numbering mark missed lines
+            if line.number > expected and since is None:
+                records.append({"pod": pod, "event": GAP})
+            records.append(_record(pod, line))
+            expected = line.number + 1
+        return records
+
+    async def follow(self, tail: int=None, since: float=None, since_line: int=None, follow: bool=True, heartbeat: float=None):
+        """
+        Async iterator of log records.
+
+        Starts with the last tail lines of each pod, then (if follow) the new
+        lines as they are written. Yields None every heartbeat seconds
+        without records. Stops when the request deadline, if any, runs out.
+
+        Args:
+            since: Only lines with a timestamp at or after this Unix time
+            since_line: Start each pod at this line number
+        """
+        last_yield = time.monotonic()
+        while True:
+            result = await self.read()
+            records = []
+            if _is_error(result):
+                records.append(result)
+            else:
+                for pod, buffer in result.items():
+                    records.extend(self._lines(pod, buffer, tail=tail, since=since, since_line=since_line))
+                for pod in [p for p in self._cursors if p not in result]:
+                    del self._cursors[pod]
+                    records.append({"pod": pod, "event": REMOVED})
+            for record in records:
+                yield record
+            if len(records) > 0:
+                last_yield = time.monotonic()
+            elif heartbeat is not None and time.monotonic() - last_yield >= heartbeat:
+                yield None
+                last_yield = time.monotonic()
+            remaining = remaining_time()
+            if not follow or (remaining is not None and remaining <= self.interval):
+                return
+            await asyncio.sleep(self.interval)
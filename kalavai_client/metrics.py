@@ -1,47 +1,419 @@
 import time
 import os
-from datetime import datetime, timedelta
+import io
+import csv
+import json
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
 import clickhouse_connect
+from clickhouse_connect.driver.exceptions import OperationalError
 import pandas as pd
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from kalavai_client.deadline import remaining_time, DeadlineExceeded
+from kalavai_client.usage_cache import (
+    ClosedHourCache,
+    DAY as CACHE_DAY,
+    as_utc,
+    ceil_hour,
+    day_range,
+    floor_day,
+    floor_hour,
+    merge_ranges
+)
+
+
+USAGE_TABLE = "logs.hourly_resource_usage_mv"
+USAGE_VALUES = ["vram_hours", "cpu_hours", "memory_hours"]
+# closed hour cache scope -> (entity column, other key columns of its rows)
+USAGE_SCOPES = {
+    "user": ("user_id", ["job_id", "job_name", "gpu_type"]),
+    "provider": ("provider", ["gpu_type"])
+}
+# ranges of hours not cached read in separate queries (more are read as one range)
+MAX_GAPS = 4
+# usage time buckets -> start of the bucket of an hour (_hour) in ClickHouse
+HOUR = "hour"
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+BUCKETS = {
+    HOUR: "_hour",
+    DAY: "toStartOfDay(_hour)",
+    # weeks start on Monday
+    WEEK: "toDateTime(toStartOfWeek(_hour, 1))",
+    MONTH: "toDateTime(toStartOfMonth(_hour))"
+}
+# key of the rows past the top N (top_n)
+OTHER = "other"
+# result formats
+DICT = "dict"           # {column: {index: value}} (DataFrame.to_dict)
+COLUMNAR = "columnar"   # {"columns": [...], "data": {column: [value, ...]}}
+ARROW = "arrow"         # Arrow IPC stream (bytes, needs pyarrow)
+FORMATS = (DICT, COLUMNAR, ARROW)
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_AVAILABLE = pa is not None
+# streamed result formats (sent row block by row block)
+NDJSON = "ndjson"
+CSV = "csv"
+STREAM_FORMATS = (NDJSON, CSV)
+STREAM_MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+# connection states
+DISABLED = "disabled"       # no endpoint set
+IDLE = "idle"               # not connected yet
+CONNECTING = "connecting"   # warming up (waking the service)
+READY = "ready"
+UNAVAILABLE = "unavailable"
+
+
+class MetricsUnavailable(ConnectionError):
+    pass
+
+
+def _parse_time(value):
+    """'YYYY-MM-DD' or ISO datetime -> datetime"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+def _sum_rows(rows, width):
+    """Sum the values of rows sharing their first width fields (GROUP BY)"""
+    sums = {}
+    for row in rows:
+        key, values = row[:width], row[width:]
+        total = sums.get(key)
+        sums[key] = values if total is None else tuple(a + b for a, b in zip(total, values))
+    return [key + sums[key] for key in sorted(sums, key=lambda k: tuple(str(v) for v in k))]
+
+def _as_columns(columns, rows):
+    """Rows -> {column: {index: value}}, as DataFrame.to_dict(orient="dict")"""
+    return {column: {i: row[j] for i, row in enumerate(rows)} for j, column in enumerate(columns)}
+
+def _arrow_ipc(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+def _encode_row(columns, row, format):
+    if format == NDJSON:
+        return (json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n").encode()
+    line = io.StringIO()
+    csv.writer(line).writerow(row)
+    return line.getvalue().encode()
+
+def _check_format(format):
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format}. Valid: {list(FORMATS)}")
+    if format == ARROW and pa is None:
+        raise ValueError("Arrow output needs pyarrow (pip install kalavai-client[arrow])")
+
+def _as_format(columns, rows, format=DICT):
+    """Rows (tuples) -> result in the given format"""
+    _check_format(format)
+    if format == DICT:
+        return _as_columns(columns, rows)
+    data = {column: [row[j] for row in rows] for j, column in enumerate(columns)}
+    if format == COLUMNAR:
+        return {"columns": list(columns), "data": data}
+    return _arrow_ipc(pa.Table.from_pydict(data))
+
+
+class ClientPool():
+    """
+    Up to size ClickHouse clients, created on first use and reused. A client
+    (one HTTP session) runs one query at a time, so concurrent queries take
+    different clients; past size, callers wait for one to be returned (until
+    the request deadline, if any).
+    """
+
+    def __init__(self, connect, size: int):
+        """
+        Args:
+            connect: Function returning a new client
+            size: Maximum number of clients
+        """
+        self.connect = connect
+        self.size = max(1, size)
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self):
+        with self._cond:
+            while len(self._idle) == 0 and self._open >= self.size:
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded()
+                self._cond.wait(timeout=remaining)
+            if len(self._idle) > 0:
+                return self._idle.pop()
+            self._open += 1
+        try:
+            return self.connect()
+        except BaseException:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, client):
+        with self._cond:
+            self._idle.append(client)
+            self._cond.notify()
+
+    @contextmanager
+    def client(self):
+        client = self._acquire()
+        try:
+            yield client
+        finally:
+            self._release(client)
+
+    def close(self):
+        """Close the idle clients"""
+        with self._cond:
+            clients, self._idle = self._idle, []
+            self._open -= len(clients)
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "open": self._open, "idle": len(self._idle), "in_use": self._open - len(self._idle)}
+
+
+class SelectQuery():
+    """
+    SELECT statement whose values are bound server side ({name:Type}
+    placeholders, sent as query parameters). The query text depends only on
+    the shape of the query (columns, which filters, grouping), never on the
+    values, so ClickHouse can reuse cached results and plans across calls.
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = list(columns)
+        self.conditions = []
+        self.parameters = {}
+        self.group_by = []
+        self.order_by = []
+        self.limit = None
+
+    def where(self, condition, **parameters):
+        """Add a condition; parameters fill its {name:Type} placeholders"""
+        self.conditions.append(condition)
+        self.parameters.update(parameters)
+        return self
+
+    def where_in(self, column, name, values, type="String"):
+        return self.where(f"{column} IN {{{name}:Array({type})}}", **{name: list(values)})
+
+    def where_between(self, column, start=None, end=None):
+        """start <= column < end (either bound optional)"""
+        if start is not None:
+            self.where(f"{column} >= {{start_time:DateTime}}", start_time=start)
+        if end is not None:
+            self.where(f"{column} < {{end_time:DateTime}}", end_time=end)
+        return self
+
+    @property
+    def text(self):
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table}"
+        if len(self.conditions) > 0:
+            query += f" WHERE {' AND '.join(self.conditions)}"
+        if len(self.group_by) > 0:
+            query += f" GROUP BY {', '.join(self.group_by)}"
+        if len(self.order_by) > 0:
+            query += f" ORDER BY {', '.join(self.order_by)}"
+        if self.limit is not None:
+            query += f" LIMIT {self.limit}"
+        return query
+
+    def over(self, columns):
+        """SELECT columns FROM (this query), with its parameters"""
+        outer = SelectQuery(f"({self.text})", columns)
+        outer.parameters.update(self.parameters)
+        return outer
+
 
 """
 Class used to fetch data from ClickHouse, for downstream application metrics
 RJHQWQ4T
 """
 class MetricsAPI():
-    def __init__(self, endpoint, port, username, password):
-        try:
-            self.client = clickhouse_connect.get_client(
-                host=endpoint,
-                port=port,
-                username=username,
-                password=password,
-                secure=True,
-                # --- THE CLOUD WAKE-UP PROTECTION ---
-                connect_timeout=60,       # Wait up to 60s for the initial TCP/HTTP connection
-                send_receive_timeout=60,  # Wait up to 60s for the first query to return 
-                query_retries=5           # Retry 5 times if the network drops/refuses during spin-up
-            )
-        except:
-            pass
-    
+    def __init__(self, endpoint, port, username, password, query_cache_ttl=60, hour_cache: ClosedHourCache=None, hour_cache_days=30, settle_time=600, pool_size=4):
+        """
+        Clients are created on first use (or by warm_up), not here, so a
+        sleeping or unset service does not hold up the caller.
+
+        Args:
+            query_cache_ttl: Seconds ClickHouse reuses the results of identical queries (0 disables)
+            hour_cache: Cache of closed hour usage rows (None disables)
+            hour_cache_days: Longest window (in days) read through the hour cache; longer ones are one ClickHouse query
+            settle_time: Seconds after its end an hour may still get rows (and is not cached)
+            pool_size: Maximum number of clients (concurrent queries)
+        """
+        # reuse results of identical queries (same text and parameters) in ClickHouse
+        self.settings = {} if query_cache_ttl <= 0 else {"use_query_cache": 1, "query_cache_ttl": int(query_cache_ttl)}
+        self.hour_cache = hour_cache
+        self.hour_cache_window = timedelta(days=hour_cache_days)
+        self.settle_time = settle_time
+        self.endpoint = endpoint
+        self._connect_args = dict(
+            host=endpoint,
+            port=port,
+            username=username,
+            password=password,
+            secure=True,
+            # --- THE CLOUD WAKE-UP PROTECTION ---
+            connect_timeout=60,       # Wait up to 60s for the initial TCP/HTTP connection
+            send_receive_timeout=60,  # Wait up to 60s for the first query to return 
+            query_retries=5           # Retry 5 times if the network drops/refuses during spin-up
+        )
+        self.pool = ClientPool(self._connect, pool_size)
+        self.state = IDLE if endpoint else DISABLED
+        self._warm_up = None
+
     def __del__(self):
-        self.client.close()
+        pool = getattr(self, "pool", None)
+        if pool is not None:
+            pool.close()
+
+    def _connect(self):
+        if not self.endpoint:
+            raise MetricsUnavailable("Metrics service not configured (CLICKHOUSE_ENDPOINT is not set)")
+        try:
+            client = clickhouse_connect.get_client(**self._connect_args)
+        except Exception as e:
+            self.state = UNAVAILABLE
+            raise MetricsUnavailable(f"Metrics service unavailable: {e}") from e
+        self.state = READY
+        return client
+
+    @contextmanager
+    def _client(self):
+        with self.pool.client() as client:
+            try:
+                yield client
+            except OperationalError as e:
+                # connection level failure (query errors are DatabaseError)
+                self.state = UNAVAILABLE
+                raise MetricsUnavailable(f"Metrics service unavailable: {e}") from e
 
     def ping_service(self, max_attempts=6, backoff_time=10):
+        if not self.endpoint:
+            return False
         for attempt in range(max_attempts):
-            if self.client.ping():
-                print("🟢 Service is awake and ready!")
-                return True
+            try:
+                with self._client() as client:
+                    if client.ping():
+                        self.state = READY
+                        print("🟢 Service is awake and ready!")
+                        return True
+            except MetricsUnavailable as e:
+                print(f"Warning: {str(e)}")
             print(f"⏳ Still waking up... (Attempt {attempt + 1}/{max_attempts})")
             time.sleep(backoff_time)
+        self.state = UNAVAILABLE
         return False
 
-    def _query(self, query):
-        df = self.client.query_df(query)
-        return df.to_dict(orient="dict")
+    def warm_up(self, max_attempts=6, backoff_time=10):
+        """Connect (ping_service) in a background thread; returns at once"""
+        if not self.endpoint or (self._warm_up is not None and self._warm_up.is_alive()):
+            return
+        if self.state != READY:
+            self.state = CONNECTING
+        self._warm_up = threading.Thread(
+            target=self.ping_service,
+            kwargs={"max_attempts": max_attempts, "backoff_time": backoff_time},
+            name="metrics-warm-up",
+            daemon=True
+        )
+        self._warm_up.start()
+
+    def stats(self):
+        # states and counters only (served by /health, unauthenticated): the
+        # connection errors go to the callers of the metrics endpoints
+        return {
+            "state": self.state,
+            "pool": self.pool.stats(),
+            "hour_cache": None if self.hour_cache is None else self.hour_cache.stats()
+        }
+
+    def _query(self, query, parameters=None, format=DICT):
+        _check_format(format)
+        with self._client() as client:
+            if format == DICT:
+                df = client.query_df(query, parameters=parameters, settings=self.settings)
+                return df.to_dict(orient="dict")
+            if format == ARROW or pa is not None:
+                # columns straight from the Arrow blocks, no pandas frame in between
+                table = client.query_arrow(query, parameters=parameters, settings=self.settings, use_strings=True)
+                if format == ARROW:
+                    return _arrow_ipc(table)
+                return {"columns": table.column_names, "data": table.to_pydict()}
+            result = client.query(query, parameters=parameters, settings=self.settings)
+        data = {column: [] for column in result.column_names}
+        for column, values in zip(result.column_names, result.result_columns):
+            data[column] = list(values)
+        return {"columns": list(result.column_names), "data": data}
+
+    def query(self, query, parameters=None, format=DICT):
+        """Run a query; values go in parameters, as {name:Type} placeholders in the text"""
+        return self._query(query, parameters=parameters, format=format)
+
+    def stream_query(self, query, parameters=None, format=NDJSON, max_rows=None, max_bytes=None, cancelled=None):
+        """
+        Run a query and yield its result as encoded chunks, one per row
+        block, so that only one block is in memory at a time.
+
+        Stops after max_rows rows or before max_bytes bytes; an NDJSON stream
+        then ends with a {"truncated": true, ...} record. Closing the
+        generator, or setting the cancelled event (checked between blocks),
+        closes the ClickHouse stream and with it the query.
+        """
+        if format not in STREAM_FORMATS:
+            raise ValueError(f"Unknown stream format {format}. Valid: {list(STREAM_FORMATS)}")
+        rows_sent = bytes_sent = 0
+        # no query cache: streamed results are too large to be worth keeping
+        # the client is held (not used by other queries) until the stream ends
+        with self._client() as client, client.query_row_block_stream(query, parameters=parameters) as stream:
+            columns = stream.source.column_names
+            if format == CSV:
+                header = _encode_row(columns, columns, CSV)
+                bytes_sent += len(header)
+                yield header
+            for block in stream:
+                if cancelled is not None and cancelled.is_set():
+                    return
+                chunk = []
+                for row in block:
+                    line = _encode_row(columns, row, format)
+                    if (max_rows is not None and rows_sent >= max_rows) or (max_bytes is not None and bytes_sent + len(line) > max_bytes):
+                        if format == NDJSON:
+                            chunk.append(_encode_row(["truncated", "rows", "bytes"], [True, rows_sent, bytes_sent], NDJSON))
+                        yield b"".join(chunk)
+                        return
+                    chunk.append(line)
+                    rows_sent += 1
+                    bytes_sent += len(line)
+                if len(chunk) > 0:
+                    yield b"".join(chunk)
+
+    def _run(self, select: SelectQuery, format=DICT):
+        return self._query(select.text, parameters=select.parameters, format=format)
 
     def _create_selector(self, property, aggregate):
         if aggregate:
@@ -49,13 +421,133 @@ class MetricsAPI():
         else:
             return property
 
+    def _usage_window(self, start_time, end_time):
+        # end_time is a day: include all timestamps within it
+        return (
+            None if not start_time else _parse_time(start_time),
+            None if not end_time else datetime.strptime(end_time, "%Y-%m-%d") + timedelta(days=1)
+        )
+
+    def _usage_query(self, keys, aggregate, start_time, end_time):
+        columns = list(keys) + ([] if aggregate else ["hour"]) + [
+            self._create_selector(p, aggregate) for p in ["vram_hours", "cpu_hours", "memory_hours"]
+        ]
+        select = SelectQuery(USAGE_TABLE, columns)
+        start, end = self._usage_window(start_time, end_time)
+        select.where_between("hour", start=start, end=end)
+        return select
+
+    def _rollup_query(self, select, keys, others, aggregate, bucket, top_n):
+        """
+        Group the usage rows of select (a _usage_query, not aggregated) in
+        ClickHouse: per key and bucket (start of the hour, day, week or
+        month, returned as hour) or, if aggregate, per key. With top_n, rows
+        outside the top_n values of others[0] by vram_hours are summed with
+        their others columns set to "other".
+        """
+        # the rows are read under other names so that the grouped columns
+        # (same names as the table columns) do not shadow them
+        select.columns = [f"{column} AS _{column}" for column in list(keys) + ["hour"] + USAGE_VALUES]
+        columns = []
+        for key in keys:
+            if top_n is not None and key in others:
+                top = SelectQuery(USAGE_TABLE, [others[0]])
+                top.conditions = list(select.conditions)
+                top.group_by = [others[0]]
+                top.order_by = ["SUM(vram_hours) DESC", others[0]]
+                top.limit = "{top_n:UInt32}"
+                columns.append(f"if(_{others[0]} IN ({top.text}), _{key}, '{OTHER}') AS {key}")
+            else:
+                columns.append(f"_{key} AS {key}")
+        if not aggregate:
+            columns.append(f"{BUCKETS[bucket]} AS hour")
+        rollup = select.over(columns + [f"SUM(_{value}) AS {value}" for value in USAGE_VALUES])
+        if top_n is not None:
+            rollup.parameters["top_n"] = top_n
+        rollup.group_by = list(keys) + ([] if aggregate else ["hour"])
+        rollup.order_by = list(rollup.group_by)
+        return rollup
+
+    def _fetch_hours(self, scope, entities, start, end):
+        """Usage rows of entities in [start, end), as {(entity, hour): [row, ...]}"""
+        entity, keys = USAGE_SCOPES[scope]
+        select = SelectQuery(USAGE_TABLE, [entity, "hour"] + keys + USAGE_VALUES)
+        select.where_in(entity, "entities", entities)
+        select.where_between("hour", start=start, end=end)
+        with self._client() as client:
+            result = client.query(select.text, parameters=select.parameters, settings=self.settings)
+        rows = defaultdict(list)
+        for row in result.result_rows:
+            rows[(row[0], as_utc(row[1]))].append(tuple(row[2:]))
+        return rows
+
+    def _cached_window(self, start_time, end_time, rollup):
+        """[start, end) of a usage query read through the hour cache, or None to query ClickHouse directly"""
+        if self.hour_cache is None or not start_time or rollup:
+            return None
+        start, end = self._usage_window(start_time, end_time)
+        # a long window (e.g. a yearly report) would go through entities x days
+        # of cache entries and push out the dashboard ones: it is one query
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if (now if end is None else end) - start > self.hour_cache_window:
+            return None
+        return start, end
+
+    def _hourly_rows(self, scope, entities, start, end=None):
+        """
+        Usage rows of entities in [start, end): whole closed days from the
+        cache where possible, the rest (days not cached, partial days at the
+        ends of the window and open hours) from ClickHouse.
+
+        Returns:
+            List of (entity, hour, row) with row the key columns and values of the scope
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # hours before open_from are over (and settled)
+        open_from = floor_hour(now - timedelta(seconds=self.settle_time))
+        closed_end = open_from if end is None else min(end, open_from)
+        first = ceil_hour(start)
+        days = day_range(first, closed_end)
+        hours = {}
+        ranges = []
+        missing = []
+        if len(days) == 0:
+            ranges.append((first, end))
+        else:
+            if first < days[0]:
+                ranges.append((first, days[0]))
+            for day in days:
+                cached = [(entity, self.hour_cache.get(scope, entity, day)) for entity in entities]
+                if any(day_hours is None for _, day_hours in cached):
+                    missing.append(day)
+                    ranges.append((day, day + CACHE_DAY))
+                    continue
+                for entity, day_hours in cached:
+                    hours.update(((entity, hour), rows) for hour, rows in day_hours.items())
+            last = days[-1] + CACHE_DAY
+            if end is None or last < end:
+                ranges.append((last, end))
+        fetched_days = defaultdict(dict)
+        for range_start, range_end in merge_ranges(ranges, MAX_GAPS):
+            fetched = self._fetch_hours(scope, entities, range_start, range_end)
+            hours.update(fetched)
+            for (entity, hour), rows in fetched.items():
+                fetched_days[(entity, floor_day(hour))][hour] = rows
+        for day in missing:
+            for entity in entities:
+                self.hour_cache.put(scope, entity, day, fetched_days.get((entity, day), {}))
+        return [(entity, hour, row) for (entity, hour), rows in hours.items() for row in rows]
+
     def get_compute_usage(
         self,
         user_ids: list[str],
         job_ids: list[str] = None,
         start_time: str = None,
         end_time: str = None,
-        aggregate: bool = False
+        aggregate: bool = False,
+        format: str = DICT,
+        bucket: str = HOUR,
+        top_n: int = None
     ):
         """
         Get compute usage metrics for a specific user
@@ -64,6 +556,9 @@ class MetricsAPI():
             user_id (str): The user ID to query
             start_time (str, optional): Start date for the query. Defaults to None.
             end_time (str, optional): End date for the query. Defaults to None.
+            format (str, optional): Result format (dict, columnar or arrow). Defaults to dict.
+            bucket (str, optional): Time bucket of the rows when not aggregated (hour, day, week or month). Defaults to hour.
+            top_n (int, optional): Keep the top N jobs by vram_hours, the rest summed as job "other". Defaults to None (all jobs).
             
         Returns:
             list: List of dictionaries containing usage metrics
@@ -146,32 +641,35 @@ class MetricsAPI():
         # print(json.dumps(data, indent=2))
         # return data
         
-        query = f"""
-            SELECT
-                job_id,
-                job_name,
-                gpu_type,
-                {'hour,' if not aggregate else ''}
-                {self._create_selector('vram_hours', aggregate)},
-                {self._create_selector('cpu_hours', aggregate)},
-                {self._create_selector('memory_hours', aggregate)}
-            FROM logs.hourly_resource_usage_mv 
-            WHERE user_id IN {tuple(user_ids)}
-        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket}. Valid: {list(BUCKETS)}")
+        # rollups are grouped in ClickHouse: the cache holds hourly rows only
+        rollup = (bucket != HOUR and not aggregate) or top_n is not None
+        window = self._cached_window(start_time, end_time, rollup)
+        if window is not None:
+            start, end = window
+            rows = [
+                row[:3] + (hour,) + row[3:]
+                for _, hour, row in self._hourly_rows("user", user_ids, start, end)
+                if job_ids is None or row[0] in job_ids
+            ]
+            if aggregate:
+                return _as_format(["job_id", "job_name", "gpu_type"] + USAGE_VALUES, _sum_rows([r[:3] + r[4:] for r in rows], 3), format)
+            rows.sort(key=lambda r: (str(r[0]), str(r[2]), r[3], str(r[1])))
+            return _as_format(["job_id", "job_name", "gpu_type", "hour"] + USAGE_VALUES, rows, format)
+
+        select = self._usage_query(["job_id", "job_name", "gpu_type"], aggregate and not rollup, start_time, end_time)
+        select.where_in("user_id", "user_ids", user_ids)
         if job_ids is not None:
-            query += f" AND job_id IN {tuple(job_ids)}"
-        if start_time:
-            query += f" AND hour >= '{start_time}'"
-        if end_time:
-            # Add one day to include all timestamps within the end_date
-            end_date = datetime.strptime(end_time, "%Y-%m-%d") + timedelta(days=1)
-            query += f" AND hour < '{end_date.strftime('%Y-%m-%d')}'"
-        if aggregate:
-            query += " GROUP BY job_id, gpu_type, job_name"
+            select.where_in("job_id", "job_ids", job_ids)
+        if rollup:
+            select = self._rollup_query(select, ["job_id", "job_name", "gpu_type"], ["job_id", "job_name"], aggregate, bucket, top_n)
+        elif aggregate:
+            select.group_by = ["job_id", "gpu_type", "job_name"]
         else:
-            query += " ORDER BY job_id, gpu_type, hour, job_name"
+            select.order_by = ["job_id", "gpu_type", "hour", "job_name"]
         
-        result =  self._query(query)
+        result = self._run(select, format=format)
         return result
     
     def get_provider_usage(
@@ -179,7 +677,10 @@ class MetricsAPI():
         provider_ids: list[str],
         start_time: str = None,
         end_time = None,
-        aggregate: bool = True
+        aggregate: bool = True,
+        format: str = DICT,
+        bucket: str = HOUR,
+        top_n: int = None
     ):
         """
         Get compute usage metrics for a specific provider
@@ -188,32 +689,35 @@ class MetricsAPI():
             provider_id (str): The provider ID to query
             start_time (str, optional): Start date for the query. Defaults to None.
             end_time (str, optional): End date for the query. Defaults to None.
+            format (str, optional): Result format (dict, columnar or arrow). Defaults to dict.
+            bucket (str, optional): Time bucket of the rows when not aggregated (hour, day, week or month). Defaults to hour.
+            top_n (int, optional): Keep the top N providers by vram_hours, the rest summed as provider "other". Defaults to None (all providers).
             
         Returns:
             list: List of dictionaries containing usage metrics
         """
-        query = f"""
-            SELECT 
-                provider,
-                gpu_type,
-                {'hour,' if not aggregate else ''}
-                {self._create_selector('vram_hours', aggregate)},
-                {self._create_selector('cpu_hours', aggregate)},
-                {self._create_selector('memory_hours', aggregate)}
-            FROM logs.hourly_resource_usage_mv 
-            WHERE provider IN {tuple(provider_ids)}
-        """
-        if start_time:
-            query += f" AND hour >= '{start_time}'"
-        if end_time:
-            # Add one day to include all timestamps within the end_date
-            end_date = datetime.strptime(end_time, "%Y-%m-%d") + timedelta(days=1)
-            query += f" AND hour < '{end_date.strftime('%Y-%m-%d')}'"
-        if aggregate:
-            query += " GROUP BY provider, gpu_type"
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket}. Valid: {list(BUCKETS)}")
+        # rollups are grouped in ClickHouse: the cache holds hourly rows only
+        rollup = (bucket != HOUR and not aggregate) or top_n is not None
+        window = self._cached_window(start_time, end_time, rollup)
+        if window is not None:
+            start, end = window
+            rows = [(provider, row[0], hour) + row[1:] for provider, hour, row in self._hourly_rows("provider", provider_ids, start, end)]
+            if aggregate:
+                return _as_format(["provider", "gpu_type"] + USAGE_VALUES, _sum_rows([r[:2] + r[3:] for r in rows], 2), format)
+            rows.sort(key=lambda r: (str(r[0]), str(r[1]), r[2]))
+            return _as_format(["provider", "gpu_type", "hour"] + USAGE_VALUES, rows, format)
+
+        select = self._usage_query(["provider", "gpu_type"], aggregate and not rollup, start_time, end_time)
+        select.where_in("provider", "provider_ids", provider_ids)
+        if rollup:
+            select = self._rollup_query(select, ["provider", "gpu_type"], ["provider"], aggregate, bucket, top_n)
+        elif aggregate:
+            select.group_by = ["provider", "gpu_type"]
         else:
-            query += " ORDER BY provider, gpu_type, hour"
-        return self._query(query)
+            select.order_by = ["provider", "gpu_type", "hour"]
+        return self._run(select, format=format)
 
 
 if __name__ == "__main__":
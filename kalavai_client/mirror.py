@@ -0,0 +1,184 @@
+"""
+In-memory mirror of the pool state, kept fresh in the background.
+
+Each mirrored resource (nodes, GPUs, labels, jobs, services, ...) has its
+own refresh loop and interval; loops start staggered so their watcher
+calls do not line up. Reads are served from memory; a read that needs
+fresher data than the mirror holds (max_staleness) waits for a refresh,
+shared by every reader of that resource. Listeners get each refreshed
+value (e.g. PoolEventHub, to diff it into change events).
+"""
+import asyncio
+import contextvars
+import time
+
+from kalavai_client.deadline import remaining_time, DeadlineExceeded
+
+
+def parse_intervals(value):
+    """Parse "resource=seconds,resource=seconds" into a dict"""
+    intervals = {}
+    if not value:
+        return intervals
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        name, seconds = pair.split("=", 1)
+        intervals[name.strip()] = float(seconds)
+    return intervals
+
+def _is_error(value):
+    return isinstance(value, dict) and "error" in value
+
+
+class _Entry():
+    def __init__(self, name, fetch, interval):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.value = None
+        self.updated_at = None
+        self.updated_at_epoch = None
+        self.error = None
+        self.refreshing = None
+
+    def age(self):
+        return None if self.updated_at is None else time.monotonic() - self.updated_at
+
+
+class StateMirror():
+    def __init__(self, sources: dict, default_interval: float, intervals: dict=None):
+        """
+        Args:
+            sources: Resource name -> coroutine function returning its current value
+            default_interval: Seconds between refreshes
+            intervals: Per resource overrides of default_interval
+        """
+        intervals = intervals or {}
+        self._entries = {
+            name: _Entry(name, fetch, intervals.get(name, default_interval))
+            for name, fetch in sources.items()
+        }
+        self._loops = []
+        self._generation = 0
+        self._listeners = []
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    async def _fetch(self, entry):
+        generation = self._generation
+        try:
+            value = await entry.fetch()
+        except Exception as e:
+            value = {"error": str(e)}
+        # a failed refresh keeps the last good value
+        if _is_error(value):
+            if value["error"] != entry.error:
+                print(f"Warning: state mirror refresh of {entry.name} failed: {value['error']}")
+            entry.error = value["error"]
+            if entry.value is None:
+                return value
+            return entry.value
+        if generation != self._generation:
+            # invalidated while in flight: the value may predate the change,
+            # so it is only kept if there is nothing else to serve
+            if entry.value is None:
+                entry.value = value
+            return value
+        entry.value = value
+        entry.updated_at = time.monotonic()
+        entry.updated_at_epoch = time.time()
+        entry.error = None
+        for listener in self._listeners:
+            try:
+                listener(entry.name, value)
+            except Exception:
+                pass
+        return value
+
+    def _refresh(self, entry):
+        """Start (or join) the refresh of entry; refreshes are shared and deadline free"""
+        if entry.refreshing is None or entry.refreshing.done():
+            entry.refreshing = contextvars.Context().run(asyncio.ensure_future, self._fetch(entry))
+        return entry.refreshing
+
+    async def refresh(self, name):
+        task = self._refresh(self._entries[name])
+        # each reader waits only as long as its own deadline allows
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded()
+
+    async def get(self, name, max_staleness: float=None):
+        """
+        Mirrored value of a resource.
+
+        Args:
+            max_staleness: Maximum accepted age in seconds (0 forces a
+                refresh). Defaults to twice the refresh interval.
+        """
+        entry = self._entries[name]
+        if max_staleness is None:
+            max_staleness = 2 * entry.interval
+        age = entry.age()
+        if age is not None and age <= max_staleness:
+            return entry.value
+        return await self.refresh(name)
+
+    def peek(self, name):
+        """Mirrored value of a resource as it is (None until first read), never refreshed"""
+        return self._entries[name].value
+
+    def add_listener(self, listener):
+        """listener(name, value) is called after every successful refresh"""
+        self._listeners.append(listener)
+
+    def updated_at(self, name):
+        """Unix time of the last successful refresh of a resource"""
+        return self._entries[name].updated_at_epoch
+
+    def invalidate(self):
+        """Mark every resource stale: the next read waits for fresh data"""
+        self._generation += 1
+        for entry in self._entries.values():
+            entry.updated_at = None
+            entry.refreshing = None
+
+    async def _loop(self, entry, delay):
+        await asyncio.sleep(delay)
+        while True:
+            await self._refresh(entry)
+            await asyncio.sleep(entry.interval)
+
+    def start(self):
+        if len(self._loops) > 0:
+            return
+        entries = list(self._entries.values())
+        for i, entry in enumerate(entries):
+            # stagger the first refresh of each resource across its interval
+            delay = entry.interval * i / len(entries)
+            self._loops.append(
+                contextvars.Context().run(asyncio.ensure_future, self._loop(entry, delay))
+            )
+
+    async def stop(self):
+        for loop in self._loops:
+            loop.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+    def stats(self):
+        # no error text: served by /health, unauthenticated (errors are logged)
+        return {
+            name: {
+                "age": None if entry.age() is None else round(entry.age(), 1),
+                "interval": entry.interval,
+                "failing": entry.error is not None
+            }
+            for name, entry in self._entries.items()
+        }
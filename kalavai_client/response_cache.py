@@ -0,0 +1,135 @@
+"""
+TTL + single-flight cache for bridge API read endpoints.
+
+Results are keyed by (endpoint, normalised arguments), where the arguments
+are the effective ones after ringfence / forced namespace rules have been
+applied. Concurrent identical requests share one in-flight upstream call
+(single-flight), which runs free of any caller's deadline: each caller
+only bounds its own wait. Mutating endpoints call invalidate() so the
+next read goes to the watcher; calls in flight at that point are not
+cached.
+"""
+import asyncio
+import contextvars
+import json
+import time
+from collections import OrderedDict
+
+from kalavai_client.deadline import remaining_time, DeadlineExceeded
+
+
+RESPONSE_CACHE_SIZE = 256
+
+
+def parse_endpoint_ttls(value):
+    """Parse "endpoint=seconds,endpoint=seconds" into a dict"""
+    ttls = {}
+    if not value:
+        return ttls
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        endpoint, ttl = pair.split("=", 1)
+        endpoint = endpoint.strip()
+        ttls["/" + endpoint.lstrip("/")] = float(ttl)
+    return ttls
+
+
+class ResponseCache():
+    """
+    In-process cache of endpoint results with per-endpoint TTLs.
+
+    Cached results are shared between callers and must be treated as
+    read-only. Results that are error dicts are never cached.
+    """
+
+    def __init__(self, default_ttl: float=0, endpoint_ttls: dict=None, max_entries: int=RESPONSE_CACHE_SIZE):
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(endpoint, params=None):
+        return (endpoint, json.dumps(params, sort_keys=True, default=str))
+
+    def ttl(self, endpoint):
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def _store(self, key, generation, result):
+        # an invalidation while the call was in flight makes the result stale
+        if generation != self._generation:
+            return
+        if isinstance(result, dict) and "error" in result:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl(key[0]), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(self, endpoint, params, fetch):
+        """
+        Return the cached result for (endpoint, params), or await fetch().
+
+        Args:
+            endpoint: API endpoint (selects the TTL)
+            params: JSON serialisable arguments that determine the result
+            fetch: Coroutine function that computes the result
+        """
+        if self.ttl(endpoint) <= 0:
+            return await fetch()
+
+        key = self.key(endpoint, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return result
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["misses"] += 1
+            generation = self._generation
+
+            def _done(task):
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                if not task.cancelled() and task.exception() is None:
+                    self._store(key, generation, task.result())
+
+            # the shared call runs without the deadline of whoever started it
+            task = contextvars.Context().run(asyncio.ensure_future, fetch())
+            task.add_done_callback(_done)
+            self._inflight[key] = task
+        # each caller waits only as long as its own deadline allows; a caller
+        # that gives up (or is cancelled) does not cancel the shared call
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded()
+
+    def invalidate(self):
+        """Drop every cached result (and ignore the results of calls in flight)"""
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()
+        self._stats["invalidations"] += 1
+
+    def stats(self):
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_ratio": round((self._stats["hits"] + self._stats["coalesced"]) / lookups, 3) if lookups > 0 else 0
+        }
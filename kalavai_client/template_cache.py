@@ -0,0 +1,130 @@
+"""
+On-disk cache of Helm chart metadata (values, schema, chart info).
+
+Entries live under the user templates folder, keyed by (repo, chart,
+version):
+
+    <folder>/<repo>/<chart>/<version>/<kind>.json
+
+The current version of each chart comes from the repo index as returned by
+the watcher (helm repo search). When the digest of a repo index changes,
+every cached entry of that repo is dropped.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+
+INDEX_FILE = "index.json"
+
+
+def _digest(charts):
+    payload = json.dumps(charts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _safe(name):
+    return name.replace(os.sep, "_").replace("..", "_")
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class TemplateCache():
+    def __init__(self, folder):
+        self.folder = folder
+        self._index = None
+        self._index_mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.folder, INDEX_FILE)
+
+    def _load_index(self):
+        # reload only when another process has rewritten the index
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            return {}
+        if self._index is None or mtime != self._index_mtime:
+            try:
+                with open(self.index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index_mtime = mtime
+        return self._index
+
+    def _save_index(self, index):
+        _write_json(self.index_path, index)
+        self._index = index
+        self._index_mtime = os.path.getmtime(self.index_path)
+
+    @staticmethod
+    def split_name(template_name):
+        """'repo/chart' -> (repo, chart); None if the name has no repo"""
+        repo, _, chart = template_name.rpartition("/")
+        if repo == "" or chart == "":
+            return None
+        return repo, chart
+
+    def _entry_path(self, repo, chart, version, kind):
+        return os.path.join(self.folder, _safe(repo), _safe(chart), _safe(str(version)), f"{kind}.json")
+
+    def update_index(self, repo, charts):
+        """
+        Record the charts of a repo (helm repo search results).
+
+        Returns:
+            True if the repo index changed (and its cached entries were dropped)
+        """
+        charts = [c for c in charts if isinstance(c, dict) and str(c.get("name", "")).startswith(f"{repo}/")]
+        digest = _digest(charts)
+        with self._lock:
+            index = dict(self._load_index())
+            previous = index.get(repo)
+            if previous is not None and previous["digest"] == digest:
+                return False
+            shutil.rmtree(os.path.join(self.folder, _safe(repo)), ignore_errors=True)
+            index[repo] = {
+                "digest": digest,
+                "charts": {c["name"].rpartition("/")[2]: c.get("version") for c in charts}
+            }
+            self._save_index(index)
+            return True
+
+    def version(self, template_name):
+        name = self.split_name(template_name)
+        if name is None:
+            return None
+        repo, chart = name
+        with self._lock:
+            return self._load_index().get(repo, {}).get("charts", {}).get(chart)
+
+    def get(self, template_name, kind):
+        """Cached data for the current version of the chart, or None"""
+        version = self.version(template_name)
+        if version is None:
+            return None
+        repo, chart = self.split_name(template_name)
+        try:
+            with open(self._entry_path(repo, chart, version, kind)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, template_name, kind, data):
+        version = self.version(template_name)
+        if version is None or (isinstance(data, dict) and "error" in data):
+            return
+        repo, chart = self.split_name(template_name)
+        try:
+            _write_json(self._entry_path(repo, chart, version, kind), data)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""
+Cache of hourly usage rows for closed days.
+
+Rows of logs.hourly_resource_usage_mv for an hour that is over never
+change, so once read the hours of a whole (UTC) day that is over are kept
+per (scope, entity, day), e.g. ("user", "user-1", 2026-05-26), as
+{hour: rows} of the hours with rows: hours without rows take no space and
+a day without rows is a single entry. Only days missing from the cache,
+the partial days at the ends of a window and open hours are read from
+ClickHouse.
+
+Memory use is bounded by a number of rows, least recently used entries
+first out. With a spill path, evicted entries go to an SQLite file and
+are read back from there on a miss.
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def floor_hour(value: datetime):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+def ceil_hour(value: datetime):
+    floor = floor_hour(value)
+    return floor if floor == value else floor + HOUR
+
+def floor_day(value: datetime):
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def ceil_day(value: datetime):
+    floor = floor_day(value)
+    return floor if floor == value else floor + DAY
+
+def as_utc(value: datetime):
+    """Naive UTC datetime (ClickHouse may return zone aware values)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def day_range(start: datetime, end: datetime):
+    """Whole days within [start, end)"""
+    days = []
+    day = ceil_day(start)
+    while day + DAY <= end:
+        days.append(day)
+        day += DAY
+    return days
+
+def merge_ranges(ranges, max_ranges):
+    """Sorted [start, end) ranges (end None: open) -> adjacent ones merged; merged into one past max_ranges"""
+    merged = []
+    for start, end in ranges:
+        if len(merged) > 0 and merged[-1][1] == start:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    if len(merged) > max_ranges:
+        merged = [[merged[0][0], merged[-1][1]]]
+    return [tuple(r) for r in merged]
+
+
+class ClosedHourCache():
+    def __init__(self, max_rows: int, spill_path: str=None):
+        """
+        Args:
+            max_rows: Rows kept in memory (each entry counts at least one)
+            spill_path: Optional SQLite file for the entries evicted from memory
+        """
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._spill = None
+        if spill_path:
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False)
+            self._spill.execute(
+                "CREATE TABLE IF NOT EXISTS days (scope TEXT, entity TEXT, day INTEGER, hours TEXT, PRIMARY KEY (scope, entity, day))"
+            )
+            self._spill.commit()
+
+    @staticmethod
+    def _timestamp(value):
+        return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+    @classmethod
+    def _key(cls, scope, entity, day):
+        return scope, entity, cls._timestamp(day)
+
+    @staticmethod
+    def _weight(hours):
+        return max(1, sum(len(rows) for rows in hours.values()))
+
+    def _read_spill(self, key):
+        if self._spill is None:
+            return None
+        found = self._spill.execute("SELECT hours FROM days WHERE scope = ? AND entity = ? AND day = ?", key).fetchone()
+        if found is None:
+            return None
+        return {
+            datetime.fromtimestamp(hour, timezone.utc).replace(tzinfo=None): [tuple(row) for row in rows]
+            for hour, rows in json.loads(found[0])
+        }
+
+    def _evict(self):
+        spilled = []
+        while self._rows > self.max_rows and len(self._entries) > 0:
+            key, hours = self._entries.popitem(last=False)
+            self._rows -= self._weight(hours)
+            spilled.append((*key, json.dumps([[self._timestamp(hour), rows] for hour, rows in hours.items()])))
+        if self._spill is not None and len(spilled) > 0:
+            self._spill.executemany("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)", spilled)
+            self._spill.commit()
+
+    def get(self, scope, entity, day):
+        """{hour: rows} of the hours with rows of a closed day (possibly empty), or None if not cached"""
+        key = self._key(scope, entity, day)
+        with self._lock:
+            hours = self._entries.get(key)
+            if hours is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return hours
+            hours = self._read_spill(key)
+            if hours is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries[key] = hours
+            self._rows += self._weight(hours)
+            self._evict()
+            return hours
+
+    def put(self, scope, entity, day, hours):
+        key = self._key(scope, entity, day)
+        hours = {hour: [tuple(row) for row in rows] for hour, rows in hours.items() if len(rows) > 0}
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= self._weight(previous)
+            self._entries[key] = hours
+            self._rows += self._weight(hours)
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            spilled = 0 if self._spill is None else self._spill.execute("SELECT COUNT(*) FROM days").fetchone()[0]
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "spilled": spilled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": 0 if total == 0 else round(self._hits / total, 3)
+            }
@@ -1,8 +1,16 @@
 import json, base64
 import os
 import uuid
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
 from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel
 import shutil
 import subprocess
 import re
@@ -13,6 +21,16 @@ from jinja2 import Template
 from rich.table import Table
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
 import kalavai_client
 from kalavai_client.auth import KalavaiAuth
 from kalavai_client.env import (
@@ -27,9 +45,28 @@ from kalavai_client.env import (
     FORCE_WATCHER_API_KEY_URL,
     FORCE_WATCHER_API_URL,
     USER_LOCAL_SERVER_FILE,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_BLOCK,
+    FAN_OUT_MAX_WORKERS,
+    WATCHER_HTTP2,
+    COMPRESSION_ENABLED,
+    FAST_JSON,
     user_path
 )
 from kalavai_client.api_models import TokenType
+from kalavai_client.breaker import guarded_call
+from kalavai_client.deadline import (
+    DEADLINE_HEADER,
+    deadline_to_epoch,
+    effective_timeout
+)
+from kalavai_client.etag import ETagCache
+from kalavai_client.compression import (
+    accept_encoding_header,
+    compress_request_body,
+    decode_content
+)
 
 
 GITHUB_ORG = "kalavai-net"
@@ -81,6 +118,28 @@ KALAVAI_AUTH = KalavaiAuth(
     user_cookie_file=USER_COOKIE
 )
 
+# keep-alive sessions shared across threads, one per base URL
+_HTTP_SESSIONS = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+# HTTP/2 clients to the watcher, one per base URL, and the watchers that
+# turned out to only speak HTTP/1.1
+USE_WATCHER_HTTP2 = WATCHER_HTTP2 and h2 is not None
+_HTTP2_CLIENTS = {}
+_HTTP2_CONFIRMED = set()
+_HTTP1_ONLY = set()
+# how an HTTP/1.1-only server reacts to the h2c connection preface
+HTTP2_NEGOTIATION_ERRORS = (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)
+HTTP2_RESEND_ATTEMPTS = 3
+# shared workers for concurrent watcher sub-calls
+_FAN_OUT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=FAN_OUT_MAX_WORKERS,
+    thread_name_prefix="kalavai-fan-out"
+)
+# last body per bridge API request, revalidated with If-None-Match
+API_ETAG_CACHE = ETagCache()
+# fast JSON backend (opt-in, needs orjson)
+USE_ORJSON = FAST_JSON and orjson is not None
+
 
 ####### Methods to check OS compatibility ########
 def check_gpu_drivers():
@@ -231,13 +290,118 @@ def generate_compose_config(
     return compose_yaml
 
 
+class ServerConfig():
+    """
+    In-memory view of a local server credentials file (.server).
+
+    The file is parsed once and only re-read when its inode, mtime or size
+    change, so hot paths can read credentials without any file I/O.
+    """
+    _UNLOADED = object()
+
+    def __init__(self, file: str):
+        self.file = file
+        self._lock = threading.Lock()
+        self._stamp = self._UNLOADED
+        self._data = {}
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.file)
+            return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def load(self) -> dict:
+        """Return the parsed file contents, reloading them if the file changed"""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return self._data
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    with open(self.file, "r") as f:
+                        self._data = json.load(f)
+                except Exception as e:
+                    print(f"Warning: error when loading server info: {str(e)}")
+                    self._data = {}
+                self._stamp = stamp
+        return self._data
+
+    def invalidate(self):
+        """Force a reload on next access"""
+        with self._lock:
+            self._stamp = self._UNLOADED
+
+    def get(self, data_key: str, default=None):
+        return self.load().get(data_key, default)
+
+    @property
+    def server_ip(self) -> Optional[str]:
+        return self.get(SERVER_IP_KEY)
+
+    @property
+    def auth_key(self) -> Optional[str]:
+        return self.get(AUTH_KEY)
+
+    @property
+    def readonly_auth_key(self) -> Optional[str]:
+        return self.get(READONLY_AUTH_KEY)
+
+    @property
+    def write_auth_key(self) -> Optional[str]:
+        return self.get(WRITE_AUTH_KEY)
+
+    @property
+    def watcher_service(self) -> Optional[str]:
+        return self.get(WATCHER_SERVICE_KEY)
+
+    @property
+    def node_name(self) -> Optional[str]:
+        return self.get(NODE_NAME_KEY)
+
+    @property
+    def cluster_name(self) -> Optional[str]:
+        return self.get(CLUSTER_NAME_KEY)
+
+    @property
+    def cluster_token(self) -> Optional[str]:
+        return self.get(CLUSTER_TOKEN_KEY)
+
+    @property
+    def public_location(self) -> Optional[str]:
+        return self.get(PUBLIC_LOCATION_KEY)
+
+    @property
+    def user_api_key(self) -> Optional[str]:
+        return self.get(USER_API_KEY)
+
+    @property
+    def kalavai_api_url(self) -> Optional[str]:
+        return self.get(KALAVAI_API_URL_KEY)
+
+    @property
+    def kalavai_api_key(self) -> Optional[str]:
+        return self.get(KALAVAI_API_KEY_KEY)
+
+
+_SERVER_CONFIGS = {}
+_SERVER_CONFIGS_LOCK = threading.Lock()
+
+def get_server_config(file=USER_LOCAL_SERVER_FILE) -> ServerConfig:
+    """Get the process-wide ServerConfig for a credentials file"""
+    config = _SERVER_CONFIGS.get(file)
+    if config is not None:
+        return config
+    with _SERVER_CONFIGS_LOCK:
+        if file not in _SERVER_CONFIGS:
+            _SERVER_CONFIGS[file] = ServerConfig(file=file)
+    return _SERVER_CONFIGS[file]
+
+SERVER_CONFIG = get_server_config(USER_LOCAL_SERVER_FILE)
+
 def load_server_info(data_key, file):
-    try:
-        with open(file, "r") as f:
-            return json.load(f)[data_key]
-    except Exception as e:
-        print(f"Warning: error when loading server info: {str(e)}")
-        return None
+    return get_server_config(file).get(data_key)
 
 def load_user_session():
     if KALAVAI_USER_ID is None:
@@ -298,11 +462,113 @@ def has_api_details():
     Required when using the CLI
     """
     return all([cred is not None for cred in [
-        load_server_info(data_key=KALAVAI_API_URL_KEY, file=USER_LOCAL_SERVER_FILE),
-        load_server_info(data_key=KALAVAI_API_KEY_KEY, file=USER_LOCAL_SERVER_FILE)
+        SERVER_CONFIG.kalavai_api_url,
+        SERVER_CONFIG.kalavai_api_key
     ]])
 
     
+def get_http_session(base_url):
+    """
+    Get the keep-alive session used for all requests to base_url.
+
+    Sessions are created once per base URL and shared between threads, so
+    repeated calls reuse pooled connections instead of opening a new one.
+
+    Args:
+        base_url: Scheme and host of the target service (e.g. http://host:port)
+
+    Returns:
+        requests.Session bound to a pooled HTTPAdapter
+    """
+    session = _HTTP_SESSIONS.get(base_url)
+    if session is not None:
+        return session
+    with _HTTP_SESSIONS_LOCK:
+        session = _HTTP_SESSIONS.get(base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                pool_block=HTTP_POOL_BLOCK
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _HTTP_SESSIONS[base_url] = session
+    return session
+
+def get_http2_client(base_url):
+    """
+    Get the HTTP/2 client used for watcher requests to base_url.
+
+    The watcher is plain http, so the client speaks h2c with prior
+    knowledge: concurrent calls are multiplexed over a single connection.
+    """
+    client = _HTTP2_CLIENTS.get(base_url)
+    if client is not None:
+        return client
+    with _HTTP_SESSIONS_LOCK:
+        client = _HTTP2_CLIENTS.get(base_url)
+        if client is None:
+            client = httpx.Client(
+                http1=False,
+                http2=True,
+                limits=httpx.Limits(max_connections=HTTP_POOL_CONNECTIONS)
+            )
+            _HTTP2_CLIENTS[base_url] = client
+    return client
+
+def uses_http2(base_url):
+    return USE_WATCHER_HTTP2 and base_url not in _HTTP1_ONLY
+
+def confirm_http2(base_url):
+    _HTTP2_CONFIRMED.add(base_url)
+
+def is_unsent_request(error):
+    """
+    Whether a failed HTTP/2 request never reached the watcher and is safe to
+    resend on a new connection: refused by a graceful GOAWAY, or failed while
+    writing to a connection the server already closed.
+    """
+    if isinstance(error, httpx.WriteError):
+        return True
+    return isinstance(error, httpx.RemoteProtocolError) and "ConnectionTerminated error_code:0," in str(error)
+
+def handle_http2_error(base_url, error, attempt):
+    """
+    Decide what to do after an HTTP/2 request to the watcher failed.
+
+    Returns:
+        True to resend over HTTP/2, False to continue over HTTP/1.1
+        (errors from a watcher known to speak HTTP/2 are re-raised)
+    """
+    if base_url in _HTTP2_CONFIRMED and is_unsent_request(error) and attempt + 1 < HTTP2_RESEND_ATTEMPTS:
+        return True
+    fall_back_to_http1(base_url, error)
+    return False
+
+def fall_back_to_http1(base_url, error):
+    """
+    Stop using HTTP/2 for a watcher that does not speak it.
+
+    Errors from a watcher that already answered over HTTP/2 are real
+    failures and are re-raised.
+    """
+    if base_url in _HTTP2_CONFIRMED:
+        raise error
+    print(f"Warning: HTTP/2 not available at {base_url} ({repr(error)}), falling back to HTTP/1.1")
+    _HTTP1_ONLY.add(base_url)
+
+def close_http_sessions():
+    """Close all pooled sessions (and their open connections)"""
+    with _HTTP_SESSIONS_LOCK:
+        for session in _HTTP_SESSIONS.values():
+            session.close()
+        _HTTP_SESSIONS.clear()
+        for client in _HTTP2_CLIENTS.values():
+            client.close()
+        _HTTP2_CLIENTS.clear()
+
 def request_to_api(
     method,
     endpoint,
@@ -314,45 +580,174 @@ def request_to_api(
     
     Could be local or remote, reference in the server_creds file
     """
-    api_url = load_server_info(data_key=KALAVAI_API_URL_KEY, file=USER_LOCAL_SERVER_FILE)
-    api_key = load_server_info(data_key=KALAVAI_API_KEY_KEY, file=USER_LOCAL_SERVER_FILE)
+    api_url = SERVER_CONFIG.kalavai_api_url
+    api_key = SERVER_CONFIG.kalavai_api_key
 
     headers = {
         "X-API-KEY": api_key
     }
+    cache_key = API_ETAG_CACHE.key(
+        method,
+        f"{api_url}{endpoint}",
+        params=kwargs.get("params"),
+        data=kwargs.get("json")
+    )
+    cached = API_ETAG_CACHE.get(cache_key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+    if COMPRESSION_ENABLED:
+        headers["Accept-Encoding"] = accept_encoding_header()
+        if kwargs.get("json") is not None:
+            # the bridge API decompresses request bodies (CompressionMiddleware)
+            body, encoding = compress_request_body(json.dumps(kwargs.pop("json")).encode())
+            kwargs["data"] = body
+            headers["Content-Type"] = "application/json"
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
 
-    response = requests.request(
+    response = get_http_session(api_url).request(
         method=method,
         url=f"{api_url}{endpoint}",
         headers=headers,
         timeout=timeout,
         **kwargs
     )
+    if response.status_code == 304 and cached is not None:
+        return cached[1]
+    result = parse_json_response(response)
+    etag = response.headers.get("ETag")
+    if etag is not None:
+        API_ETAG_CACHE.store(cache_key, etag, result)
+    return result
+
+def stream_from_api(
+    endpoint,
+    timeout=60,
+    **kwargs
+):
+    """
+    Iterate over the records of a newline delimited JSON stream of the
+    Kalavai backend API (GET). Blank keep-alive lines are skipped.
+
+    Args:
+        timeout: Seconds to wait for the connection and for each line
+    """
+    api_url = SERVER_CONFIG.kalavai_api_url
+    headers = {
+        "X-API-KEY": SERVER_CONFIG.kalavai_api_key
+    }
+    with get_http_session(api_url).get(
+        url=f"{api_url}{endpoint}",
+        headers=headers,
+        timeout=timeout,
+        stream=True,
+        **kwargs
+    ) as response:
+        if response.status_code != 200:
+            yield parse_json_response(response)
+            return
+        for line in response.iter_lines():
+            if line:
+                yield json_loads(line)
+
+
+def fan_out(calls):
+    """
+    Run independent calls concurrently (at most FAN_OUT_MAX_WORKERS at a time).
+
+    Each call runs in a copy of the caller's context. A call that raises
+    does not affect the others: its exception is returned in place of
+    its result.
+
+    Args:
+        calls: List of callables that take no arguments
+
+    Returns:
+        List of results (or exceptions), in the same order as calls
+    """
+    if len(calls) == 1:
+        try:
+            return [calls[0]()]
+        except Exception as e:
+            return [e]
+    futures = [
+        _FAN_OUT_EXECUTOR.submit(contextvars.copy_context().run, call)
+        for call in calls
+    ]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+async def fan_out_async(calls, max_concurrency=FAN_OUT_MAX_WORKERS):
+    """
+    Async counterpart of fan_out.
+
+    Args:
+        calls: List of callables that return an awaitable
+        max_concurrency: Maximum number of calls awaited at the same time
+
+    Returns:
+        List of results (or exceptions), in the same order as calls
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(
+        *[_bounded(call) for call in calls],
+        return_exceptions=True
+    )
+
+def json_loads(content):
+    """Decode JSON bytes / str with orjson when the fast backend is enabled"""
+    if USE_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _model_to_dict(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(content) -> bytes:
+    """Encode content (which may contain pydantic models) to JSON bytes"""
+    if USE_ORJSON:
+        return orjson.dumps(content, default=_model_to_dict, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_model_to_dict, separators=(",", ":")).encode("utf-8")
+
+def parse_json_response(response):
+    """Decode the JSON body of a requests / httpx response"""
     try:
-        result = response.json()
+        content = decode_content(
+            response.content,
+            response.headers.get("Content-Encoding")
+        )
+        result = json_loads(content)
         return result
     except Exception as e:
         raise ValueError(f"Error with HTTP request: {response.text}\n{str(e)}")
 
+def get_watcher_target(server_creds, force_url=None, force_key=None):
+    """
+    Resolve the watcher base URL and request headers.
 
-def request_to_server(
-    method,
-    endpoint,
-    server_creds,
-    data=None,
-    params=None,
-    force_url=None,
-    force_key=None,
-    user_cookie=None,
-    timeout=60
-):
+    Returns:
+        tuple: (base_url, headers)
+    """
+    server_config = get_server_config(server_creds)
     if force_url is None:
-        service_url = load_server_info(data_key=WATCHER_SERVICE_KEY, file=server_creds)
+        service_url = server_config.watcher_service
     else:
         service_url = force_url
     
     if force_key is None:
-        auth_key = load_server_info(data_key=AUTH_KEY, file=server_creds)
+        auth_key = server_config.auth_key
     else:
         auth_key = force_key
 
@@ -360,24 +755,62 @@ def request_to_server(
         "X-API-KEY": auth_key
     }
 
-    headers["USER-KEY"] = load_server_info(data_key=USER_API_KEY, file=server_creds)
+    headers["USER-KEY"] = server_config.user_api_key
     user_id = load_user_id()
     if user_id is not None:
         headers["USER"] = user_id
 
-    response = requests.request(
+    return f"http://{service_url}", headers
+
+def request_to_server(
+    method,
+    endpoint,
+    server_creds,
+    data=None,
+    params=None,
+    force_url=None,
+    force_key=None,
+    user_cookie=None,
+    timeout=60
+):
+    base_url, headers = get_watcher_target(
+        server_creds=server_creds,
+        force_url=force_url,
+        force_key=force_key
+    )
+    if COMPRESSION_ENABLED:
+        headers["Accept-Encoding"] = accept_encoding_header()
+    deadline = deadline_to_epoch()
+    if deadline is not None:
+        headers[DEADLINE_HEADER] = f"{deadline:.3f}"
+    def _send():
+        request = dict(
+            method=method,
+            url=f"{base_url}{endpoint}",
+            json=data,
+            params=params,
+            headers={k: v for k, v in headers.items() if v is not None},
+            timeout=effective_timeout(timeout)
+        )
+        if uses_http2(base_url):
+            for attempt in range(HTTP2_RESEND_ATTEMPTS):
+                try:
+                    response = get_http2_client(base_url).request(**request)
+                    confirm_http2(base_url)
+                    return response
+                except HTTP2_NEGOTIATION_ERRORS as e:
+                    if handle_http2_error(base_url, e, attempt):
+                        continue
+                    break
+        return get_http_session(base_url).request(**request)
+
+    response = guarded_call(
+        endpoint=endpoint,
         method=method,
-        url=f"http://{service_url}{endpoint}",
-        json=data,
-        params=params,
-        headers=headers,
-        timeout=timeout
+        send=_send,
+        transport_errors=(requests.ConnectionError, requests.Timeout, httpx.TransportError)
     )
-    try:
-        result = response.json()
-        return result
-    except Exception as e:
-        raise ValueError(f"Error with HTTP request: {response.text}\n{str(e)}")
+    return parse_json_response(response)
 
 
 def generate_table(columns, rows, end_sections=None):
@@ -419,6 +852,7 @@ def store_server_info(
             KALAVAI_API_URL_KEY: kalavai_api_url,
             KALAVAI_API_KEY_KEY: kalavai_api_key
         }, f)
+    get_server_config(file).invalidate()
     return True
 
 def populate_template(template_str, values_dict):
@@ -0,0 +1,135 @@
+"""
+Async client for the kube-watcher API.
+
+Sends the /v1 calls of the kalavai_client.core watcher operations (see
+watcher_operation) so the bridge API can serve requests from the event
+loop instead of blocking worker threads.
+"""
+import httpx
+
+from kalavai_client.breaker import guarded_call_async
+from kalavai_client.compression import accept_encoding_header
+from kalavai_client.deadline import (
+    DEADLINE_HEADER,
+    deadline_to_epoch,
+    effective_timeout
+)
+from kalavai_client.utils import (
+    get_watcher_target,
+    parse_json_response,
+    uses_http2,
+    confirm_http2,
+    handle_http2_error,
+    HTTP2_NEGOTIATION_ERRORS,
+    HTTP2_RESEND_ATTEMPTS
+)
+from kalavai_client.env import (
+    USER_LOCAL_SERVER_FILE,
+    FORCE_WATCHER_API_URL,
+    FORCE_WATCHER_API_KEY_URL,
+    HTTP_POOL_MAXSIZE,
+    COMPRESSION_ENABLED
+)
+
+
+class AsyncWatcherClient():
+    """Pooled asyncio client for the kube-watcher service."""
+
+    def __init__(
+        self,
+        server_creds: str=USER_LOCAL_SERVER_FILE,
+        force_url: str=FORCE_WATCHER_API_URL,
+        force_key: str=FORCE_WATCHER_API_KEY_URL,
+        timeout: float=60,
+        max_connections: int=HTTP_POOL_MAXSIZE
+    ):
+        """Initialise the client. The underlying connection pool is created on first use.
+
+        Args:
+            server_creds: Local credentials file with the watcher details
+            force_url: Watcher address (host:port) to use instead of the one in server_creds
+            force_key: Watcher API key to use instead of the one in server_creds
+            timeout: Default timeout (seconds) per request
+            max_connections: Maximum number of open connections to the watcher
+        """
+        self.server_creds = server_creds
+        self.force_url = force_url
+        self.force_key = force_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._http2_client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self.timeout
+            )
+        return self._client
+
+    def _get_http2_client(self) -> httpx.AsyncClient:
+        # h2c with prior knowledge: calls are multiplexed over one connection
+        if self._http2_client is None or self._http2_client.is_closed:
+            self._http2_client = httpx.AsyncClient(
+                http1=False,
+                http2=True,
+                timeout=self.timeout
+            )
+        return self._http2_client
+
+    async def aclose(self):
+        """Close the connection pools"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
+
+    async def _send(self, base_url, **request):
+        if uses_http2(base_url):
+            for attempt in range(HTTP2_RESEND_ATTEMPTS):
+                try:
+                    response = await self._get_http2_client().request(**request)
+                    confirm_http2(base_url)
+                    return response
+                except HTTP2_NEGOTIATION_ERRORS as e:
+                    if handle_http2_error(base_url, e, attempt):
+                        continue
+                    break
+        return await self._get_client().request(**request)
+
+    async def request(self, method, endpoint, data=None, params=None, timeout=None):
+        """Async equivalent of kalavai_client.utils.request_to_server"""
+        base_url, headers = get_watcher_target(
+            server_creds=self.server_creds,
+            force_url=self.force_url,
+            force_key=self.force_key
+        )
+        if COMPRESSION_ENABLED:
+            headers["Accept-Encoding"] = accept_encoding_header()
+        deadline = deadline_to_epoch()
+        if deadline is not None:
+            headers[DEADLINE_HEADER] = f"{deadline:.3f}"
+        response = await guarded_call_async(
+            endpoint=endpoint,
+            method=method,
+            send=lambda: self._send(
+                base_url,
+                method=method,
+                url=f"{base_url}{endpoint}",
+                json=data,
+                params=params,
+                headers={k: v for k, v in headers.items() if v is not None},
+                timeout=effective_timeout(self.timeout if timeout is None else timeout)
+            ),
+            transport_errors=(httpx.TransportError,)
+        )
+        return parse_json_response(response)
+
+
+ASYNC_WATCHER = AsyncWatcherClient()
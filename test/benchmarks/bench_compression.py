@@ -0,0 +1,100 @@
+"""
+Bytes on the wire and latency of negotiated response compression.
+
+Serves a synthetic pool of N jobs (shaped like /fetch_job_details output)
+from a local FastAPI app behind CompressionMiddleware, and fetches it with
+each Accept-Encoding the clients can send.
+
+    python test/benchmarks/bench_compression.py --jobs 500 --calls 50
+"""
+import json
+import socket
+import threading
+import time
+from argparse import ArgumentParser
+
+import requests
+import uvicorn
+from fastapi import FastAPI
+
+from kalavai_client.compression import (
+    CompressionMiddleware,
+    decode_content,
+    decompress,
+    supported_encodings
+)
+
+
+def synthetic_jobs(n_jobs):
+    jobs = []
+    for i in range(n_jobs):
+        jobs.append({
+            "owner": "default",
+            "name": f"vllm-deployment-{i}",
+            "workers": f"{i % 4}/{i % 4 + 1}",
+            "endpoint": f"http://10.0.{i % 255}.{i % 17}:{30000 + i}",
+            "status": "running" if i % 3 else "pending",
+            "host_nodes": f"worker-node-{i % 40} worker-node-{(i + 1) % 40}",
+            "conditions": [
+                {"type": "Ready", "status": "True", "reason": "PodReady", "message": ""},
+                {"type": "Scheduled", "status": "True", "reason": "Scheduled", "message": ""}
+            ]
+        })
+    return jobs
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def fetch(session, url, encoding):
+    headers = {"Accept-Encoding": encoding}
+    start = time.perf_counter()
+    response = session.get(url, headers=headers, stream=True)
+    raw = response.raw.read(decode_content=False)
+    content_encoding = response.headers.get("Content-Encoding")
+    if content_encoding in supported_encodings():
+        body = decompress(raw, content_encoding)
+    else:
+        body = decode_content(raw, content_encoding)
+    json.loads(body)
+    return len(raw), (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--jobs", default=500, type=int)
+    parser.add_argument("--calls", default=50, type=int)
+    parser.add_argument("--min-size", default=1024, type=int)
+    args = parser.parse_args()
+
+    payload = synthetic_jobs(args.jobs)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=args.min_size)
+
+    @app.get("/fetch_job_details")
+    def fetch_job_details():
+        return payload
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    url = f"http://127.0.0.1:{port}/fetch_job_details"
+    session = requests.Session()
+    try:
+        print(f"jobs: {args.jobs}  calls per encoding: {args.calls}")
+        print(f"{'encoding':<10}{'bytes':>10}{'ratio':>8}{'ms/call':>10}")
+        baseline = None
+        for encoding in ["identity"] + supported_encodings():
+            fetch(session, url, encoding)
+            timings = [fetch(session, url, encoding) for _ in range(args.calls)]
+            size = timings[0][0]
+            latency = sum(t for _, t in timings) / len(timings)
+            baseline = baseline or size
+            print(f"{encoding:<10}{size:>10}{baseline / size:>8.1f}{latency:>10.3f}")
+    finally:
+        session.close()
+        server.should_exit = True
@@ -0,0 +1,125 @@
+"""
+Fan-out latency to the watcher over HTTP/1.1 (pooled) and HTTP/2 (h2c).
+
+Starts a local h2-capable stand-in watcher (hypercorn) that answers every
+call after a fixed latency, then runs rounds of concurrent calls through
+request_to_server (fan_out) and AsyncWatcherClient in both modes. Reports
+the time per round and the number of connections the watcher saw.
+
+Requires h2 and hypercorn:
+
+    python test/benchmarks/bench_http2.py --concurrency 32 --rounds 20
+"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+from functools import partial
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+import kalavai_client.utils as utils
+from kalavai_client.utils import request_to_server, fan_out, close_http_sessions
+from kalavai_client.watcher import AsyncWatcherClient
+
+
+class StandInWatcher():
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.connections.add(tuple(scope["client"]))
+        more_body = True
+        while more_body:
+            more_body = (await receive()).get("more_body", False)
+        await asyncio.sleep(self.latency)
+        body = json.dumps({"status": "ok"}).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def start_watcher(app, port):
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "ERROR"
+    # keep one connection for the whole run (no GOAWAY recycling)
+    config.keep_alive_max_requests = 10 ** 9
+    stop = asyncio.Event()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(
+        target=lambda: loop.run_until_complete(serve(app, config, shutdown_trigger=stop.wait)),
+        daemon=True
+    )
+    thread.start()
+    time.sleep(0.5)
+    return lambda: loop.call_soon_threadsafe(stop.set)
+
+def sync_round(service, creds, concurrency):
+    call = partial(
+        request_to_server,
+        method="post",
+        endpoint="/v1/fetch_nodes",
+        data={},
+        server_creds=creds,
+        force_url=service,
+        force_key="bench",
+        timeout=10
+    )
+    results = fan_out([call] * concurrency)
+    assert not any(isinstance(r, Exception) for r in results), results
+
+async def async_rounds(service, creds, concurrency, rounds):
+    client = AsyncWatcherClient(server_creds=creds, force_url=service, force_key="bench")
+    try:
+        await asyncio.gather(*[client.request("post", "/v1/fetch_nodes", data={}) for _ in range(concurrency)])
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*[client.request("post", "/v1/fetch_nodes", data={}) for _ in range(concurrency)])
+        return (time.perf_counter() - start) * 1000 / rounds
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--concurrency", default=32, type=int)
+    parser.add_argument("--rounds", default=20, type=int)
+    parser.add_argument("--latency-ms", default=5, type=float)
+    parser.add_argument("--port", default=49917, type=int)
+    args = parser.parse_args()
+
+    watcher = StandInWatcher(latency=args.latency_ms / 1000)
+    stop_watcher = start_watcher(watcher, args.port)
+    service = f"127.0.0.1:{args.port}"
+    with tempfile.NamedTemporaryFile("w", suffix=".server", delete=False) as f:
+        json.dump({"user_api_key": None}, f)
+        creds = f.name
+
+    print(f"concurrency: {args.concurrency}  rounds: {args.rounds}  watcher latency: {args.latency_ms} ms")
+    print(f"{'client':<22}{'protocol':>10}{'ms/round':>10}{'connections':>13}")
+    try:
+        for protocol, http2 in [("HTTP/1.1", False), ("HTTP/2", True)]:
+            utils.USE_WATCHER_HTTP2 = http2
+
+            watcher.connections.clear()
+            sync_round(service, creds, args.concurrency)
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                sync_round(service, creds, args.concurrency)
+            elapsed = (time.perf_counter() - start) * 1000 / args.rounds
+            print(f"{'request_to_server':<22}{protocol:>10}{elapsed:>10.2f}{len(watcher.connections):>13}")
+            close_http_sessions()
+
+            watcher.connections.clear()
+            elapsed = asyncio.run(async_rounds(service, creds, args.concurrency, args.rounds))
+            print(f"{'AsyncWatcherClient':<22}{protocol:>10}{elapsed:>10.2f}{len(watcher.connections):>13}")
+    finally:
+        stop_watcher()
+        os.remove(creds)
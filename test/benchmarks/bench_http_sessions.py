@@ -0,0 +1,96 @@
+"""
+Latency of watcher calls with and without pooled keep-alive sessions.
+
+Starts a local stand-in watcher (HTTP/1.1, keep-alive) and times the same
+number of calls through a bare requests.request (new connection per call)
+and through request_to_server (shared session per base URL).
+
+    python test/benchmarks/bench_http_sessions.py --calls 500
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from kalavai_client.utils import request_to_server, close_http_sessions
+
+
+class StandInWatcher(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length > 0:
+            self.rfile.read(length)
+        body = json.dumps({"status": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_calls(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / calls
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--calls", default=500, type=int)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInWatcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service = f"127.0.0.1:{server.server_port}"
+
+    with tempfile.NamedTemporaryFile("w", suffix=".server", delete=False) as f:
+        json.dump({"user_api_key": None}, f)
+        creds = f.name
+
+    def bare_call():
+        requests.request(
+            method="get",
+            url=f"http://{service}/v1/health",
+            headers={"X-API-KEY": "bench"},
+            timeout=10
+        ).json()
+
+    def pooled_call():
+        request_to_server(
+            method="get",
+            endpoint="/v1/health",
+            server_creds=creds,
+            force_url=service,
+            force_key="bench",
+            timeout=10
+        )
+
+    try:
+        # warm up both paths
+        bare_call()
+        pooled_call()
+        bare = time_calls(bare_call, args.calls)
+        pooled = time_calls(pooled_call, args.calls)
+        print(f"calls per mode:        {args.calls}")
+        print(f"new connection / call: {bare:.3f} ms")
+        print(f"pooled keep-alive:     {pooled:.3f} ms")
+        print(f"speedup:               {bare / pooled:.2f}x")
+    finally:
+        close_http_sessions()
+        server.shutdown()
+        os.remove(creds)
@@ -0,0 +1,80 @@
+"""
+Payload size and latency of /fetch_job_details with and without fields=.
+
+Serves a synthetic jobs overview of N jobs from a stand-in watcher and
+calls the bridge API (in process, via TestClient) for the full job details
+and for the projection used by `kalavai job list`.
+
+    python test/benchmarks/bench_job_fields.py --jobs 1000 --repeat 10
+"""
+import json
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CLI_FIELDS = "job_id,name,workers,endpoint"
+
+
+def start_watcher(payload):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = payload["body"]
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def timed(client, params, repeat):
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/fetch_job_details", params=params, headers={"Accept-Encoding": "identity"})
+        best = min(best, time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+        size = len(response.content)
+    return best * 1000, size
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--jobs", default=1000, type=int)
+    parser.add_argument("--repeat", default=10, type=int)
+    args = parser.parse_args()
+
+    # kalavai_client reads its watcher settings on import
+    payload = {"body": b"{}"}
+    watcher = start_watcher(payload)
+    os.environ["WATCHER_API_URL"] = f"127.0.0.1:{watcher.server_port}"
+    os.environ["WATCHER_API_KEY"] = "bench"
+    # measure the projection itself, not the read cache / state mirror
+    os.environ["KALAVAI_API_CACHE_TTL"] = "0"
+    os.environ["KALAVAI_STATE_MIRROR"] = "False"
+
+    from fastapi.testclient import TestClient
+    from kalavai_client.api import app
+    from bench_json import synthetic_jobs_overview
+
+    with TestClient(app) as client:
+        payload["body"] = json.dumps(synthetic_jobs_overview(args.jobs)).encode()
+        print(f"jobs: {args.jobs}  (best of {args.repeat}, uncompressed)")
+        print(f"{'fields':<32}{'bytes':>12}{'ms':>10}")
+        for label, params in [("all", {}), (CLI_FIELDS, {"fields": CLI_FIELDS})]:
+            ms, size = timed(client, params, args.repeat)
+            print(f"{label:<32}{size:>12}{ms:>10.1f}")
+    watcher.shutdown()
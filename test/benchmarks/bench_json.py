@@ -0,0 +1,92 @@
+"""
+Cost of the default and the fast (orjson) JSON backends (requires orjson).
+
+For synthetic watcher payloads of N jobs / N GPUs, times each stage of
+fetch_job_details and fetch_gpus as served by the bridge API:
+decode (watcher response), parse (pydantic models) and encode (response).
+
+    python test/benchmarks/bench_json.py --sizes 1000 10000
+"""
+import json
+import time
+from argparse import ArgumentParser
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import kalavai_client.utils as utils
+from kalavai_client.core import _parse_job_details, _parse_gpus
+
+
+def synthetic_jobs_overview(n_jobs):
+    overview = {}
+    for i in range(n_jobs):
+        namespace = overview.setdefault(f"user-{i % 20}", {})
+        namespace[f"job-{i}"] = {
+            "metadata": {"name": f"vllm-deployment-{i}"},
+            "spec": {"replicas": 2, "template": {"image": "vllm/vllm-openai:latest"}},
+            "status": {
+                "pods": {
+                    f"pod-{i}-{w}": {"restarts": 0, "phase": "Running", "nodeName": f"worker-{(i + w) % 40}"}
+                    for w in range(2)
+                },
+                "services": {
+                    f"svc-{i}": {"ports": [{"name": "http", "port": 8080, "targetPort": 8080, "nodePort": 30000 + i % 2000}]}
+                },
+                "ingress": None
+            }
+        }
+    return overview
+
+def synthetic_gpu_nodes(n_gpus, per_node=4):
+    return {
+        f"worker-{n}": {
+            "available": per_node // 2,
+            "capacity": per_node,
+            "gpus": [{"model": "NVIDIA-A100-SXM4-80GB", "memory": "81920", "ready": True} for _ in range(per_node)]
+        }
+        for n in range(n_gpus // per_node)
+    }
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def encode_default(models):
+    # FastAPI default: jsonable_encoder pass, then JSONResponse
+    return JSONResponse(content=jsonable_encoder(models)).body
+
+def encode_fast(models):
+    # api.fast_response: FastJSONResponse renders the models directly
+    return utils.json_dumps(models)
+
+def run_backend(raw, parse, fast, repeat):
+    utils.USE_ORJSON = fast
+    encode = encode_fast if fast else encode_default
+    decode_ms, data = timed(lambda: utils.json_loads(raw), repeat)
+    parse_ms, models = timed(lambda: parse(data), repeat)
+    encode_ms, _ = timed(lambda: encode(models), repeat)
+    return decode_ms, parse_ms, encode_ms
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--sizes", default=[1000, 10000], type=int, nargs="+")
+    parser.add_argument("--repeat", default=5, type=int)
+    args = parser.parse_args()
+
+    cases = {
+        "fetch_job_details": (synthetic_jobs_overview, _parse_job_details),
+        "fetch_gpus": (synthetic_gpu_nodes, lambda data: _parse_gpus(data.items()))
+    }
+    print(f"{'endpoint':<20}{'objects':>8}{'backend':>9}{'decode':>10}{'parse':>10}{'encode':>10}{'total':>10}  (ms)")
+    for name, (make_payload, parse) in cases.items():
+        for size in args.sizes:
+            raw = json.dumps(make_payload(size)).encode()
+            for backend, fast in [("default", False), ("orjson", True)]:
+                stages = run_backend(raw, parse, fast, args.repeat)
+                print(f"{name:<20}{size:>8}{backend:>9}" + "".join(f"{s:>10.1f}" for s in stages) + f"{sum(stages):>10.1f}")
@@ -0,0 +1,95 @@
+"""
+Watcher log reads and bytes transferred by /fetch_job_logs viewers.
+
+A stand-in watcher serves a job whose pod writes a few lines per second.
+V viewers refresh the logs every second for D seconds, either re-reading
+the whole tail or asking for the lines since the last one they got
+(since_line). Reports the watcher reads and the bytes sent to the viewers.
+
+    python test/benchmarks/bench_log_buffer.py --viewers 10 --duration 5
+"""
+import json
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_watcher(log, reads):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.startswith("/v1/get_job_details"):
+                reads.append(time.time())
+            tail = data.get("tail_lines", 100)
+            body = json.dumps({"job": {"pod-0": {"logs": "\n".join(log[-tail:]) + "\n", "describe": {}}}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def write_logs(log, stop, rate):
+    while not stop.is_set():
+        log.append(f"{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())} step {len(log)} loss=0.{len(log) % 997:03d}")
+        time.sleep(1 / rate)
+
+def viewer(client, incremental, duration, tail):
+    sent, since = 0, None
+    end = time.time() + duration
+    while time.time() < end:
+        params = {"job_name": "bench", "tail": tail}
+        if incremental and since is not None:
+            params["since_line"] = since
+        response = client.get("/fetch_job_logs", params=params, headers={"Accept-Encoding": "identity"})
+        sent += len(response.content)
+        since = response.json()["job"]["pod-0"].get("next_line")
+        time.sleep(1)
+    return sent
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--viewers", default=10, type=int)
+    parser.add_argument("--duration", default=5, type=float)
+    parser.add_argument("--tail", default=500, type=int)
+    parser.add_argument("--rate", default=20, type=float, help="log lines per second")
+    args = parser.parse_args()
+
+    log, reads = [f"warmup {i}" for i in range(args.tail)], []
+    watcher = start_watcher(log, reads)
+    # kalavai_client reads its watcher settings on import
+    os.environ["WATCHER_API_URL"] = f"127.0.0.1:{watcher.server_port}"
+    os.environ["WATCHER_API_KEY"] = "bench"
+    os.environ["KALAVAI_LOG_FOLLOW_INTERVAL"] = "1"
+    # count log reads only
+    os.environ["KALAVAI_STATE_MIRROR"] = "False"
+
+    from fastapi.testclient import TestClient
+    from kalavai_client.api import app
+
+    stop = threading.Event()
+    threading.Thread(target=write_logs, args=(log, stop, args.rate), daemon=True).start()
+    print(f"viewers: {args.viewers}  duration: {args.duration}s  tail: {args.tail}")
+    print(f"{'mode':<16}{'watcher reads':>16}{'bytes sent':>14}")
+    with TestClient(app) as client:
+        for label, incremental in [("full tail", False), ("since_line", True)]:
+            reads.clear()
+            with ThreadPoolExecutor(args.viewers) as pool:
+                sent = sum(pool.map(lambda _: viewer(client, incremental, args.duration, args.tail), range(args.viewers)))
+            print(f"{label:<16}{len(reads):>16}{sent:>14}")
+    stop.set()
+    watcher.shutdown()
@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+
+from kalavai_client import core
+
+
+class FakeWatcher():
+    """Answers watcher calls from a table of endpoint -> response (or exception)"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def respond(self, call):
+        self.calls.append((call.method, call.endpoint, call.data, call.params))
+        response = self.responses[call.endpoint]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def patch(self):
+        watcher = self
+
+        async def send_async(call):
+            return watcher.respond(call)
+
+        return mock.patch.multiple(
+            core.WatcherCall,
+            send=lambda call: watcher.respond(call),
+            send_async=send_async
+        )
+
+
+RESPONSES = {
+    "/v1/get_cluster_total_resources": {"cpu": 8},
+    "/v1/get_cluster_available_resources": ConnectionError("watcher down"),
+    "/v1/fetch_nodes": {"node-1": {
+        "MemoryPressure": False,
+        "DiskPressure": False,
+        "PIDPressure": False,
+        "Ready": True,
+        "unschedulable": False
+    }},
+    "/v1/set_node_schedulable": {"detail": "forbidden"},
+    "/v1/helm_repo_search": [{"name": "kalavai/vllm"}]
+}
+
+
+class WatcherOperationUnitTests(unittest.IsolatedAsyncioTestCase):
+
+    async def assertSameOnBothTransports(self, operation, *args, **kwargs):
+        sync_watcher, async_watcher = FakeWatcher(RESPONSES), FakeWatcher(RESPONSES)
+        with sync_watcher.patch():
+            result = operation(*args, **kwargs)
+        with async_watcher.patch():
+            result_async = await operation.run_async(*args, **kwargs)
+        self.assertEqual(result, result_async)
+        self.assertEqual(sync_watcher.calls, async_watcher.calls)
+        return result, sync_watcher.calls
+
+    async def test_concurrent_calls_report_failures_in_place(self):
+        result, calls = await self.assertSameOnBothTransports(core.fetch_resources, node_names=["node-1"])
+        self.assertEqual(result["total"], {"cpu": 8})
+        self.assertEqual(result["available"], {"error": "watcher down"})
+        self.assertEqual(len(calls), 2)
+
+    async def test_single_call_errors_raise_at_yield(self):
+        watcher = FakeWatcher({"/v1/fetch_nodes": ConnectionError("watcher down")})
+        with watcher.patch():
+            self.assertEqual(core.fetch_devices(), {"error": "watcher down"})
+            self.assertEqual(await core.fetch_devices_async(), {"error": "watcher down"})
+
+    async def test_parsed_results(self):
+        devices, _ = await self.assertSameOnBothTransports(core.fetch_devices, node_labels={"a": "b"})
+        self.assertEqual([device.name for device in devices], ["node-1"])
+        result, calls = await self.assertSameOnBothTransports(core.cordon_nodes, ["node-1"])
+        self.assertEqual(result, {"error": "forbidden"})
+        self.assertEqual(calls[0][2], {"schedulable": "False", "node_names": ["node-1"]})
+
+    async def test_composed_operations(self):
+        responses = dict(RESPONSES, **{
+            "/v1/helm_add_repo": None,
+            "/v1/helm_update": "updated"
+        })
+        watcher = FakeWatcher(responses)
+        repos = [("kalavai", "https://charts.kalavai.net")]
+        with watcher.patch(), mock.patch.object(core, "TEMPLATE_CACHE"):
+            self.assertEqual(core.update_local_repositories(helm_repos=repos), "updated")
+            self.assertEqual(await core.update_local_repositories_async(helm_repos=repos), "updated")
+        endpoints = [call[1] for call in watcher.calls]
+        run = len(endpoints) // 2
+        self.assertEqual(endpoints[:run], endpoints[run:])
+        self.assertEqual(endpoints[:3], ["/v1/helm_add_repo", "/v1/helm_update", "/v1/helm_repo_search"])
+
+
+if __name__ == '__main__':
+    unittest.main()
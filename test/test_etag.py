@@ -0,0 +1,65 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from kalavai_client import utils
+from kalavai_client.etag import ETagCache
+
+
+class FakeResponse():
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self.content = b"" if body is None else json.dumps(body).encode()
+        self.text = self.content.decode()
+        self.headers = {} if etag is None else {"ETag": etag}
+
+
+class FakeSession():
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append(dict(headers))
+        return self.responses.pop(0)
+
+
+class ETagUnitTests(unittest.TestCase):
+
+    def test_cache_copies_bodies(self):
+        cache = ETagCache()
+        key = cache.key("get", "/fetch_job_details")
+        body = {"jobs": [{"endpoint": {"address": "10.0.0.1"}}]}
+        cache.store(key, '"v1"', body)
+        body["jobs"][0]["endpoint"] = "10.0.0.1"
+        etag, cached = cache.get(key)
+        cached["jobs"][0]["endpoint"] = "10.0.0.1"
+        self.assertEqual(etag, '"v1"')
+        self.assertEqual(cache.get(key)[1], {"jobs": [{"endpoint": {"address": "10.0.0.1"}}]})
+
+    def test_not_modified_after_caller_mutation(self):
+        body = {"jobs": [{"endpoint": {"address": "10.0.0.1"}, "spec": {"replicas": 1}}]}
+        session = FakeSession([
+            FakeResponse(200, body, etag='"v1"'),
+            FakeResponse(304),
+            FakeResponse(304)
+        ])
+        config = SimpleNamespace(kalavai_api_url="http://api", kalavai_api_key="key")
+        with mock.patch.object(utils, "SERVER_CONFIG", config), \
+            mock.patch.object(utils, "get_http_session", return_value=session), \
+            mock.patch.object(utils, "API_ETAG_CACHE", ETagCache()), \
+            mock.patch.object(utils, "COMPRESSION_ENABLED", False):
+            for _ in range(3):
+                result = utils.request_to_api("get", "/fetch_job_details")
+                self.assertEqual(result, body)
+                # as the GUI states do with the pages they get
+                job = result["jobs"][0]
+                job["endpoint"] = job["endpoint"]["address"]
+                job["spec"] = {}
+        self.assertEqual(session.requests[1]["If-None-Match"], '"v1"')
+        self.assertEqual(session.requests[2]["If-None-Match"], '"v1"')
+
+
+if __name__ == '__main__':
+    unittest.main()
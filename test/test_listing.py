@@ -0,0 +1,47 @@
+import unittest
+
+from fastapi import HTTPException
+
+from kalavai_client.api_models import Job
+from kalavai_client.listing import ListParams, apply_listing, JOB_FILTERS
+
+
+JOB_FIELDS = list(Job.model_fields)
+
+
+def listing(**options):
+    params = dict(offset=None, limit=None, sort_by=None, order="asc", job_id=None, status=None, owner=None, node=None, model=None)
+    params.update(options)
+    return ListParams(**params)
+
+
+class ListingUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [
+            Job(job_id="a", status="running", host_nodes="gpu-1\ngpu-2"),
+            Job(job_id="b", status="pending", host_nodes="gpu-10\ngpu-11"),
+            Job(job_id="c", status="running", host_nodes=None)
+        ]
+
+    def ids(self, result):
+        return [job.job_id for job in result["items"]]
+
+    def test_node_filter_matches_whole_names(self):
+        self.assertEqual(self.ids(apply_listing(self.jobs, listing(node="gpu-1"), JOB_FILTERS, JOB_FIELDS)), ["a"])
+        self.assertEqual(self.ids(apply_listing(self.jobs, listing(node="GPU-11,gpu-2"), JOB_FILTERS, JOB_FIELDS)), ["a", "b"])
+
+    def test_sort_key_checked_against_model(self):
+        result = apply_listing(self.jobs, listing(sort_by="host_nodes", order="desc"), JOB_FILTERS, JOB_FIELDS)
+        self.assertEqual(self.ids(result), ["b", "a", "c"])
+        # an empty page does not accept unknown keys
+        with self.assertRaises(HTTPException):
+            apply_listing([], listing(sort_by="unknown"), JOB_FILTERS, JOB_FIELDS)
+        # rows without the key are fine (e.g. projected jobs)
+        rows = [{"job_id": "a"}, {"job_id": "b", "status": "running"}]
+        result = apply_listing(rows, listing(sort_by="status"), JOB_FILTERS, JOB_FIELDS)
+        self.assertEqual([row["job_id"] for row in result["items"]], ["b", "a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+from kalavai_client.log_buffer import LogBuffer, PodLogs
+
+
+class PodLogsUnitTests(unittest.TestCase):
+
+    def _with_gap(self):
+        # lines 0-4, then a tail that does not overlap: a hole at 5, lines 6-10
+        logs = PodLogs(max_lines=100)
+        logs.extend("\n".join(f"a{i}" for i in range(5)))
+        logs.extend("\n".join(f"b{i}" for i in range(5)))
+        return logs
+
+    def test_numbering_gap(self):
+        logs = self._with_gap()
+        self.assertEqual([l.number for l in logs.lines], [0, 1, 2, 3, 4, 6, 7, 8, 9, 10])
+        self.assertEqual(logs.next_line, 11)
+
+    def test_select_since_line_after_gap(self):
+        logs = self._with_gap()
+        self.assertEqual([l.number for l in logs.select(since_line=8)], [8, 9, 10])
+        self.assertEqual([l.number for l in logs.select(since_line=5)], [6, 7, 8, 9, 10])
+        self.assertEqual([l.number for l in logs.select(since_line=3)], [3, 4, 6, 7, 8, 9, 10])
+        self.assertEqual(logs.select(since_line=11), [])
+
+    def test_select_since_line_after_trim(self):
+        logs = self._with_gap()
+        logs.trim(logs.size - 2 * len("a0"))
+        self.assertEqual(logs.first_line, 2)
+        self.assertEqual([l.number for l in logs.select(since_line=0)], [2, 3, 4, 6, 7, 8, 9, 10])
+        self.assertEqual([l.number for l in logs.select(since_line=9, tail=1)], [10])
+
+    def test_size_in_bytes(self):
+        logs = PodLogs(max_lines=2)
+        logs.extend("é\nab\n€")
+        self.assertEqual(logs.size, len("ab".encode()) + len("€".encode()))
+        self.assertEqual([l.offset for l in logs.lines], [3, 6])
+        self.assertEqual(logs.trim(3), -2)
+        self.assertEqual(logs.size, 3)
+
+
+class LogBufferUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.log = [f"line {i}" for i in range(50)]
+        self.tails = []
+
+    async def fetch(self, tail):
+        self.tails.append(tail)
+        return {"job": {"pod-1": {"logs": "\n".join(self.log[-tail:])}}}
+
+    def test_fetch_sized_to_requested_tail(self):
+        buffer = LogBuffer(interval=0, fetch_tail=1000, max_lines=100, max_bytes=1024 * 1024)
+
+        async def reads():
+            pods = await buffer.read("job", self.fetch, tail=10)
+            self.assertFalse(pods["pod-1"].covers(20))
+            self.log.append("line 50")
+            # a longer tail reads more lines at once, without repeating the buffered ones
+            pods = await buffer.read("job", self.fetch, tail=20)
+            self.assertEqual([l.text for l in pods["pod-1"].lines], self.log[-11:])
+            await buffer.read("job", self.fetch, tail=5)
+            await buffer.read("job", self.fetch, tail=5000)
+            # a buffer started by a whole log holds all of it
+            whole = await buffer.read("other", self.fetch, tail=100)
+            return pods, whole
+        pods, whole = asyncio.run(reads())
+        self.assertEqual(self.tails, [10, 20, 20, 1000, 100])
+        self.assertFalse(pods["pod-1"].covers(1000))
+        self.assertTrue(whole["pod-1"].covers(1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
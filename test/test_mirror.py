@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+
+from kalavai_client.events import PoolEventHub, NODE_STATUS
+from kalavai_client.mirror import StateMirror
+
+
+class SlowSource():
+    """Returns its value as of the start of each fetch, once that fetch is released"""
+
+    def __init__(self, value):
+        self.value = value
+        self.releases = []
+
+    @property
+    def calls(self):
+        return len(self.releases)
+
+    def release(self, call=-1):
+        self.releases[call].set()
+
+    async def __call__(self):
+        value = self.value
+        release = asyncio.Event()
+        self.releases.append(release)
+        await release.wait()
+        return value
+
+
+async def fetching(source, calls):
+    """Wait for the source to be in its fetch number calls"""
+    while source.calls < calls:
+        await asyncio.sleep(0)
+
+
+class StateMirrorUnitTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_invalidation_during_fetch_drops_stale_value(self):
+        source = SlowSource(["job-1", "job-2"])
+        mirror = StateMirror({"jobs": source}, default_interval=60)
+
+        # a fetch starts, then a mutation (delete job-2) invalidates the mirror
+        stale = asyncio.ensure_future(mirror.refresh("jobs"))
+        await fetching(source, 1)
+        source.value = ["job-1"]
+        mirror.invalidate()
+
+        # a read after the mutation fetches again, and gets there first
+        fresh = asyncio.ensure_future(mirror.get("jobs"))
+        await fetching(source, 2)
+        source.release(1)
+        self.assertEqual(await fresh, ["job-1"])
+
+        # the fetch from before the mutation must not overwrite it
+        source.release(0)
+        await stale
+        self.assertEqual(mirror.peek("jobs"), ["job-1"])
+        self.assertEqual(await mirror.get("jobs"), ["job-1"])
+        self.assertEqual(source.calls, 2)
+
+    async def test_stale_value_fills_empty_entry(self):
+        source = SlowSource(["job-1"])
+        mirror = StateMirror({"jobs": source}, default_interval=60)
+        task = asyncio.ensure_future(mirror.refresh("jobs"))
+        await fetching(source, 1)
+        mirror.invalidate()
+        source.release()
+        await task
+        self.assertEqual(mirror.peek("jobs"), ["job-1"])
+        self.assertIsNone(mirror.updated_at("jobs"))
+
+    async def test_listeners_feed_event_hub(self):
+        nodes = [{"name": "node-1", "ready": True}]
+        mirror = StateMirror({"devices": lambda: asyncio.sleep(0, result=list(nodes))}, default_interval=60)
+        hub = PoolEventHub()
+        mirror.add_listener(lambda name, value: hub.update(NODE_STATUS, value))
+        await mirror.refresh("devices")
+
+        events = hub.subscribe(heartbeat=0.01)
+        first = await events.__anext__()
+        self.assertEqual((first["node"], first["after"]["ready"]), ("node-1", True))
+        nodes[0] = {"name": "node-1", "ready": False}
+        await mirror.refresh("devices")
+        change = await events.__anext__()
+        self.assertEqual((change["before"]["ready"], change["after"]["ready"]), (True, False))
+        self.assertFalse(hub.stats()["polling"])
+        await events.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+
+from kalavai_client.deadline import request_deadline, remaining_time, DeadlineExceeded
+from kalavai_client.response_cache import ResponseCache
+
+
+class ResponseCacheUnitTests(unittest.IsolatedAsyncioTestCase):
+
+    async def test_shared_fetch_outlives_first_caller_deadline(self):
+        cache = ResponseCache(default_ttl=60)
+        release = asyncio.Event()
+        deadlines = []
+
+        async def fetch():
+            deadlines.append(remaining_time())
+            await release.wait()
+            return ["node-1"]
+
+        async def short_caller():
+            with request_deadline(timeout=0.01):
+                return await cache.get_or_fetch("/fetch_devices", None, fetch)
+
+        first = asyncio.ensure_future(short_caller())
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_fetch("/fetch_devices", None, fetch))
+        with self.assertRaises(DeadlineExceeded):
+            await first
+
+        # the caller that started the fetch gave up, the fetch goes on for the other
+        release.set()
+        self.assertEqual(await second, ["node-1"])
+        self.assertEqual(deadlines, [None])
+        self.assertEqual(await cache.get_or_fetch("/fetch_devices", None, fetch), ["node-1"])
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    async def test_expired_deadline(self):
+        cache = ResponseCache(default_ttl=60)
+
+        async def fetch():
+            return ["node-1"]
+
+        with request_deadline(timeout=0):
+            with self.assertRaises(DeadlineExceeded):
+                await cache.get_or_fetch("/fetch_devices", None, fetch)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from kalavai_client.metrics import MetricsAPI
+from kalavai_client.usage_cache import ClosedHourCache, HOUR, DAY
+
+
+START = datetime(2026, 5, 26)
+ROWS = [("job-1", "A100", 1.0, 2.5, 1024.0), ("job-2", "A100", 0.5, 1.0, 512.0)]
+HOURS = {START + 10 * HOUR: ROWS}
+
+
+class ClosedHourCacheUnitTests(unittest.TestCase):
+
+    def test_eviction_least_recently_used(self):
+        cache = ClosedHourCache(max_rows=3)
+        cache.put("user", "user-1", START, HOURS)
+        # a day without rows still takes a slot, its hours none
+        cache.put("user", "user-1", START + DAY, {START + DAY: [], START + DAY + HOUR: []})
+        self.assertEqual(cache.stats()["rows"], 3)
+        self.assertEqual(cache.get("user", "user-1", START + DAY), {})
+        # reading the first day makes the empty one the oldest
+        self.assertEqual(cache.get("user", "user-1", START), HOURS)
+        cache.put("user", "user-2", START, {START: ROWS[:1]})
+        self.assertIsNone(cache.get("user", "user-1", START + DAY))
+        self.assertEqual(cache.get("user", "user-1", START), HOURS)
+        self.assertEqual(cache.get("user", "user-2", START), {START: ROWS[:1]})
+        self.assertEqual(cache.stats()["rows"], 3)
+
+    def test_put_replaces_entry(self):
+        cache = ClosedHourCache(max_rows=10)
+        cache.put("user", "user-1", START, HOURS)
+        cache.put("user", "user-1", START, {START: ROWS[:1]})
+        self.assertEqual(cache.get("user", "user-1", START), {START: ROWS[:1]})
+        self.assertEqual(cache.stats()["rows"], 1)
+
+    def test_spill_round_trip(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "hours.db")
+            cache = ClosedHourCache(max_rows=2, spill_path=path)
+            cache.put("user", "user-1", START, HOURS)
+            cache.put("user", "user-1", START + DAY, {})
+            cache.put("job", "job-1", START, {START: ROWS[:1]})
+            stats = cache.stats()
+            self.assertEqual((stats["entries"], stats["spilled"]), (2, 1))
+
+            # evicted from memory, read back from the spill file as it was put
+            self.assertEqual(cache.get("user", "user-1", START), HOURS)
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertIsNone(cache.get("user", "user-2", START))
+
+            # the spill file outlives the cache that wrote it
+            reopened = ClosedHourCache(max_rows=2, spill_path=path)
+            self.assertEqual(reopened.get("user", "user-1", START + DAY), {})
+            self.assertEqual(reopened.get("job", "job-1", START), {START: ROWS[:1]})
+
+
+class HourlyRowsUnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ClosedHourCache(max_rows=1000)
+        self.metrics = MetricsAPI(endpoint="", port=8443, username="", password="", hour_cache=self.cache, hour_cache_days=30, settle_time=0)
+        self.queries = []
+
+    def fetch_hours(self, scope, entities, start, end):
+        self.queries.append((start, end))
+        hour = start + HOUR
+        return {("provider-1", hour): [("A100", 1.0, 2.0, 3.0)]}
+
+    def test_whole_days_cached(self):
+        start = START + 12 * HOUR
+        end = START + 3 * DAY + 6 * HOUR
+        with patch.object(MetricsAPI, "_fetch_hours", side_effect=self.fetch_hours, autospec=False):
+            first = self.metrics._hourly_rows("provider", ["provider-1", "provider-2"], start, end)
+            self.assertEqual(self.queries, [(start, end)])
+            self.queries.clear()
+            second = self.metrics._hourly_rows("provider", ["provider-1", "provider-2"], start, end)
+        # the two closed days come from the cache, the partial ones are read again
+        self.assertEqual(self.queries, [(start, START + DAY), (START + 3 * DAY, end)])
+        self.assertIn(("provider-1", start + HOUR, ("A100", 1.0, 2.0, 3.0)), second)
+        self.assertEqual(len(first), 1)
+        # one entry per entity and day, days without rows included
+        self.assertEqual(self.cache.stats()["entries"], 4)
+
+    def test_long_window_skips_cache(self):
+        now = datetime.utcnow()
+        long_start = (now - timedelta(days=365)).strftime("%Y-%m-%d")
+        short_start = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+        self.assertIsNone(self.metrics._cached_window(long_start, None, False))
+        self.assertIsNotNone(self.metrics._cached_window(short_start, None, False))
+        self.assertIsNone(self.metrics._cached_window(short_start, None, True))
+
+
+if __name__ == '__main__':
+    unittest.main()